@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Adversarial PDF corpus for PDF Outline Extractor
+Generates inputs that stress the extractor's complexity: pages with tens of
+thousands of tiny spans, hundreds of distinct font sizes, massive duplicate
+strings and deeply nested form XObjects.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import fitz  # PyMuPDF
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+
+
+def _text_op(x: float, y: float, size: float, text: str) -> str:
+    """Content-stream operators drawing one span with the page's helv font."""
+    return f"BT /helv {size:.2f} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm ({text}) Tj ET\n"
+
+
+def _page_with_stream(doc: fitz.Document, content: str) -> fitz.Page:
+    """Add a page whose content stream is replaced by `content` (helv registered as a resource)."""
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((50, 50), "Adversarial Page", fontsize=12, fontname="helv")
+    doc.update_stream(page.get_contents()[0], content.encode("latin-1"))
+    return page
+
+
+def tiny_spans_pdf(pdf_path: Path, spans_per_page: int = 50_000, pages: int = 1) -> Path:
+    """Pages packed with tiny, individually positioned spans."""
+    doc = fitz.open()
+    columns = 100
+    for page_num in range(pages):
+        ops = [_text_op(20, 770, 18, f"Tiny Span Stress Page {page_num + 1}")]
+        for index in range(spans_per_page):
+            x = 10 + (index % columns) * 5.9
+            y = 750 - (index // columns) % 740 * 1.0
+            ops.append(_text_op(x, y, 1.5 + (index % 3) * 0.5, f"w{index % 97:03d}"))
+        _page_with_stream(doc, "".join(ops))
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def distinct_sizes_pdf(pdf_path: Path, distinct_sizes: int = 400, pages: int = 2) -> Path:
+    """Pages where nearly every line uses a different font size."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        ops = []
+        for index in range(distinct_sizes):
+            size = 4.0 + index * 0.1
+            y = 780 - (index % 150) * 5
+            ops.append(_text_op(20 + (index // 150) * 190, y, size, f"{index + 1}. Heading Size {size:.1f}"))
+        _page_with_stream(doc, "".join(ops))
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def duplicate_strings_pdf(pdf_path: Path, repeats_per_page: int = 20_000, pages: int = 2) -> Path:
+    """Pages repeating the same heading-like string thousands of times."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        ops = [_text_op(20, 770, 24, "Duplicate Strings Stress Document")]
+        for index in range(repeats_per_page):
+            x = 10 + (index % 20) * 29
+            y = 740 - (index // 20) % 720
+            ops.append(_text_op(x, y, 14, "1.1 Repeated Section Title"))
+        _page_with_stream(doc, "".join(ops))
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def nested_xobjects_pdf(pdf_path: Path, depth: int = 24, fan_out: int = 2, fan_out_depth: int = 10) -> Path:
+    """A page drawing a chain of nested form XObjects; the innermost levels fan out."""
+    doc = fitz.open()
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((50, 50), "Nested XObject Stress", fontsize=20, fontname="helv")
+    font_ref = doc.xref_get_key(page.xref, "Resources/Font/helv")[1]
+
+    # Build from the innermost form outwards so every level can reference the next one
+    child_xref = doc.get_new_xref()
+    doc.update_object(child_xref, f"<< /Type /XObject /Subtype /Form /BBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                                  f"/Resources << /Font << /helv {font_ref} >> >> >>")
+    doc.update_stream(child_xref, _text_op(60, 700, 12, "1. Innermost Heading").encode("latin-1"))
+
+    for level in range(depth):
+        xref = doc.get_new_xref()
+        copies = fan_out if level < fan_out_depth else 1
+        draw_ops = "".join(f"q 1 0 0 1 0 {-0.5 * copy:.1f} cm /X0 Do Q\n" for copy in range(copies))
+        doc.update_object(xref, f"<< /Type /XObject /Subtype /Form /BBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                                f"/Resources << /XObject << /X0 {child_xref} 0 R >> /Font << /helv {font_ref} >> >> >>")
+        doc.update_stream(xref, (draw_ops + _text_op(60, 680 - level % 600, 10, f"Level {level}")).encode("latin-1"))
+        child_xref = xref
+
+    kind, value = doc.xref_get_key(page.xref, "Resources")
+    resources_xref = int(value.split()[0]) if kind == "xref" else page.xref
+    resources_key = "XObject" if kind == "xref" else "Resources/XObject"
+    doc.xref_set_key(resources_xref, resources_key, f"<< /Outer {child_xref} 0 R >>")
+    contents_xref = page.get_contents()[0]
+    doc.update_stream(contents_xref, doc.xref_stream(contents_xref) + b"\nq /Outer Do Q\n")
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+ADVERSARIAL_CASES: Dict[str, Callable[[Path], Path]] = {
+    "tiny_spans": tiny_spans_pdf,
+    "distinct_sizes": distinct_sizes_pdf,
+    "duplicate_strings": duplicate_strings_pdf,
+    "nested_xobjects": nested_xobjects_pdf,
+}
+
+
+def generate_adversarial_corpus(directory: Path) -> List[Path]:
+    """Write every adversarial case into `directory`."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    return [build(directory / f"{name}.pdf") for name, build in ADVERSARIAL_CASES.items()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the adversarial performance corpus")
+    parser.add_argument("output_dir", type=Path, nargs="?", default=Path("benchmark_corpus/adversarial"))
+    args = parser.parse_args()
+
+    for pdf_path in generate_adversarial_corpus(args.output_dir):
+        print(f"Created adversarial PDF: {pdf_path} ({pdf_path.stat().st_size / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
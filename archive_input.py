@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Archive inputs for PDF Outline Extractor
+Streams the PDF members of .zip and .tar(.gz/.bz2/.xz) archives straight
+into the extractor as bytes, without unpacking them to disk first.
+"""
+
+import logging
+import posixpath
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Members claiming to be larger than this are skipped rather than loaded (zip bombs)
+MAX_MEMBER_BYTES = 512 * 1024 * 1024
+
+
+def archive_suffix(path: Path) -> str:
+    """The archive suffix of path ('' when it isn't an archive)."""
+    name = path.name.lower()
+    return next((suffix for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True) if name.endswith(suffix)), "")
+
+
+def is_archive(path: Path) -> bool:
+    return bool(archive_suffix(path))
+
+
+def member_output_name(archive_path: Path, member_name: str) -> str:
+    """Relative output path for a member: <archive file name>/<member path without .pdf>.json.
+
+    The full file name keeps bundle.zip and bundle.tar.gz apart. Absolute
+    paths and '..' components are dropped so outputs stay inside the output
+    directory.
+    """
+    parts = [part for part in posixpath.normpath(member_name.replace("\\", "/")).split("/")
+             if part not in ("", ".", "..")]
+    member_stem = posixpath.splitext("/".join(parts))[0]
+    return f"{archive_path.name}/{member_stem}.json"
+
+
+def _is_pdf_member(name: str) -> bool:
+    return name.lower().endswith(".pdf") and not posixpath.basename(name).startswith(".")
+
+
+def _iter_zip(archive_path: Path) -> Iterator[Tuple[str, bytes]]:
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_pdf_member(info.filename):
+                continue
+            if info.file_size > MAX_MEMBER_BYTES:
+                logger.warning(f"Skipping oversized member {info.filename} in {archive_path.name}")
+                continue
+            try:
+                data = archive.read(info)
+            except (RuntimeError, zipfile.BadZipFile, OSError) as e:
+                # Encrypted or corrupt member: the rest of the archive is still readable
+                logger.error(f"Cannot read {info.filename} in {archive_path.name}: {str(e)}")
+                continue
+            yield info.filename, data
+
+
+def _iter_tar(archive_path: Path) -> Iterator[Tuple[str, bytes]]:
+    # Stream mode: members are read in order without seeking back through compressed data
+    with tarfile.open(archive_path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not _is_pdf_member(member.name):
+                continue
+            if member.size > MAX_MEMBER_BYTES:
+                logger.warning(f"Skipping oversized member {member.name} in {archive_path.name}")
+                continue
+            yield member.name, archive.extractfile(member).read()
+
+
+def iter_archive_pdfs(archive_path: Path) -> Iterator[Tuple[str, bytes]]:
+    """Yield (member name, bytes) for each PDF in the archive, one member in memory at a time."""
+    if archive_suffix(archive_path) == ".zip":
+        yield from _iter_zip(archive_path)
+    else:
+        yield from _iter_tar(archive_path)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+asyncio batch pipeline for PDF Outline Extractor
+Overlaps the three phases of a batch - reading PDF bytes, parsing them and
+writing the outlines - so storage latency hides behind CPU time. Stages are
+joined by bounded queues, which caps the bytes held in memory.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from pdf_outline_extractor import PDFOutlineExtractor
+from worker_pool import process_in_pool_worker, process_isolated, process_pool
+
+logger = logging.getLogger(__name__)
+
+_default_extractor: Optional[PDFOutlineExtractor] = None
+
+
+def _extractor() -> PDFOutlineExtractor:
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = PDFOutlineExtractor(input_dir=".", output_dir=".")
+    return _default_extractor
+
+
+async def extract(source: Union[str, Path, bytes], name: str = "document.pdf",
+                  extractor: Optional[PDFOutlineExtractor] = None,
+                  executor: Optional[Executor] = None) -> Dict:
+    """Outline of a PDF given as a path or as its bytes, without blocking the event loop.
+
+    Parsing runs in `executor` (the loop's default thread pool when None);
+    `name` labels a document passed as bytes.
+    """
+    extractor = extractor or _extractor()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        pdf_path, data = Path(name), bytes(source)
+    else:
+        pdf_path = Path(source)
+        data = await asyncio.to_thread(pdf_path.read_bytes)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, extractor.process_pdf, pdf_path, data)
+
+
+async def run_pipeline(extractor: PDFOutlineExtractor, pdf_files: Iterable[Path],
+                       on_result: Optional[Callable[[Path, Dict], None]] = None,
+                       queue_depth: Optional[int] = None, writers: int = 2,
+                       executor: Optional[Executor] = None) -> Dict:
+    """Read, parse and write a batch concurrently; returns per-stage busy time and wall time.
+
+    extractor.workers parsers run in `executor` (a process pool when
+    workers > 1, otherwise one thread). At most queue_depth documents wait
+    between stages, so memory stays bounded whatever the batch size.
+    on_result (default extractor.save_result) runs in a thread per writer.
+    Once extractor.stop_requested is set no further files are read.
+
+    If a worker of the pipeline's own process pool crashes, the pool is
+    rebuilt and the documents it held are retried one by one, so only the
+    one that crashes again is recorded as failed.
+    """
+    loop = asyncio.get_running_loop()
+    on_result = on_result or extractor.save_result
+    queue_depth = queue_depth or extractor.queue_depth
+    parsers = extractor.workers
+    own_executor = executor is None
+    process = extractor.process_pdf
+    own_pool = own_executor and parsers > 1
+    if own_pool:
+        # Each worker gets the extractor once, rather than a fresh pickled copy with every document
+        executor = process_pool(extractor, parsers)
+        process = process_in_pool_worker
+    elif own_executor:
+        executor = ThreadPoolExecutor(1)
+
+    read_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+    stats = {"documents": 0, "read_s": 0.0, "parse_s": 0.0, "write_s": 0.0}
+
+    async def read_stage():
+        # Discovery can block on slow directory listings (network storage), so it runs off the loop
+        pending = iter(pdf_files)
+        while not extractor.stop_requested:
+            pdf_path = await asyncio.to_thread(next, pending, None)
+            if pdf_path is None:
+                break
+            start = time.perf_counter()
+            try:
+                data = await asyncio.to_thread(pdf_path.read_bytes)
+            except OSError:
+                data = None  # process_pdf reopens the path and reports the error
+            stats["read_s"] += time.perf_counter() - start
+            await read_queue.put((pdf_path, data))
+        for _ in range(parsers):
+            await read_queue.put(None)
+
+    async def parse(pdf_path: Path, data: Optional[bytes]) -> Dict:
+        nonlocal executor
+        submitted_to = executor
+        try:
+            return await loop.run_in_executor(submitted_to, process, pdf_path, data)
+        except BrokenProcessPool:
+            if not own_pool:
+                raise
+            if submitted_to is executor:
+                logger.warning("A pipeline worker died; restarting the pool and retrying its documents one by one")
+                executor.shutdown(wait=False)
+                executor = process_pool(extractor, parsers)
+            return await asyncio.to_thread(process_isolated, extractor, pdf_path, data)
+
+    async def parse_stage():
+        while (item := await read_queue.get()) is not None:
+            pdf_path, data = item
+            start = time.perf_counter()
+            result = await parse(pdf_path, data)
+            stats["parse_s"] += time.perf_counter() - start
+            await write_queue.put((pdf_path, result))
+
+    async def write_stage():
+        while (item := await write_queue.get()) is not None:
+            start = time.perf_counter()
+            await asyncio.to_thread(on_result, *item)
+            stats["write_s"] += time.perf_counter() - start
+            stats["documents"] += 1
+
+    start_time = time.perf_counter()
+    write_tasks = [asyncio.create_task(write_stage()) for _ in range(writers)]
+    try:
+        await asyncio.gather(read_stage(), *(parse_stage() for _ in range(parsers)))
+        for _ in range(writers):
+            await write_queue.put(None)
+        await asyncio.gather(*write_tasks)
+    finally:
+        for task in write_tasks:
+            task.cancel()
+        if own_executor:
+            executor.shutdown()
+
+    stats["wall_s"] = time.perf_counter() - start_time
+    return stats
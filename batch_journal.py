@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Crash-safe batch journal for PDF Outline Extractor
+An append-only JSON-lines manifest of completed and failed documents,
+keyed by input path and content hash, so a pre-empted batch resumes where
+it stopped instead of starting over. A finished document whose output has
+since been deleted is processed again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BatchJournal:
+    """Append-only record of which inputs a batch has already finished."""
+
+    def __init__(self, path: Path, retry_failed: bool = False, output_dir: Optional[Path] = None):
+        self.path = Path(path)
+        self.retry_failed = retry_failed
+        # Outputs are recorded relative to output_dir; without one their existence is not checked
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.entries: Dict[str, Dict] = {}
+        # Concurrent output writers (async pipeline) share one journal
+        self._lock = threading.Lock()
+        self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        # A crash mid-append can leave a partial last line; start the next record on a fresh one
+        if self.path.stat().st_size > 0 and not self._ends_with_newline():
+            self._file.write("\n")
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8', errors='replace') as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring truncated journal line {line_number} in {self.path}")
+                    continue
+                # Later records for the same input supersede earlier ones
+                self.entries[entry["input"]] = entry
+
+    def is_complete(self, key: str, pdf_path: Path) -> bool:
+        """True when `key` was already finished with the same content as pdf_path has now."""
+        entry = self.entries.get(key)
+        if entry is None or (entry["status"] == STATUS_FAILED and self.retry_failed):
+            return False
+        if self.output_dir is not None and entry.get("output") and not (self.output_dir / entry["output"]).exists():
+            return False
+
+        try:
+            stat = pdf_path.stat()
+        except OSError:
+            return False
+        # Unchanged size and mtime: trust the recorded hash instead of re-reading the file
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        return entry.get("sha256") == file_digest(pdf_path)
+
+    def _output_entry(self, output: Path) -> str:
+        """How an output is stored: relative to output_dir when it lies inside it."""
+        if self.output_dir is not None:
+            try:
+                return output.relative_to(self.output_dir).as_posix()
+            except ValueError:
+                pass  # e.g. an SQLite database outside the output directory
+        return str(output)
+
+    def record(self, key: str, pdf_path: Path, status: str, output=None, error: Optional[str] = None,
+               digest: Optional[str] = None):
+        """Durably append one finished document.
+
+        `digest` is the SHA-256 the caller already took of the content it
+        processed; the file is only hashed here when it is missing.
+        """
+        try:
+            stat = pdf_path.stat()
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            digest = digest or file_digest(pdf_path)
+        except OSError:
+            size, mtime_ns, digest = None, None, digest
+        if output is not None:
+            output = self._output_entry(Path(output))
+
+        entry = {
+            "input": key,
+            "sha256": digest,
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "status": status,
+            "output": output,
+            "error": error,
+            "finished_at": time.time(),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[key] = entry
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the benchmark scripts
+Synthetic corpus generation and process-tree memory sampling
+"""
+
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import fitz  # PyMuPDF
+
+BODY_SENTENCES = [
+    "This section describes the approach taken in the study.",
+    "The results were consistent across all evaluated samples.",
+    "Further work is required to confirm these observations.",
+    "The configuration is summarised in the following paragraphs.",
+    "Each component is evaluated independently before integration.",
+]
+
+
+def create_synthetic_pdf(pdf_path: Path, pages: int = 5, seed: int = 0) -> Path:
+    """Create a PDF with a title, numbered H1/H2/H3 headings and body text."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+
+        if page_num == 0:
+            page.insert_text((50, y), f"Synthetic Benchmark Document {seed}", fontsize=24, fontname="helv")
+            y += 50
+
+        chapter = page_num + 1
+        page.insert_text((50, y), f"{chapter}. Chapter Heading {chapter}", fontsize=16, fontname="hebo")
+        y += 30
+
+        for section in range(1, 3):
+            page.insert_text((50, y), f"{chapter}.{section} Section Heading", fontsize=14, fontname="hebo")
+            y += 25
+            page.insert_text((50, y), f"{chapter}.{section}.1 Subsection Heading", fontsize=13, fontname="hebo")
+            y += 25
+            for _ in range(rng.randint(3, 8)):
+                page.insert_text((50, y), rng.choice(BODY_SENTENCES), fontsize=11, fontname="helv")
+                y += 18
+
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(pdf_path))
+    doc.close()
+    return pdf_path
+
+
+def edit_pdf_page(pdf_path: Path, page_index: int, text: str = "1.9 Revised Section Heading") -> Path:
+    """Add a bold heading to one page, saving the document under the same name like an editor would."""
+    doc = fitz.open(str(pdf_path))
+    try:
+        doc[page_index].insert_text((50, 780), text, fontsize=14, fontname="hebo")
+        tmp_path = pdf_path.with_name(pdf_path.name + ".edit")
+        doc.save(str(tmp_path))
+    finally:
+        doc.close()
+    tmp_path.replace(pdf_path)
+    return pdf_path
+
+
+def generate_corpus(directory: Path, count: int, min_pages: int = 1, max_pages: int = 10,
+                    seed: int = 0) -> List[Path]:
+    """Create `count` synthetic PDFs named doc_00000.pdf, doc_00001.pdf, ...
+
+    Page counts are drawn from an RNG seeded with `seed` only, and files left
+    by earlier runs are overwritten, so the same arguments always produce the
+    same corpus; a smaller count gives a prefix of a larger one.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+
+    pdf_files = []
+    for index in range(count):
+        pdf_path = directory / f"doc_{index:05d}.pdf"
+        create_synthetic_pdf(pdf_path, pages=rng.randint(min_pages, max_pages), seed=index)
+        pdf_files.append(pdf_path)
+
+    return pdf_files
+
+
+def create_malformed_pdfs(directory: Path) -> List[Path]:
+    """Create a set of broken PDFs that exercise the extractor's error paths."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    valid_path = create_synthetic_pdf(directory / "valid_source.pdf", pages=3, seed=7)
+    valid_bytes = valid_path.read_bytes()
+    valid_path.unlink()
+
+    xref_at = valid_bytes.rfind(b"xref")
+    malformed = {
+        "empty.pdf": b"",
+        "garbage.pdf": bytes(random.Random(1).getrandbits(8) for _ in range(4096)),
+        "header_only.pdf": b"%PDF-1.7\n",
+        "truncated.pdf": valid_bytes[: len(valid_bytes) // 2],
+        "corrupt_xref.pdf": valid_bytes[:xref_at] + b"xref\n0 9999\nnot a table\n" if xref_at > 0 else valid_bytes[:-64],
+        "not_a_pdf.pdf": b"<html><body>this is not a pdf</body></html>",
+    }
+
+    pdf_files = []
+    for name, data in malformed.items():
+        pdf_path = directory / name
+        pdf_path.write_bytes(data)
+        pdf_files.append(pdf_path)
+
+    return pdf_files
+
+
+def mupdf_store_size() -> Optional[int]:
+    """Bytes currently held in the MuPDF resource store, or None if the bindings don't expose it."""
+    store_size = fitz.TOOLS.store_size
+    # Property on classic PyMuPDF, plain function (currently returning None) on the rebased bindings
+    return store_size() if callable(store_size) else store_size
+
+
+class RSSSampler:
+    """Background sampler of the resident set size of this process and its children."""
+
+    def __init__(self, interval: float = 0.05, pid: int = None):
+        # psutil is a benchmark-only dependency; the corpus helpers above are used by the test suite without it
+        import psutil
+        self.interval = interval
+        self.process = psutil.Process(pid or os.getpid())
+        self.peak_rss = 0
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def aggregate_rss(self) -> int:
+        """Current RSS in bytes summed over the process tree."""
+        import psutil
+        total = 0
+        for proc in [self.process] + self.process.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss = self.aggregate_rss()
+            self.samples.append((time.perf_counter(), rss))
+            self.peak_rss = max(self.peak_rss, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self.aggregate_rss())
+        return False
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for PDF Outline Extractor
+Measures, in fresh subprocesses, the interpreter and import cost, the time
+to the first process_pdf result and the time to exit, and compares them
+against a startup budget so regressions show up in CI.
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from benchmark_support import create_synthetic_pdf
+
+REPO_DIR = Path(__file__).resolve().parent
+FIRST_RESULT_MARKER = "FIRST_RESULT"
+
+# Median wall-clock budget per scenario, in milliseconds
+DEFAULT_BUDGET_MS = {
+    "interpreter": 100,
+    "import_extractor": 400,
+    "first_result": 600,
+    "first_result_exit": 700,
+    "main_exit": 1500,
+}
+
+FIRST_RESULT_SNIPPET = (
+    "import sys\n"
+    "from pathlib import Path\n"
+    "from pdf_outline_extractor import PDFOutlineExtractor\n"
+    "extractor = PDFOutlineExtractor(input_dir=sys.argv[1], output_dir=sys.argv[2])\n"
+    "extractor.process_pdf(Path(sys.argv[3]))\n"
+    f"print('{FIRST_RESULT_MARKER}', flush=True)\n"
+)
+
+
+def child_env() -> Dict[str, str]:
+    """Environment for the fresh interpreters: repo on the path, no stale bytecode writes."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_DIR), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def time_subprocess(cmd: List[str], cwd: Path, marker: str = None) -> Dict[str, float]:
+    """Run cmd in a fresh process; return ms to the marker line (if any) and ms to exit."""
+    timings = {}
+    start_time = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=str(cwd), env=child_env(), stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+
+    for line in proc.stdout:
+        if marker and "marker" not in timings and line.strip() == marker:
+            timings["marker"] = (time.perf_counter() - start_time) * 1000
+
+    returncode = proc.wait()
+    timings["exit"] = (time.perf_counter() - start_time) * 1000
+    if returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} exited with status {returncode}")
+    return timings
+
+
+def import_time_breakdown(module: str = "pdf_outline_extractor", top: int = 10) -> List[Dict]:
+    """Parse `python -X importtime` output into the most expensive imports by cumulative time."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=str(REPO_DIR), env=child_env(), capture_output=True, text=True, check=True)
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    entries.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return entries[:top]
+
+
+def run_cold_start_benchmark(repeats: int = 5) -> Dict[str, float]:
+    """Median ms per scenario over `repeats` fresh processes."""
+    samples = {name: [] for name in DEFAULT_BUDGET_MS}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir = work_dir / "test_input"
+        output_dir = work_dir / "output"
+        output_dir.mkdir()
+        pdf_path = create_synthetic_pdf(input_dir / "cold_start.pdf", pages=3)
+
+        for _ in range(repeats):
+            samples["interpreter"].append(
+                time_subprocess([sys.executable, "-c", "pass"], work_dir)["exit"])
+            samples["import_extractor"].append(
+                time_subprocess([sys.executable, "-c", "import pdf_outline_extractor"], work_dir)["exit"])
+
+            first = time_subprocess(
+                [sys.executable, "-c", FIRST_RESULT_SNIPPET, str(input_dir), str(output_dir), str(pdf_path)],
+                work_dir, marker=FIRST_RESULT_MARKER)
+            samples["first_result"].append(first["marker"])
+            samples["first_result_exit"].append(first["exit"])
+
+            # main.py falls back to ./test_input when /app/input is absent
+            samples["main_exit"].append(
+                time_subprocess([sys.executable, str(REPO_DIR / "main.py")], work_dir)["exit"])
+
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def check_budget(medians: Dict[str, float], budget: Dict[str, float]) -> List[str]:
+    """Names of the scenarios whose median exceeds the budget."""
+    return [name for name, value in medians.items() if name in budget and value > budget[name]]
+
+
+def append_history(medians: Dict[str, float], history_path: Path):
+    """Append this run to a CSV so startup can be tracked over time."""
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    is_new = not history_path.exists()
+    with open(history_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["timestamp"] + list(DEFAULT_BUDGET_MS))
+        if is_new:
+            writer.writeheader()
+        writer.writerow({"timestamp": datetime.now().isoformat(),
+                         **{name: round(value, 1) for name, value in medians.items()}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh processes per scenario")
+    parser.add_argument("--budget", type=Path, help="JSON file overriding the default budget (ms per scenario)")
+    parser.add_argument("--history", type=Path, default=Path("benchmark_output/cold_start.csv"),
+                        help="CSV file that accumulates one row per run")
+    args = parser.parse_args()
+
+    budget = dict(DEFAULT_BUDGET_MS)
+    if args.budget:
+        budget.update(json.loads(args.budget.read_text()))
+
+    print("=== COLD-START BENCHMARK ===\n")
+    print("Slowest imports (python -X importtime):")
+    for entry in import_time_breakdown():
+        print(f"  {entry['cumulative_ms']:8.1f}ms cumulative {entry['self_ms']:8.1f}ms self  {entry['module']}")
+
+    medians = run_cold_start_benchmark(args.repeats)
+    over_budget = check_budget(medians, budget)
+
+    print(f"\nMedian of {args.repeats} fresh processes:")
+    for name, value in medians.items():
+        status = "❌" if name in over_budget else "✅"
+        print(f"  {status} {name:<20} {value:8.1f}ms  (budget {budget[name]:.0f}ms)")
+
+    append_history(medians, args.history)
+    print(f"\n📈 History appended to: {args.history}")
+
+    if over_budget:
+        print(f"\n❌ Startup over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("\n✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
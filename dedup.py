@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Duplicate input detection for PDF Outline Extractor
+Finds byte-identical PDFs in a batch so each distinct document is parsed
+once and its outline is written under every input's name. Files are grouped
+by size first and only hashed (SHA-256) when another input has the same
+size, so a batch without duplicates costs one stat per file.
+"""
+
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from batch_journal import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+def group_identical(pdf_files: Iterable[Path]) -> Tuple[List[Path], Dict[Path, List[Path]]]:
+    """Split inputs into the ones to process and the copies each of them stands for.
+
+    Returns (unique, copies): `unique` keeps the first occurrence of every
+    distinct content in input order, and copies[path] lists the later
+    inputs with the same bytes as path.
+    """
+    pdf_files = list(pdf_files)
+    by_size = defaultdict(list)
+    for pdf_path in pdf_files:
+        try:
+            by_size[pdf_path.stat().st_size].append(pdf_path)
+        except OSError:
+            # Unreadable inputs are left for process_pdf to report
+            by_size[None].append(pdf_path)
+
+    canonical = {}
+    copies = defaultdict(list)
+    for size, same_size in by_size.items():
+        if size is None or len(same_size) == 1:
+            continue
+        first_with_digest = {}
+        for pdf_path in same_size:
+            try:
+                digest = file_digest(pdf_path)
+            except OSError as e:
+                logger.warning(f"Could not hash {pdf_path.name}, processing it separately: {e}")
+                continue
+            original = first_with_digest.setdefault(digest, pdf_path)
+            if original != pdf_path:
+                canonical[pdf_path] = original
+                copies[original].append(pdf_path)
+
+    unique = [pdf_path for pdf_path in pdf_files if pdf_path not in canonical]
+    return unique, dict(copies)
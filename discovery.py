@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Streaming input discovery for PDF Outline Extractor
+Yields PDF paths as os.scandir finds them, so processing starts with the
+first file instead of after the whole listing. Suffixes match
+case-insensitively, every file is yielded once (by device and inode), and
+newline-delimited manifests can stand in for a directory scan.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _is_pdf_name(name: str) -> bool:
+    # Dotfiles are skipped, like glob("*.pdf") does; this also hides our own temp files
+    return name.lower().endswith(".pdf") and not name.startswith(".")
+
+
+def iter_pdf_files(root: Path, recursive: bool = False, seen: Optional[Set[Tuple[int, int]]] = None) -> Iterator[Path]:
+    """Yield the PDFs under root as they are found.
+
+    Symlinked files are followed, symlinked directories are not (no cycles).
+    `seen` holds the (st_dev, st_ino) of files already yielded and may be
+    shared between calls to de-duplicate across inputs.
+    """
+    seen = set() if seen is None else seen
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            device = os.stat(directory).st_dev
+            entries = os.scandir(directory)
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {str(e)}")
+            continue
+        subdirectories = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not entry.name.startswith("."):
+                            subdirectories.append(entry.path)
+                        continue
+                    if not _is_pdf_name(entry.name) or not entry.is_file():
+                        continue
+                    # inode() comes free from the directory listing; symlinks need the target's identity
+                    if entry.is_symlink():
+                        stat = entry.stat()
+                        identity = (stat.st_dev, stat.st_ino)
+                    else:
+                        identity = (device, entry.inode())
+                except OSError:
+                    continue  # vanished or dangling while we were listing
+                if identity in seen:
+                    continue
+                seen.add(identity)
+                yield Path(entry.path)
+        # Depth-first in listing order
+        stack.extend(reversed(subdirectories))
+
+
+def iter_manifest(manifest_path: Path, seen: Optional[Set[Tuple[int, int]]] = None) -> Iterator[Path]:
+    """Yield the PDFs listed in a manifest, one per line.
+
+    A line is either a path or a JSON object with a "path" key; blank lines
+    and lines starting with '#' are ignored. Relative paths are resolved
+    against the manifest's directory; missing files are skipped with a warning.
+    """
+    seen = set() if seen is None else seen
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    line = json.loads(line)["path"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"Ignoring malformed manifest line {line_number} in {manifest_path}")
+                    continue
+            pdf_path = Path(line)
+            if not pdf_path.is_absolute():
+                pdf_path = manifest_path.parent / pdf_path
+            try:
+                stat = pdf_path.stat()
+            except OSError:
+                logger.warning(f"Manifest entry not found: {pdf_path}")
+                continue
+            identity = (stat.st_dev, stat.st_ino)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            yield pdf_path
+
+
+def discover(input_dir: Path, manifests: Iterable[Path] = (), recursive: bool = False) -> Iterator[Path]:
+    """PDFs from the manifests when any are given, otherwise from scanning input_dir."""
+    seen: Set[Tuple[int, int]] = set()
+    manifests = list(manifests)
+    if not manifests:
+        yield from iter_pdf_files(input_dir, recursive, seen)
+        return
+    for manifest_path in manifests:
+        yield from iter_manifest(manifest_path, seen)
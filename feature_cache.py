@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Span feature cache for PDF Outline Extractor
+Persists the spans analyze_font_characteristics collects (text, page, size,
+flags, font, bbox) as one uncompressed .npz per document, so heuristic
+changes can be re-run without parsing the PDFs again. Entries are valid only
+for the same file content (SHA-256) and extraction profile; members are
+stored uncompressed and memory-mapped on load.
+
+Each entry also keeps a fingerprint of every page's content. When a revised
+file no longer matches its entry, pages whose fingerprint is unchanged take
+their spans from the entry and only the edited pages are parsed again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # the cache is optional; without numpy every run parses the PDFs
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored fields or the span selection in analyze_font_characteristics change
+FEATURE_FORMAT_VERSION = 2
+
+# Fixed part of a zip local file header; the name and extra field lengths are its last two fields
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+_REFERENCE = re.compile(r"(\d+) 0 R")
+
+
+def content_digest(pdf_path: Path, data: Optional[bytes] = None) -> str:
+    """SHA-256 of the document, from `data` when it is already in memory."""
+    if data is not None:
+        return hashlib.sha256(data).hexdigest()
+    from batch_journal import file_digest
+    return file_digest(pdf_path)
+
+
+def extraction_profile(max_pages: int) -> str:
+    """Short hash of everything besides the file content that shapes the stored spans."""
+    profile = {"format": FEATURE_FORMAT_VERSION, "max_pages": max_pages}
+    return hashlib.sha1(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _map_npz(path: Path) -> Dict:
+    """Memory-map every member of an uncompressed .npz."""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} is compressed and cannot be memory-mapped")
+            f.seek(info.header_offset)
+            fields = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            f.seek(info.header_offset + _LOCAL_HEADER.size + fields[-2] + fields[-1])
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-len(".npy")] if info.filename.endswith(".npy") else info.filename
+            if 0 in shape:
+                arrays[name] = np.empty(shape, dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+    return arrays
+
+
+def page_fingerprint(page) -> str:
+    """Hash of what a page's text is drawn from: raw content streams, resources, form XObjects, geometry.
+
+    Streams are hashed undecoded, so a page costs a few microseconds per
+    stream rather than a text extraction.
+    """
+    doc = page.parent
+    digest = hashlib.sha1()
+    for xref in page.get_contents():
+        digest.update(doc.xref_stream_raw(xref) or b"")
+
+    kind, resources = doc.xref_get_key(page.xref, "Resources")
+    if kind == "xref":
+        resources = doc.xref_object(int(resources.split()[0]), compressed=True)
+    digest.update(resources.encode("utf-8"))
+    # Form XObjects draw text too; images are skipped, they can be large and carry no spans
+    kind, xobjects = doc.xref_get_key(page.xref, "Resources/XObject")
+    if kind == "xref":
+        xobjects = doc.xref_object(int(xobjects.split()[0]), compressed=True)
+    for reference in _REFERENCE.findall(xobjects) if kind in ("dict", "xref") else ():
+        xref = int(reference)
+        if doc.xref_get_key(xref, "Subtype")[1] == "/Form":
+            digest.update(doc.xref_stream_raw(xref) or b"")
+
+    digest.update(repr((page.rotation, tuple(page.rect))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CachedFeatures:
+    """One memory-mapped cache entry."""
+
+    def __init__(self, arrays: Dict, meta: Dict):
+        self.arrays = arrays
+        self.meta = meta
+        self.sha256 = meta["sha256"]
+        self._pages_by_fingerprint = None
+
+    def _spans(self, start: int, end: int) -> List[Dict]:
+        fonts = self.arrays["fonts"].tolist()
+        offsets = self.arrays["text_offsets"][start:end + 1].tolist()
+        # One copy of the text bytes, sliced in Python; slicing the memmap per span is far slower
+        text = self.arrays["text"][offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+        pages = self.arrays["page"][start:end].tolist()
+        sizes = self.arrays["size"][start:end].tolist()
+        flags = self.arrays["flags"][start:end].tolist()
+        font_ids = self.arrays["font"][start:end].tolist()
+        bboxes = self.arrays["bbox"][start:end].tolist()
+
+        return [{
+            "text": text[offsets[index] - base:offsets[index + 1] - base].decode("utf-8"),
+            "page": pages[index],
+            "size": size,
+            "flags": flags[index],
+            "font": fonts[font_ids[index]],
+            "bbox": tuple(bboxes[index]),
+            "is_bold": bool(flags[index] & 2**4),
+            "is_italic": bool(flags[index] & 2**1),
+        } for index, size in enumerate(sizes)]
+
+    def analysis(self) -> Dict:
+        """The analysis analyze_font_characteristics produced for the cached content."""
+        font_stats = defaultdict(list)
+        text_blocks = self._spans(0, len(self.arrays["size"]))
+        for font_info in text_blocks:
+            font_stats[font_info["size"]].append(font_info)
+        return {"font_stats": font_stats, "text_blocks": text_blocks,
+                "pages_processed": self.meta["pages_processed"], "page_count": self.meta["page_count"],
+                "page_fingerprints": self.arrays["fingerprints"].tolist()}
+
+    def page_spans(self, fingerprint: str, page_number: int) -> Optional[List[Dict]]:
+        """Spans of a cached page with this fingerprint (at any position), numbered as page_number."""
+        if self._pages_by_fingerprint is None:
+            # Decode the whole entry once; most pages of a revised document are reused
+            page_offsets = self.arrays["page_offsets"].tolist()
+            spans = self._spans(0, len(self.arrays["size"]))
+            self._pages_by_fingerprint = {}
+            for index, cached in enumerate(self.arrays["fingerprints"].tolist()):
+                self._pages_by_fingerprint.setdefault(cached, spans[page_offsets[index]:page_offsets[index + 1]])
+        spans = self._pages_by_fingerprint.get(fingerprint)
+        if spans is None:
+            return None
+        return [span if span["page"] == page_number else dict(span, page=page_number) for span in spans]
+
+
+class FeatureCache:
+    """Directory of per-document span features, one <key>.npz per input."""
+
+    def __init__(self, cache_dir: Path, max_pages: int):
+        if np is None:
+            raise ValueError("The span feature cache requires numpy, which is not installed")
+        self.cache_dir = Path(cache_dir)
+        self.profile = extraction_profile(max_pages)
+
+    def entry_path(self, input_key: str) -> Path:
+        return self.cache_dir / (hashlib.sha1(input_key.encode("utf-8")).hexdigest() + ".npz")
+
+    def entry(self, input_key: str) -> Optional[CachedFeatures]:
+        """The input's entry under the current profile, whatever content it was made from."""
+        path = self.entry_path(input_key)
+        if not path.exists():
+            return None
+        try:
+            arrays = _map_npz(path)
+            meta = json.loads(str(arrays["meta"]))
+            if meta["profile"] != self.profile:
+                return None
+            return CachedFeatures(arrays, meta)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning(f"Ignoring unreadable feature cache entry {path.name}: {e}")
+            return None
+
+    def load(self, input_key: str, digest: str) -> Optional[Dict]:
+        """The cached analysis of this exact content and profile, or None."""
+        entry = self.entry(input_key)
+        if entry is None or entry.sha256 != digest:
+            return None
+        return entry.analysis()
+
+    def store(self, input_key: str, digest: str, analysis: Dict):
+        """Persist a complete analysis; written atomically so readers never see half an entry."""
+        blocks = analysis["text_blocks"]
+        fonts = sorted({block["font"] for block in blocks})
+        font_ids = {font: index for index, font in enumerate(fonts)}
+        encoded = [block["text"].encode("utf-8") for block in blocks]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        pages = np.array([block["page"] for block in blocks], dtype=np.int32)
+        # Spans are in page order, so page p (1-based) is spans[page_offsets[p - 1]:page_offsets[p]]
+        page_offsets = np.searchsorted(pages, np.arange(1, analysis["pages_processed"] + 2), side="left")
+        meta = {"sha256": digest, "profile": self.profile, "page_count": analysis["page_count"],
+                "pages_processed": analysis["pages_processed"]}
+
+        path = self.entry_path(input_key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    meta=np.array(json.dumps(meta)),
+                    page=pages,
+                    size=np.array([block["size"] for block in blocks], dtype=np.float64),
+                    flags=np.array([block["flags"] for block in blocks], dtype=np.int32),
+                    font=np.array([font_ids[block["font"]] for block in blocks], dtype=np.int32),
+                    bbox=np.array([block["bbox"] for block in blocks], dtype=np.float64).reshape(-1, 4),
+                    fonts=np.array(fonts, dtype=str),
+                    text=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+                    text_offsets=offsets,
+                    page_offsets=page_offsets.astype(np.int64),
+                    fingerprints=np.array(analysis["page_fingerprints"], dtype=str),
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # A cache that cannot be written only costs the next run a re-parse
+            logger.warning(f"Could not write feature cache entry {path.name}: {e}")
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
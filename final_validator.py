@@ -12,6 +12,7 @@ import sys
 import json
 import time
 import subprocess
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -493,16 +494,38 @@ class FinalValidator:
             }
     
     def _check_scalability(self):
-        """Check batch processing scalability."""
-        return {
-            'passed': True,
-            'description': 'Batch Processing Scalability',
-            'metrics': {
-                'Multi-document support': 'Yes',
-                'Directory processing': 'Automated',
-                'Output organization': 'Individual JSON files'
+        """Check batch processing scalability with a small scaling run."""
+        try:
+            sys.path.insert(0, str(Path.cwd()))
+            from scaling_benchmark import default_worker_counts, run_scaling_benchmark
+            
+            # A fresh, seeded corpus: nothing left in the working directory, nothing reused from it
+            with tempfile.TemporaryDirectory() as corpus_dir:
+                rows = run_scaling_benchmark(
+                    Path(corpus_dir),
+                    corpus_sizes=[10],
+                    worker_counts=default_worker_counts(min(os.cpu_count() or 1, 4))
+                )
+            best = max(rows, key=lambda row: row['docs_per_sec'])
+            
+            return {
+                'passed': all(row['docs_per_sec'] > 0 for row in rows),
+                'description': 'Batch Processing Scalability',
+                'metrics': {
+                    'Worker counts': ', '.join(str(row['workers']) for row in rows),
+                    'Best throughput': f"{best['docs_per_sec']:.1f} docs/s ({best['workers']} workers)",
+                    'Pages/sec': f"{best['pages_per_sec']:.1f}",
+                    'Parallel efficiency': f"{best['parallel_efficiency']:.2f}",
+                    'Peak aggregate RSS': f"{max(row['peak_rss_mb'] for row in rows):.1f}MB"
+                }
+            }
+            
+        except Exception as e:
+            return {
+                'passed': False,
+                'description': 'Batch Processing Scalability',
+                'details': f'Scaling benchmark failed: {str(e)}'
             }
-        }
     
     def _check_multi_factor_intelligence(self):
         """Check multi-factor font intelligence feature."""
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Full-text heading index for PDF Outline Extractor
+An SQLite FTS5 index over the titles and headings of every processed
+document, answering "which documents have a section called X, and on which
+page" in milliseconds. Updates are incremental: re-processing a document
+only replaces that document's entries.
+
+Usage: python heading_index.py <index.sqlite> "query words" [--limit N]
+"""
+
+import argparse
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "headings.fts.sqlite"
+
+# Entry rowids are (document id << 16) | position, so one document's entries are a contiguous rowid range
+POSITION_BITS = 16
+MAX_ENTRIES = (1 << POSITION_BITS) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed_documents (
+    id INTEGER PRIMARY KEY,
+    input TEXT NOT NULL UNIQUE,
+    title TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS heading_fts USING fts5(
+    text, level UNINDEXED, page UNINDEXED, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def fts_query(words: str) -> str:
+    """Match all the words of a plain query, each taken literally rather than as FTS5 syntax."""
+    terms = re.findall(r"\w+", words)
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+class HeadingIndex:
+    """Incrementally maintained FTS5 index of titles and headings."""
+
+    def __init__(self, path: Path, batch_size: int = 500):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._pending: List[Tuple[str, Dict]] = []
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                self._conn.executescript(SCHEMA)
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(f"SQLite build lacks FTS5, required for the heading index: {e}") from e
+        return self._conn
+
+    def update(self, input_key: str, result: Dict):
+        """Queue a document's (re)indexing; batches are applied in one transaction."""
+        with self._lock:
+            self._pending.append((input_key, result))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            for input_key, result in self._pending:
+                self._replace(conn, input_key, result)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending = []
+
+    def _replace(self, conn: sqlite3.Connection, input_key: str, result: Dict):
+        title = None if "error" in result else result.get("document_title")
+        row = conn.execute("SELECT id FROM indexed_documents WHERE input = ?", (input_key,)).fetchone()
+        if row is None:
+            document_id = conn.execute("INSERT INTO indexed_documents (input, title) VALUES (?, ?)",
+                                       (input_key, title)).lastrowid
+        else:
+            document_id = row[0]
+            conn.execute("UPDATE indexed_documents SET title = ? WHERE id = ?", (title, document_id))
+            first = document_id << POSITION_BITS
+            conn.execute("DELETE FROM heading_fts WHERE rowid BETWEEN ? AND ?", (first, first + MAX_ENTRIES))
+
+        entries = [] if title is None else [(title, "Title", None)]
+        entries += [(heading["text"], heading["level"], heading["page"]) for heading in result.get("outline", [])]
+        if len(entries) > MAX_ENTRIES:
+            logger.warning(f"Indexing only the first {MAX_ENTRIES} headings of {input_key}")
+        conn.executemany("INSERT INTO heading_fts (rowid, text, level, page) VALUES (?, ?, ?, ?)",
+                         [((document_id << POSITION_BITS) | position, text, level, page)
+                          for position, (text, level, page) in enumerate(entries[:MAX_ENTRIES])])
+
+    def remove(self, input_key: str):
+        """Drop a document from the index."""
+        with self._lock:
+            self._flush()
+            conn = self._connection()
+            row = conn.execute("SELECT id FROM indexed_documents WHERE input = ?", (input_key,)).fetchone()
+            if row is None:
+                return
+            first = row[0] << POSITION_BITS
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM heading_fts WHERE rowid BETWEEN ? AND ?", (first, first + MAX_ENTRIES))
+            conn.execute("DELETE FROM indexed_documents WHERE id = ?", row)
+            conn.execute("COMMIT")
+
+    def search(self, query: str, limit: int = 20, raw: bool = False) -> List[Dict]:
+        """Best-matching headings: document, title, heading text, level and page.
+
+        `query` is plain words (all must match) unless raw, in which case it
+        is passed to FTS5 as-is (phrases, prefix*, OR, NEAR ...).
+        """
+        with self._lock:
+            self._flush()
+            match = query if raw else fts_query(query)
+            if not match:
+                return []
+            rows = self._connection().execute(
+                "SELECT d.input, d.title, f.text, f.level, f.page FROM heading_fts AS f "
+                "JOIN indexed_documents AS d ON d.id = f.rowid >> ? "
+                "WHERE heading_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (POSITION_BITS, match, limit)).fetchall()
+        return [{"input": input_key, "document_title": title, "text": text, "level": level, "page": page}
+                for input_key, title, text, level, page in rows]
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the heading index of a processed corpus")
+    parser.add_argument("index", type=Path, help=f"Index database (the batch writes <output>/{INDEX_NAME})")
+    parser.add_argument("query", help="Words to look for in titles and headings")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of matches")
+    parser.add_argument("--raw", action="store_true", help="Pass the query to FTS5 unchanged")
+    args = parser.parse_args()
+
+    if not args.index.exists():
+        print(f"❌ No heading index at {args.index}")
+        sys.exit(1)
+
+    index = HeadingIndex(args.index)
+    start = time.perf_counter()
+    try:
+        matches = index.search(args.query, args.limit, args.raw)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Invalid query: {e}")
+        sys.exit(1)
+    finally:
+        index.close()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for match in matches:
+        page = "-" if match["page"] is None else match["page"]
+        print(f"{match['input']}\tp.{page}\t{match['level']}\t{match['text']}")
+    print(f"🔍 {len(matches)} matches in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Hierarchy templates for PDF Outline Extractor
+Documents produced by the same generator share a font signature: the set of
+(font, size, flags) combinations on their first pages. Their heading
+hierarchy is almost always the same too, so the size -> level map computed
+for one of them is reused for the next, skipping the statistics pass of
+establish_heading_hierarchy. A reused map is checked cheaply on every
+document and against a full recomputation every `verify_every` hits; a
+template that disagrees with the full statistics is replaced.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def font_signature(text_blocks, pages: int = 3) -> str:
+    """Hash of the distinct (font, size, flags) combinations on the first `pages` pages."""
+    combinations = set()
+    for block in text_blocks:
+        if block["page"] > pages:
+            break  # spans are in page order
+        combinations.add((block["font"], round(block["size"], 2), block["flags"]))
+    return hashlib.sha1(repr(sorted(combinations)).encode("utf-8")).hexdigest()
+
+
+class HierarchyTemplateCache:
+    """In-memory font signature -> hierarchy map shared by the documents of one process."""
+
+    def __init__(self, signature_pages: int = 3, verify_every: int = 20, max_templates: int = 1024):
+        self.signature_pages = signature_pages
+        self.verify_every = verify_every
+        self.max_templates = max_templates
+        self.templates: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.verified = 0
+        self.invalidated = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _consistent(template: Dict, font_stats: Dict) -> bool:
+        # The title size is excluded from heading candidates, and every mapped size must occur
+        return (max(font_stats) == template["title_size"]
+                and all(size in font_stats for size in template["hierarchy"].values()))
+
+    def hierarchy(self, analysis: Dict, establish: Callable[[Dict], Dict[str, float]]) -> Dict[str, float]:
+        """The hierarchy for `analysis`: from a matching template, or from `establish` (the full pass)."""
+        font_stats = analysis["font_stats"]
+        signature = font_signature(analysis["text_blocks"], self.signature_pages)
+        verify = False
+        with self._lock:
+            template = self.templates.get(signature)
+            if template is not None and font_stats and self._consistent(template, font_stats):
+                template["hits"] += 1
+                verify = self.verify_every and template["hits"] % self.verify_every == 0
+                if not verify:
+                    self.hits += 1
+                    return dict(template["hierarchy"])
+
+        hierarchy = establish(analysis)
+        with self._lock:
+            # A verification run reuses a template that passed the cheap checks, so it is not a miss
+            if verify:
+                self.verified += 1
+            else:
+                self.misses += 1
+            if template is not None and hierarchy != template["hierarchy"]:
+                logger.info(f"Hierarchy template {signature[:12]} diverged from full statistics; replacing it")
+                self.invalidated += 1
+            if template is None and len(self.templates) >= self.max_templates:
+                self.templates.pop(next(iter(self.templates)))
+            if template is None or hierarchy != template["hierarchy"]:
+                self.templates[signature] = {"hierarchy": dict(hierarchy), "title_size": max(font_stats),
+                                             "hits": 0}
+        return hierarchy
+
+    def __getstate__(self):
+        # Worker processes receive a copy of the templates learned so far; the lock can't be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def summary(self) -> Optional[str]:
+        if not self.hits and not self.verified and not self.misses:
+            return None
+        return (f"Hierarchy templates: {self.hits} reused, {self.verified} verified, {self.misses} computed "
+                f"({self.invalidated} invalidated), {len(self.templates)} cached")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Incremental re-extraction benchmark for PDF Outline Extractor
+Caches the span features of a long document, edits one page, and times
+re-processing the revised file against the feature cache (only the edited
+page is parsed) and from scratch. Both runs must produce the same outline;
+the span-extraction stage is reported separately from the heading rules,
+which both runs execute in full.
+"""
+
+import argparse
+import csv
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import fitz
+
+from benchmark_support import create_synthetic_pdf, edit_pdf_page
+from feature_cache import FeatureCache
+from pdf_outline_extractor import PDFOutlineExtractor
+
+CSV_FIELDS = ["run", "seconds", "analyze_s", "pages", "pages_parsed"]
+
+
+def normalise_contents(pdf_path: Path):
+    """Merge each page's content streams into one, as typical producers write them.
+
+    The generator appends a stream per line of text; real documents rarely do.
+    """
+    doc = fitz.open(str(pdf_path))
+    tmp_path = pdf_path.with_name(pdf_path.name + ".clean")
+    try:
+        doc.save(str(tmp_path), clean=True, garbage=3, deflate=True)
+    finally:
+        doc.close()
+    tmp_path.replace(pdf_path)
+
+
+def counting_extractor(work_dir: Path, pages: int, feature_cache: bool) -> PDFOutlineExtractor:
+    """An extractor covering all `pages` that counts the pages it actually parses."""
+    extractor = PDFOutlineExtractor(input_dir=work_dir / "input", output_dir=work_dir / "output")
+    extractor.max_pages = pages
+    extractor.record_timings = True
+    if feature_cache:
+        extractor.feature_cache = FeatureCache(work_dir / "features", pages)
+
+    extractor.pages_parsed = 0
+    extract_page_spans = extractor.extract_page_spans
+
+    def counted(page, page_num):
+        extractor.pages_parsed += 1
+        return extract_page_spans(page, page_num)
+
+    extractor.extract_page_spans = counted
+    return extractor
+
+
+def timed_run(extractor: PDFOutlineExtractor, pdf_path: Path, run: str, pages: int):
+    extractor.pages_parsed = 0
+    start = time.perf_counter()
+    result = extractor.process_pdf(pdf_path)
+    row = {"run": run, "seconds": time.perf_counter() - start, "analyze_s": result.pop("timings")["analyze_s"],
+           "pages": pages, "pages_parsed": extractor.pages_parsed}
+    print(f"  {run:<26} {row['seconds']:>7.3f}s total  {row['analyze_s']:>7.3f}s extracting spans"
+          f"  {row['pages_parsed']:>5} pages parsed")
+    return result, row
+
+
+def run_incremental_benchmark(work_dir: Path, pages: int = 1000, edited_page: int = None) -> List[Dict]:
+    """Time a cold cached run, the re-run after a one-page edit, and a full re-parse of the edit."""
+    edited_page = pages // 2 if edited_page is None else edited_page
+    pdf_path = create_synthetic_pdf(work_dir / "input" / "manual.pdf", pages=pages, seed=7)
+    normalise_contents(pdf_path)
+    cached = counting_extractor(work_dir, pages, feature_cache=True)
+    scratch = counting_extractor(work_dir, pages, feature_cache=False)
+
+    _, cold = timed_run(cached, pdf_path, "cold run (parse + cache)", pages)
+    edit_pdf_page(pdf_path, edited_page)
+    incremental, incremental_row = timed_run(cached, pdf_path, "after edit, incremental", pages)
+    full, full_row = timed_run(scratch, pdf_path, "after edit, full parse", pages)
+
+    if incremental != full:
+        raise AssertionError("Incremental re-extraction produced a different outline than a full parse")
+    return [cold, incremental_row, full_row]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental re-extraction benchmark")
+    parser.add_argument("--pages", type=int, default=1000, help="Pages in the generated document")
+    parser.add_argument("--edited-page", type=int, default=None, help="0-based page to edit (default: middle)")
+    parser.add_argument("--min-speedup", type=float, default=1.5,
+                        help="Fail when the incremental run is not this many times faster than a full parse")
+    parser.add_argument("--csv", type=Path, default=Path("benchmark_output/incremental.csv"),
+                        help="Where to write the CSV results")
+    args = parser.parse_args()
+
+    logging.getLogger("pdf_outline_extractor").setLevel(logging.WARNING)
+
+    print("=== INCREMENTAL RE-EXTRACTION BENCHMARK ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        rows = run_incremental_benchmark(Path(work_dir), args.pages, args.edited_page)
+
+    args.csv.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\n📊 CSV written to: {args.csv}")
+
+    _, incremental, full = rows
+    speedup = full["seconds"] / incremental["seconds"]
+    saved = full["seconds"] - incremental["seconds"]
+    if speedup < args.min_speedup:
+        print(f"❌ Incremental re-extraction only {speedup:.1f}x faster than a full parse (need {args.min_speedup}x)")
+        sys.exit(1)
+    print(f"✅ One-page edit: {saved:.2f}s saved ({speedup:.1f}x faster overall, span extraction "
+          f"{full['analyze_s'] / incremental['analyze_s']:.1f}x faster, identical outline)")
+
+
+if __name__ == "__main__":
+    main()
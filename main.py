@@ -1,7 +1,319 @@
 #!/usr/bin/env python3
 """
 🏆 Adobe Hackathon 2025 - Round 1A
-SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
+SmartPDF Outliner: AI-Powered Document Structure Extraction
+Team: InnovateAI Solutions
+Challenge: PDF Outline Extraction with ML-Powered Structure Recognition
+Submission Date: July 28, 2025
+
+Revolutionary PDF analysis tool that combines advanced font analysis with
+pattern recognition to achieve human-level accuracy in document structure
+understanding. Extracts Title, H1, H2, H3 headings with precise page numbers.
+
+Performance: 35x faster than requirements (0.28s vs 10s for 50 pages)
+Efficiency: 100x more memory efficient (2MB vs 200MB limit)
+Accuracy: 95%+ heading detection with <5% false positives
+
+Requirements Met:
+✅ No internet access (offline processing)
+✅ CPU-only (no GPU dependencies) 
+✅ Model size < 200MB (actual: ~45MB)
+✅ Processes up to 50 pages per PDF
+✅ Completes in <10s for 50-page PDF (actual: ~0.28s)
+✅ Docker containerized for linux/amd64
+✅ Robust edge case handling
+✅ Enterprise-grade error recovery
+"""
+
+import sys
+import argparse
+import logging
+import time
+from pathlib import Path
+from datetime import datetime
+
+# Import the main extractor (feature modules are imported only when their flags are used)
+from pdf_outline_extractor import PDFOutlineExtractor
+
+# Hackathon branding
+TEAM_NAME = "InnovateAI Solutions"
+PROJECT_NAME = "SmartPDF Outliner"
+CHALLENGE = "Adobe Hackathon 2025 - Round 1A"
+
+def print_hackathon_banner():
+    """Display professional hackathon banner."""
+    banner = f"""
+╔═══════════════════════════════════════════════════════════════╗
+║                                                               ║
+║  🏆 {CHALLENGE:<52} ║
+║  📄 {PROJECT_NAME:<52} ║  
+║  🚀 Team: {TEAM_NAME:<46} ║
+║                                                               ║
+║  🎯 Challenge: PDF Structure Extraction with AI              ║
+║  ⚡ Performance: 35x faster than requirements                ║
+║  🧠 Innovation: ML-powered font & pattern analysis           ║
+║                                                               ║
+╚═══════════════════════════════════════════════════════════════╝
+"""
+    print(banner)
+
+def setup_professional_logging(output_dir: Path):
+    """Setup professional logging for hackathon submission."""
+    
+    # Create logs directory
+    logs_dir = output_dir / "logs"
+    logs_dir.mkdir(exist_ok=True)
+    
+    # Setup multiple log handlers
+    log_handlers = [
+        logging.StreamHandler(sys.stdout)
+    ]
+    
+    # Add file handlers if possible
+    try:
+        # Main processing log
+        main_log = logs_dir / f"smartpdf_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        log_handlers.append(logging.FileHandler(main_log, mode='w'))
+        
+        # Performance metrics log
+        perf_log = logs_dir / "performance_metrics.log"
+        perf_handler = logging.FileHandler(perf_log, mode='w')
+        perf_handler.setLevel(logging.INFO)
+        log_handlers.append(perf_handler)
+        
+    except (PermissionError, OSError):
+        pass  # Skip file logging if not possible
+    
+    # Configure logging with professional format
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s | %(levelname)-8s | %(name)-15s | %(message)s',
+        handlers=log_handlers,
+        force=True
+    )
+    
+    return logging.getLogger(__name__)
+
+def log_system_info(logger):
+    """Log system and environment information."""
+    import platform
+    import os
+    
+    logger.info("=" * 60)
+    logger.info("🖥️  SYSTEM INFORMATION")
+    logger.info(f"   Platform: {platform.platform()}")
+    logger.info(f"   Python: {platform.python_version()}")
+    logger.info(f"   Architecture: {platform.machine()}")
+    logger.info(f"   Processor: {platform.processor()}")
+    logger.info(f"   Memory Available: {os.cpu_count()} CPU cores")
+    logger.info("=" * 60)
+
+def measure_performance(func, *args, **kwargs):
+    """Measure function performance with detailed metrics."""
+    start_time = time.time()
+    start_memory = sys.getsizeof(func)  # Basic memory estimation
+    
+    result = func(*args, **kwargs)
+    
+    end_time = time.time()
+    execution_time = end_time - start_time
+    
+    return result, {
+        'execution_time': execution_time,
+        'start_time': start_time,
+        'end_time': end_time,
+        'memory_estimate': start_memory
+    }
+
+def parse_args(argv=None):
+    """Parse command-line options for batch runs."""
+    parser = argparse.ArgumentParser(description=f"{PROJECT_NAME} - PDF outline extraction")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the batch (default: 1)")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Per-document wall-clock budget in seconds; slower documents get a partial outline")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run extraction in supervised worker processes even with one worker")
+    parser.add_argument("--worker-memory-mb", type=int, default=None,
+                        help="Address-space limit per worker process in MB")
+    parser.add_argument("--recycle-after", type=int, default=None,
+                        help="Replace a worker after it has processed this many documents")
+    parser.add_argument("--recycle-growth-mb", type=float, default=None,
+                        help="Replace a worker once its peak RSS has grown by this many MB")
+    parser.add_argument("--document-timeout", type=float, default=300.0,
+                        help="Kill a worker that spends longer than this on one document (0 = no limit)")
+    # Literal choices below mirror the feature modules' constants, so parsing imports none of them
+    parser.add_argument("--schedule", choices=("fifo", "largest-first", "shortest-first"), default="fifo",
+                        help="Dispatch order: largest-first minimises makespan, shortest-first mean latency")
+    parser.add_argument("--schedule-by", choices=("size", "pages"), default="size",
+                        help="Cost estimate for scheduling: file size or probed page count")
+    parser.add_argument("--journal", type=Path, default=None,
+                        help="Append-only batch journal; a restarted run skips documents already recorded")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="With --journal, reprocess documents that previously failed")
+    parser.add_argument("--shard-index", type=int, default=0,
+                        help="This container's shard (0-based) when splitting one input directory")
+    parser.add_argument("--shard-count", type=int, default=1,
+                        help="Total number of shards/containers sharing the input directory")
+    parser.add_argument("--shard-balance", choices=("hash", "bytes"), default="hash",
+                        help="hash: pure path hashing, stable as files are added; "
+                             "bytes: balance shards by file size (needs a frozen listing)")
+    parser.add_argument("--pipeline", choices=("batch", "async"), default="batch",
+                        help="async overlaps reading, parsing and writing through bounded queues")
+    parser.add_argument("--queue-depth", type=int, default=4,
+                        help="With --pipeline async, documents buffered between stages")
+    parser.add_argument("--read-ahead", type=int, default=0,
+                        help="Prefetch this many upcoming files while the current one is parsed")
+    parser.add_argument("--read-ahead-mb", type=float, default=256,
+                        help="Memory cap for prefetched file data in MB")
+    parser.add_argument("--read-ahead-mode", choices=("read", "fadvise"), default="read",
+                        help="read: load files into memory; fadvise: ask the kernel to cache them")
+    parser.add_argument("--recursive", action="store_true",
+                        help="Also discover PDFs in subdirectories of the input directory")
+    parser.add_argument("--manifest", type=Path, action="append", default=[],
+                        help="Newline-delimited list of PDF paths to process instead of scanning (repeatable)")
+    parser.add_argument("--archives", action="store_true",
+                        help="Also process PDFs inside .zip/.tar(.gz) files in the input directory")
+    parser.add_argument("--compact-json", action="store_true",
+                        help="Write outlines without indentation")
+    parser.add_argument("--json-backend", choices=("auto", "orjson", "json"), default="auto",
+                        help="JSON encoder: orjson when installed (auto), or the standard library")
+    parser.add_argument("--gzip-output", action="store_true",
+                        help="Write gzip-compressed .json.gz outlines")
+    parser.add_argument("--output-layout", choices=("flat", "sharded"), default="flat",
+                        help="sharded: hashed ab/cd/ subdirectories plus an index.ndjson input->output map")
+    parser.add_argument("--sink", choices=("files", "sqlite"), default="files",
+                        help="sqlite: store documents and headings in one WAL-mode database instead of JSON files")
+    parser.add_argument("--sqlite-db", type=Path, default=None,
+                        help="With --sink sqlite, database path (default: <output>/results/outlines.sqlite)")
+    parser.add_argument("--heading-index", nargs="?", type=Path, const=True, default=None,
+                        help="Maintain a full-text index of titles and headings (default: <output>/results/headings.fts.sqlite)")
+    parser.add_argument("--feature-cache", type=Path, default=None, metavar="DIR",
+                        help="Persist per-document span features in DIR and reuse them while the PDF is unchanged")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Parse byte-identical inputs once and write the outline under every copy's name")
+    parser.add_argument("--hierarchy-templates", action="store_true",
+                        help="Reuse the heading hierarchy of documents sharing a font signature on their first pages")
+    parser.add_argument("--template-pages", type=int, default=3,
+                        help="With --hierarchy-templates, pages whose fonts make up the signature")
+    parser.add_argument("--stable-hierarchy", action="store_true",
+                        help="Freeze the heading hierarchy once further pages stop changing it and classify the rest in one pass")
+    parser.add_argument("--stable-pages", type=int, default=10,
+                        help="With --stable-hierarchy, consecutive pages the hierarchy must stay unchanged")
+    parser.add_argument("--stable-min-pages", type=int, default=20,
+                        help="With --stable-hierarchy, pages read before the hierarchy may be declared stable "
+                             "(only the first 50 pages are analysed, so at most 50 minus this are streamed)")
+    parser.add_argument("--pipe", action="store_true",
+                        help="Read PDFs from stdin and write one compact JSON line per document to stdout")
+    parser.add_argument("--pipe-input", choices=("paths", "bytes"), default="paths",
+                        help="With --pipe: one path per line, or PDFs as 8-byte big-endian length + bytes")
+    parser.add_argument("--pipe-order", choices=("input", "completion"), default="input",
+                        help="With --pipe: emit results in input order or as soon as each completes")
+    parser.add_argument("--max-document-mb", type=float, default=512.0,
+                        help="With --pipe-input bytes, reject documents declaring a larger length")
+    parser.add_argument("--spool", type=Path, default=None,
+                        help="Pull work from a shared spool directory (new/ -> processing/ -> done/|failed/)")
+    parser.add_argument("--lease-seconds", type=float, default=300.0,
+                        help="With --spool, reclaim jobs whose consumer has been silent this long")
+    parser.add_argument("--max-leases", type=int, default=3,
+                        help="With --spool, move a job to failed/ after this many leases expired on it")
+    parser.add_argument("--exit-when-empty", action="store_true",
+                        help="With --spool, exit once new/ is empty instead of polling")
+    args = parser.parse_args(argv)
+    if args.shard_count < 1 or not 0 <= args.shard_index < args.shard_count:
+        parser.error(f"--shard-index must be in [0, {args.shard_count - 1}]")
+    if args.spool:
+        # A consumer takes one job at a time from the spool; batch discovery and dispatch don't apply
+        batch_only = {"--workers": args.workers != 1, "--isolate": args.isolate,
+                      "--schedule": args.schedule != "fifo", "--shard-count": args.shard_count != 1,
+                      "--pipeline": args.pipeline != "batch", "--read-ahead": args.read_ahead != 0,
+                      "--recursive": args.recursive, "--manifest": bool(args.manifest),
+                      "--archives": args.archives, "--dedup": args.dedup}
+        rejected = [flag for flag, given in batch_only.items() if given]
+        if rejected:
+            parser.error(f"--spool cannot be combined with {', '.join(rejected)}")
+    return args
+
+def extractor_options(args) -> dict:
+    """PDFOutlineExtractor keyword arguments for the parsed command-line options."""
+    return dict(
+        workers=args.workers,
+        time_budget=args.time_budget,
+        isolate=args.isolate,
+        worker_memory_mb=args.worker_memory_mb,
+        recycle_after=args.recycle_after,
+        recycle_growth_mb=args.recycle_growth_mb,
+        schedule=args.schedule,
+        schedule_by=args.schedule_by,
+        journal=args.journal,
+        retry_failed=args.retry_failed,
+        shard_index=args.shard_index,
+        shard_count=args.shard_count,
+        shard_balance=args.shard_balance,
+        pipeline=args.pipeline,
+        queue_depth=args.queue_depth,
+        read_ahead=args.read_ahead,
+        read_ahead_mb=args.read_ahead_mb,
+        read_ahead_mode=args.read_ahead_mode,
+        archives=args.archives,
+        recursive=args.recursive,
+        manifests=args.manifest,
+        compact_json=args.compact_json,
+        json_backend=args.json_backend,
+        compress_output=args.gzip_output,
+        output_layout=args.output_layout,
+        sink=args.sink,
+        sqlite_path=args.sqlite_db,
+        heading_index=args.heading_index,
+        feature_cache=args.feature_cache,
+        dedup=args.dedup,
+        hierarchy_templates=args.hierarchy_templates,
+        template_pages=args.template_pages,
+        stable_hierarchy=args.stable_hierarchy,
+        stable_pages=args.stable_pages,
+        stable_min_pages=args.stable_min_pages,
+        document_timeout=args.document_timeout or None
+    )
+
+def run_spool_consumer(args, output_dir: Path, logger):
+    """Act as one of many competing consumers of a shared spool directory."""
+    from spool_queue import SpoolQueue, consume
+    
+    queue = SpoolQueue(args.spool, lease_seconds=args.lease_seconds, max_leases=args.max_leases)
+    extractor = PDFOutlineExtractor(
+        input_dir=queue.dir("processing"),
+        output_dir=output_dir / "results",
+        **extractor_options(args)
+    )
+    logger.info(f"📬 Spool: {args.spool} (consumer {queue.consumer_id}, lease {args.lease_seconds:.0f}s)")
+    
+    finished, metrics = measure_performance(consume, extractor, queue, exit_when_empty=args.exit_when_empty)
+    logger.info(f"📄 Spool jobs finished: {finished} in {metrics['execution_time']:.3f}s")
+
+def run_pipe_mode(args):
+    """NDJSON filter: stdout carries only results, so banner and logs go to stderr."""
+    import os
+    import signal
+    from pipe_mode import run_pipe
+    
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr,
+                        format='%(asctime)s | %(levelname)-8s | %(name)-15s | %(message)s', force=True)
+    extractor = PDFOutlineExtractor(input_dir=Path.cwd(), output_dir=Path.cwd(),
+                                    workers=args.workers, time_budget=args.time_budget)
+    signal.signal(signal.SIGTERM, extractor.request_stop)
+    
+    try:
+        run_pipe(extractor, sys.stdin.buffer, sys.stdout.buffer,
+                 input_format=args.pipe_input, order=args.pipe_order,
+                 max_document_bytes=int(args.max_document_mb * 1024 * 1024))
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); silence the flush at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except (EOFError, ValueError) as e:
+        logging.getLogger(__name__).error(f"❌ Malformed input on stdin: {str(e)}")
+        sys.exit(1)
+
+def main():
     """
     🚀 Main entry point for Adobe Hackathon 2025 Round 1A submission.
     
@@ -10,6 +322,12 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
     outlines in /app/output with enterprise-grade reliability.
     """
     
+    args = parse_args()
+    
+    if args.pipe:
+        run_pipe_mode(args)
+        return
+    
     # Display professional hackathon banner
     print_hackathon_banner()
     
@@ -34,9 +352,13 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
     # Log system information
     log_system_info(logger)
     
+    if args.spool:
+        run_spool_consumer(args, output_dir, logger)
+        return
+    
     try:
         # Validate input directory
-        if not input_dir.exists():
+        if not args.manifest and not input_dir.exists():
             logger.error(f"❌ Input directory {input_dir} not found!")
             logger.error("💡 Please ensure PDF files are available for processing")
             logger.error("🔧 For Docker: mount volume to /app/input")
@@ -44,12 +366,21 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
             sys.exit(1)
         
         # Count available PDFs
-        pdf_files = list(input_dir.glob("*.pdf")) + list(input_dir.glob("*.PDF"))
-        logger.info(f"📁 Input Directory: {input_dir}")
+        # Only check that there is input; listing everything up front would delay the first document
+        from discovery import discover
+        has_input = next(discover(input_dir, args.manifest, args.recursive), None) is not None
+        if args.manifest:
+            logger.info(f"📜 Manifests: {', '.join(str(manifest) for manifest in args.manifest)}")
+        else:
+            logger.info(f"📁 Input Directory: {input_dir}{' (recursive)' if args.recursive else ''}")
         logger.info(f"📂 Output Directory: {output_dir}")
-        logger.info(f"📄 PDF Files Found: {len(pdf_files)}")
+        if args.archives and input_dir.exists():
+            from archive_input import is_archive
+            archives = [path for path in input_dir.iterdir() if path.is_file() and is_archive(path)]
+            logger.info(f"🗜️  Archives Found: {len(archives)}")
+            has_input = has_input or bool(archives)
         
-        if not pdf_files:
+        if not has_input:
             logger.warning("⚠️  No PDF files found in input directory")
             logger.info("✅ System validation completed - ready for PDF processing")
             return
@@ -63,12 +394,20 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
         extractor_result, init_metrics = measure_performance(
             PDFOutlineExtractor, 
             input_dir=input_dir, 
-            output_dir=output_dir / "results"
+            output_dir=output_dir / "results",
+            **extractor_options(args)
         )
         extractor = extractor_result
         
         logger.info(f"⚡ Engine Initialization: {init_metrics['execution_time']:.3f}s")
         logger.info(f"📊 Max Pages per PDF: {extractor.max_pages}")
+        logger.info(f"👷 Workers: {extractor.workers}")
+        if args.feature_cache:
+            logger.info(f"🧊 Feature Cache: {args.feature_cache}")
+        if extractor.shard_count > 1:
+            logger.info(f"🧩 Shard: {extractor.shard_index} of {extractor.shard_count} ({extractor.shard_balance})")
+        if extractor.time_budget:
+            logger.info(f"⏳ Time Budget per PDF: {extractor.time_budget:.1f}s")
         logger.info(f"🎯 Target Performance: <10s per 50-page PDF")
         
         # Execute PDF processing with performance tracking
@@ -84,21 +423,28 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
         
         # Generate performance report
         results_dir = output_dir / "results"
-        json_files = list(results_dir.glob("*.json"))
+        json_files = list(results_dir.rglob("*.json")) + list(results_dir.rglob("*.json.gz"))
         
         # Calculate performance metrics
+        from output_writer import read_output
         total_pages = 0
         total_headings = 0
         
         for json_file in json_files:
             try:
-                import json
-                with open(json_file) as f:
-                    data = json.load(f)
+                data = read_output(json_file)
                 total_pages += data.get("total_pages", 0)
                 total_headings += len(data.get("outline", []))
             except Exception:
                 pass
+        pdfs_processed = len(json_files)
+        
+        if extractor.sink == "sqlite":
+            import sqlite3
+            with sqlite3.connect(extractor.sqlite_path) as db:
+                pdfs_processed, total_pages = db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(total_pages), 0) FROM documents").fetchone()
+                total_headings, = db.execute("SELECT COUNT(*) FROM headings").fetchone()
         
         # Performance analysis
         pages_per_second = total_pages / total_processing_time if total_processing_time > 0 else 0
@@ -109,7 +455,7 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
         logger.info("🎉 SMARTPDF OUTLINER - EXECUTION COMPLETED SUCCESSFULLY!")
         logger.info("=" * 60)
         logger.info("📊 PERFORMANCE METRICS:")
-        logger.info(f"   📄 PDFs Processed: {len(json_files)}")
+        logger.info(f"   📄 PDFs Processed: {pdfs_processed}")
         logger.info(f"   📖 Total Pages: {total_pages}")
         logger.info(f"   📋 Headings Extracted: {total_headings}")
         logger.info(f"   ⏱️  Processing Time: {total_processing_time:.3f}s")
@@ -140,7 +486,7 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
             "project": PROJECT_NAME,
             "execution_timestamp": datetime.now().isoformat(),
             "performance": {
-                "pdfs_processed": len(json_files),
+                "pdfs_processed": pdfs_processed,
                 "total_pages": total_pages,
                 "total_headings": total_headings,
                 "processing_time_seconds": total_processing_time,
@@ -170,195 +516,6 @@ SmartPDF Outliner: AI-Powered Document Structure Extracdef main():
         import traceback
         logger.error(f"🔍 Detailed traceback:\n{traceback.format_exc()}")
         sys.exit(1)
-Team: InnovateAI Solutions
-Challenge: PDF Outline Extraction with ML-Powered Structure Recognition
-Submission Date: July 28, 2025
-
-Revolutionary PDF analysis tool that combines advanced font analysis with
-pattern recognition to achieve human-level accuracy in document structure
-understanding. Extracts Title, H1, H2, H3 headings with precise page numbers.
-
-Performance: 35x faster than requirements (0.28s vs 10s for 50 pages)
-Efficiency: 100x more memory efficient (2MB vs 200MB limit)
-Accuracy: 95%+ heading detection with <5% false positives
-
-Requirements Met:
-✅ No internet access (offline processing)
-✅ CPU-only (no GPU dependencies) 
-✅ Model size < 200MB (actual: ~45MB)
-✅ Processes up to 50 pages per PDF
-✅ Completes in <10s for 50-page PDF (actual: ~0.28s)
-✅ Docker containerized for linux/amd64
-✅ Robust edge case handling
-✅ Enterprise-grade error recovery
-"""
-
-import sys
-import logging
-import time
-from pathlib import Path
-from datetime import datetime
-
-# Import the main extractor
-from pdf_outline_extractor import PDFOutlineExtractor
-
-# Hackathon branding
-TEAM_NAME = "InnovateAI Solutions"
-PROJECT_NAME = "SmartPDF Outliner"
-CHALLENGE = "Adobe Hackathon 2025 - Round 1A"
-
-def print_hackathon_banner():
-    """Display professional hackathon banner."""
-    banner = f"""
-╔═══════════════════════════════════════════════════════════════╗
-║                                                               ║
-║  🏆 {CHALLENGE:<52} ║
-║  📄 {PROJECT_NAME:<52} ║  
-║  🚀 Team: {TEAM_NAME:<46} ║
-║                                                               ║
-║  🎯 Challenge: PDF Structure Extraction with AI              ║
-║  ⚡ Performance: 35x faster than requirements                ║
-║  🧠 Innovation: ML-powered font & pattern analysis           ║
-║                                                               ║
-╚═══════════════════════════════════════════════════════════════╝
-"""
-    print(banner)
-
-def setup_professional_logging(output_dir: Path):
-    """Setup professional logging for hackathon submission."""
-    
-    # Create logs directory
-    logs_dir = output_dir / "logs"
-    logs_dir.mkdir(exist_ok=True)
-    
-    # Setup multiple log handlers
-    log_handlers = [
-        logging.StreamHandler(sys.stdout)
-    ]
-    
-    # Add file handlers if possible
-    try:
-        # Main processing log
-        main_log = logs_dir / f"smartpdf_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        log_handlers.append(logging.FileHandler(main_log, mode='w'))
-        
-        # Performance metrics log
-        perf_log = logs_dir / "performance_metrics.log"
-        perf_handler = logging.FileHandler(perf_log, mode='w')
-        perf_handler.setLevel(logging.INFO)
-        log_handlers.append(perf_handler)
-        
-    except (PermissionError, OSError):
-        pass  # Skip file logging if not possible
-    
-    # Configure logging with professional format
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s | %(levelname)-8s | %(name)-15s | %(message)s',
-        handlers=log_handlers,
-        force=True
-    )
-    
-    return logging.getLogger(__name__)
-
-def log_system_info(logger):
-    """Log system and environment information."""
-    import platform
-    import os
-    
-    logger.info("=" * 60)
-    logger.info("🖥️  SYSTEM INFORMATION")
-    logger.info(f"   Platform: {platform.platform()}")
-    logger.info(f"   Python: {platform.python_version()}")
-    logger.info(f"   Architecture: {platform.machine()}")
-    logger.info(f"   Processor: {platform.processor()}")
-    logger.info(f"   Memory Available: {os.cpu_count()} CPU cores")
-    logger.info("=" * 60)
-
-def measure_performance(func, *args, **kwargs):
-    """Measure function performance with detailed metrics."""
-    start_time = time.time()
-    start_memory = sys.getsizeof(func)  # Basic memory estimation
-    
-    result = func(*args, **kwargs)
-    
-    end_time = time.time()
-    execution_time = end_time - start_time
-    
-    return result, {
-        'execution_time': execution_time,
-        'start_time': start_time,
-        'end_time': end_time,
-        'memory_estimate': start_memory
-    }
-    """
-    Main entry point for Adobe Hackathon 2025 Round 1A submission.
-    
-    Processes all PDF files in /app/input and generates JSON outlines in /app/output.
-    """
-    # Determine if running in Docker or local environment
-    input_dir = Path("/app/input") if Path("/app/input").exists() else Path("test_input")
-    output_dir = Path("/app/output") if Path("/app/output").exists() else Path("main_test_output")
-    
-    # Create output directory if it doesn't exist
-    output_dir.mkdir(exist_ok=True)
-    
-    # Setup logging for hackathon submission
-    log_handlers = [logging.StreamHandler(sys.stdout)]
-    
-    # Add file handler if output directory is writable
-    try:
-        log_file = output_dir / "processing.log"
-        log_handlers.append(logging.FileHandler(log_file, mode='w'))
-    except (PermissionError, OSError):
-        pass  # Skip file logging if not possible
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=log_handlers
-    )
-    
-    logger = logging.getLogger(__name__)
-    
-    # Header for hackathon submission
-    logger.info("=" * 60)
-    logger.info("🏆 ADOBE HACKATHON 2025 - ROUND 1A")
-    logger.info("📄 PDF Outline Extractor - Team Submission")
-    logger.info("🎯 Challenge: Extract Title, H1, H2, H3 from PDFs")
-    logger.info("=" * 60)
-    
-    try:
-        if not input_dir.exists():
-            logger.error(f"❌ Input directory {input_dir} not found!")
-            logger.error("💡 Please ensure PDF files are available")
-            sys.exit(1)
-        
-        # Initialize and run the PDF outline extractor
-        logger.info("🚀 Initializing PDF Outline Extractor...")
-        extractor = PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir)
-        
-        # Log system configuration
-        logger.info(f"📂 Input Directory: {extractor.input_dir}")
-        logger.info(f"📂 Output Directory: {extractor.output_dir}")
-        logger.info(f"📄 Max Pages per PDF: {extractor.max_pages}")
-        
-        # Process all PDFs
-        extractor.run()
-        
-        # Success summary
-        logger.info("=" * 60)
-        logger.info("✅ PDF OUTLINE EXTRACTION COMPLETED SUCCESSFULLY!")
-        logger.info(f"📊 Check {output_dir} for JSON results")
-        logger.info("🎉 Adobe Hackathon 2025 Round 1A - SUBMISSION COMPLETE")
-        logger.info("=" * 60)
-        
-    except Exception as e:
-        logger.error("=" * 60)
-        logger.error(f"❌ EXTRACTION FAILED: {str(e)}")
-        logger.error("🔧 Please check input files and try again")
-        logger.error("=" * 60)
-        sys.exit(1)
 
 if __name__ == "__main__":
     main()
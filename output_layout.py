@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Output layouts for PDF Outline Extractor
+"flat" writes output_dir/<stem>.json. "sharded" spreads outputs over
+ab/cd/ subdirectories keyed by a hash of the input's relative path, so no
+directory grows past a few thousand entries and inputs with the same stem
+in different folders never overwrite each other. An append-only index maps
+every input to its output.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+OUTPUT_LAYOUTS = ("flat", "sharded")
+INDEX_NAME = "index.ndjson"
+
+
+def sharded_output_name(input_key: str, stem: str) -> str:
+    """ab/cd/<stem>.<hash>.json, where the hash covers the whole relative input path."""
+    digest = hashlib.sha1(input_key.encode("utf-8")).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}/{stem}.{digest[:16]}.json"
+
+
+class OutputIndex:
+    """Append-only input -> output map (JSON lines) in the output directory.
+
+    Each entry is one O_APPEND write, so concurrent writers - threads or
+    processes sharing the directory - never interleave partial lines.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fd = None
+
+    def record(self, input_key: str, output_name: str):
+        line = json.dumps({"input": input_key, "output": output_name}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, line.encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def load_index(path: Path) -> Dict[str, str]:
+    """Latest output for each input; truncated trailing lines are ignored."""
+    index = {}
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            index[entry["input"]] = entry["output"]
+    return index
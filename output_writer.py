@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Output writer for PDF Outline Extractor
+Serialises outlines (optionally compact, through orjson when installed,
+optionally gzip-compressed) and writes them atomically, leaving files whose
+content would not change untouched so file watchers don't re-ingest them.
+"""
+
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib encoder is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+class OutputWriter:
+    """Turns result dicts into files."""
+
+    def __init__(self, compact: bool = False, backend: str = "auto", compress: bool = False,
+                 fsync: bool = False, skip_unchanged: bool = True):
+        if backend == "orjson" and orjson is None:
+            raise ValueError("JSON backend 'orjson' requested but orjson is not installed")
+        self.compact = compact
+        self.backend = "orjson" if backend in ("auto", "orjson") and orjson is not None else "json"
+        self.compress = compress
+        self.fsync = fsync
+        self.skip_unchanged = skip_unchanged
+        self.written = 0
+        self.unchanged = 0
+
+    @property
+    def suffix(self) -> str:
+        return ".json.gz" if self.compress else ".json"
+
+    def serialize(self, result: Dict) -> bytes:
+        if self.backend == "orjson":
+            return orjson.dumps(result, option=0 if self.compact else orjson.OPT_INDENT_2)
+        if self.compact:
+            return json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return json.dumps(result, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def encode(self, result: Dict) -> bytes:
+        """File contents for result; gzip output carries no timestamp, so equal outlines give equal bytes."""
+        data = self.serialize(result)
+        return gzip.compress(data, mtime=0) if self.compress else data
+
+    def _is_unchanged(self, output_path: Path, data: bytes) -> bool:
+        try:
+            if output_path.stat().st_size != len(data):
+                return False
+            return output_path.read_bytes() == data
+        except OSError:
+            return False
+
+    def write(self, output_path: Path, result: Dict) -> Tuple[Path, bool]:
+        """Atomically write result to output_path; returns (path, whether the file was rewritten).
+
+        The data goes to a temporary file that is renamed over the final path,
+        so a crash never leaves a truncated outline behind.
+        """
+        data = self.encode(result)
+        if self.skip_unchanged and self._is_unchanged(output_path, data):
+            self.unchanged += 1
+            return output_path, False
+
+        temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_path, output_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        self.written += 1
+        return output_path, True
+
+
+def read_output(output_path: Path) -> Dict:
+    """Load an outline written by OutputWriter, compressed or not."""
+    opener = gzip.open if output_path.name.endswith(".gz") else open
+    with opener(output_path, 'rb') as f:
+        return json.loads(f.read())
@@ -8,12 +8,16 @@ Outputs results in JSON format.
 """
 
 import os
-import json
+import time
+import signal
 import logging
-from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+import itertools
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import fitz  # PyMuPDF
 from collections import defaultdict, Counter
+from output_writer import OutputWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,10 +26,111 @@ logger = logging.getLogger(__name__)
 class PDFOutlineExtractor:
     """Extract structured outline from PDF files."""
     
-    def __init__(self, input_dir=None, output_dir=None):
+    def __init__(self, input_dir=None, output_dir=None, workers=1, time_budget=None,
+                 isolate=False, worker_memory_mb=None, recycle_after=None, recycle_growth_mb=None,
+                 schedule="fifo", schedule_by="size", journal=None, retry_failed=False,
+                 shard_index=0, shard_count=1, shard_balance="hash", pipeline="batch", queue_depth=4,
+                 read_ahead=0, read_ahead_mb=256, read_ahead_mode="read", archives=False,
+                 recursive=False, manifests=None, compact_json=False, json_backend="auto",
+                 compress_output=False, output_layout="flat", sink="files", sqlite_path=None,
+                 heading_index=None, feature_cache=None, dedup=False, hierarchy_templates=False,
+                 template_pages=3, stable_hierarchy=False, stable_pages=10, stable_min_pages=20,
+                 document_timeout=None):
         self.input_dir = Path(input_dir) if input_dir else Path("/app/input")
         self.output_dir = Path(output_dir) if output_dir else Path("/app/output")
         self.max_pages = 50
+        self.workers = max(1, int(workers))
+        # Per-document wall-clock budget in seconds (None = unlimited)
+        self.time_budget = time_budget
+        
+        # Supervised worker settings: address-space limit per worker and recycling thresholds
+        self.worker_memory_mb = worker_memory_mb
+        self.recycle_after = recycle_after
+        self.recycle_growth_mb = recycle_growth_mb
+        # Hard wall-clock limit per document in worker processes; a worker past it is killed
+        self.document_timeout = document_timeout
+        self.isolate = bool(isolate or worker_memory_mb or recycle_after or recycle_growth_mb)
+        self.failures = []
+        
+        # Dispatch order for batch runs (see batch_scheduler.SCHEDULING_POLICIES)
+        self.schedule = schedule
+        self.schedule_by = schedule_by
+        
+        # Append-only journal of finished documents; lets a pre-empted batch resume
+        self.journal_path = Path(journal) if journal else None
+        self.retry_failed = retry_failed
+        self.stop_requested = False
+        
+        # This container's share of a batch split across several (see sharding.py)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.shard_balance = shard_balance
+        
+        # "async" overlaps reads, parsing and writes through bounded queues (see async_pipeline.py)
+        self.pipeline = pipeline
+        self.queue_depth = max(1, int(queue_depth))
+        
+        # Files to prefetch ahead of the one being parsed, within a memory cap (see prefetcher.py)
+        self.read_ahead = read_ahead
+        self.read_ahead_mb = read_ahead_mb
+        self.read_ahead_mode = read_ahead_mode
+        self.prefetch_stats = None
+        
+        # Also process the PDFs inside .zip/.tar(.gz) files in the input directory
+        self.archives = archives
+        
+        # Input discovery: scan subdirectories too, or read paths from manifest files instead
+        self.recursive = recursive
+        self.manifests = [Path(manifest) for manifest in manifests or []]
+        self.resumed = 0
+        
+        # Serialisation of results; the journal promises outputs exist, so they are fsynced with one
+        self.writer = OutputWriter(compact=compact_json, backend=json_backend, compress=compress_output,
+                                   fsync=self.journal_path is not None)
+        
+        # "sharded" spreads outputs over hashed ab/cd/ directories listed in index.ndjson
+        self.output_layout = output_layout
+        self.output_index = None
+        if output_layout == "sharded":
+            from output_layout import INDEX_NAME, OutputIndex
+            self.output_index = OutputIndex(self.output_dir / INDEX_NAME)
+        
+        # "sqlite" stores documents and headings in one database instead of per-document files
+        self.sink = sink
+        self.sqlite_path = Path(sqlite_path) if sqlite_path else self.output_dir / "outlines.sqlite"
+        # Timings are stored by the SQLite sink; de-duplication uses them to estimate the time it saved
+        self.record_timings = sink == "sqlite" or dedup
+        self.sqlite_sink = None
+        
+        # Full-text index of titles and headings (True = <output_dir>/headings.fts.sqlite)
+        self.heading_index_path = None
+        if heading_index:
+            from heading_index import INDEX_NAME as HEADING_INDEX_NAME
+            self.heading_index_path = self.output_dir / HEADING_INDEX_NAME if heading_index is True else Path(heading_index)
+        self.heading_index = None
+        
+        # Persisted span features per document, so heuristics re-run without parsing (see feature_cache.py)
+        self.feature_cache = None
+        if feature_cache:
+            from feature_cache import FeatureCache
+            self.feature_cache = FeatureCache(feature_cache, self.max_pages)
+        
+        # Parse byte-identical inputs once and write the outline under each of their names (see dedup.py)
+        self.dedup = dedup
+        self.duplicate_copies = {}
+        self.duplicates_skipped = 0
+        self.duplicate_time_saved = 0.0
+        
+        # Reuse the hierarchy of documents with the same font signature (see hierarchy_templates.py)
+        self.hierarchy_templates = None
+        if hierarchy_templates:
+            from hierarchy_templates import HierarchyTemplateCache
+            self.hierarchy_templates = HierarchyTemplateCache(signature_pages=template_pages)
+        
+        # Freeze the hierarchy once it stops changing and classify later pages as they are read
+        self.stable_hierarchy = stable_hierarchy
+        self.stable_pages = stable_pages
+        self.stable_min_pages = stable_min_pages
         
         # Only create directory if it doesn't exist and path is valid
         try:
@@ -34,37 +139,144 @@ class PDFOutlineExtractor:
             # For Docker, the directories should already exist or be mounted
             pass
     
-    def analyze_font_characteristics(self, doc: fitz.Document) -> Dict:
-        """Analyze font characteristics across the document to establish hierarchy."""
+    def analyze_font_characteristics(self, doc: fitz.Document, deadline: Optional[float] = None,
+                                     previous=None) -> Dict:
+        """Analyze font characteristics across the document to establish hierarchy.
+        
+        When a monotonic `deadline` is given it is checked between pages; the
+        first page is always analyzed so a partial outline is never empty.
+        
+        With a feature cache, every page is fingerprinted; pages whose
+        fingerprint `previous` (the cache entry of an earlier version of this
+        document) already holds take their spans from it instead of being parsed.
+        """
         font_stats = defaultdict(list)
         text_blocks = []
+        pages_processed = 0
+        fingerprints = [] if self.feature_cache is not None else None
+        pages_reused = 0
+        if fingerprints is not None:
+            from feature_cache import page_fingerprint
         
         # Collect all text blocks with their characteristics
         for page_num in range(min(len(doc), self.max_pages)):
+            if deadline is not None and page_num > 0 and time.monotonic() > deadline:
+                logger.warning(f"Time budget exhausted after {page_num} pages")
+                break
+            
             page = doc[page_num]
-            blocks = page.get_text("dict")["blocks"]
+            spans = None
+            if fingerprints is not None:
+                fingerprints.append(page_fingerprint(page))
+                if previous is not None:
+                    spans = previous.page_spans(fingerprints[-1], page_num + 1)
+            if spans is None:
+                spans = self.extract_page_spans(page, page_num)
+            else:
+                pages_reused += 1
+            
+            for font_info in spans:
+                font_stats[font_info["size"]].append(font_info)
+                text_blocks.append(font_info)
             
-            for block in blocks:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line["spans"]:
-                            text = span["text"].strip()
-                            if text and len(text) > 3:  # Filter out short text
-                                font_info = {
-                                    "text": text,
-                                    "page": page_num + 1,
-                                    "size": span["size"],
-                                    "flags": span["flags"],
-                                    "font": span["font"],
-                                    "bbox": span["bbox"],
-                                    "is_bold": bool(span["flags"] & 2**4),
-                                    "is_italic": bool(span["flags"] & 2**1),
-                                }
-                                
-                                font_stats[span["size"]].append(font_info)
-                                text_blocks.append(font_info)
-        
-        return {"font_stats": font_stats, "text_blocks": text_blocks}
+            pages_processed = page_num + 1
+        
+        analysis = {"font_stats": font_stats, "text_blocks": text_blocks, "pages_processed": pages_processed,
+                    "page_count": len(doc)}
+        if fingerprints is not None:
+            analysis["page_fingerprints"] = fingerprints
+            analysis["pages_reused"] = pages_reused
+        return analysis
+    
+    def extract_page_spans(self, page: fitz.Page, page_num: int) -> List[Dict]:
+        """Text spans of one page with the font features the heuristics use."""
+        spans = []
+        blocks = page.get_text("dict")["blocks"]
+        
+        for block in blocks:
+            if "lines" in block:
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text = span["text"].strip()
+                        if text and len(text) > 3:  # Filter out short text
+                            spans.append({
+                                "text": text,
+                                "page": page_num + 1,
+                                "size": span["size"],
+                                "flags": span["flags"],
+                                "font": span["font"],
+                                "bbox": span["bbox"],
+                                "is_bold": bool(span["flags"] & 2**4),
+                                "is_italic": bool(span["flags"] & 2**1),
+                            })
+        
+        return spans
+    
+    def analyze_with_stable_hierarchy(self, doc: fitz.Document, deadline: Optional[float] = None) -> Dict:
+        """Title, hierarchy and headings in one pass, freezing the hierarchy once it settles.
+        
+        Per-size counts are updated as each page is read and the hierarchy is
+        recomputed from them. Once it has stayed the same for stable_pages
+        pages (and at least stable_min_pages were read), the spans held so far
+        are classified and dropped, and every later page is classified as it
+        is extracted, without retaining its spans. A document that never
+        settles gets exactly the result of the two-pass analysis.
+        """
+        size_counts = {}
+        text_blocks = []
+        headings = []
+        title = None
+        title_size = None
+        hierarchy = None
+        unchanged = 0
+        stable_at = None
+        pages_processed = 0
+        
+        for page_num in range(min(len(doc), self.max_pages)):
+            if deadline is not None and page_num > 0 and time.monotonic() > deadline:
+                logger.warning(f"Time budget exhausted after {page_num} pages")
+                break
+            
+            spans = self.extract_page_spans(doc[page_num], page_num)
+            pages_processed = page_num + 1
+            if page_num == 0:
+                title = self.identify_title({"text_blocks": spans})
+                title_size = max((span["size"] for span in spans), default=None)
+            
+            if stable_at is not None:
+                for span in spans:
+                    heading = self.classify_block(span, hierarchy, title_size)
+                    if heading is not None:
+                        headings.append(heading)
+                continue
+            
+            text_blocks.extend(spans)
+            for span in spans:
+                counts = size_counts.setdefault(span["size"], [0, 0, 0])
+                counts[0] += 1
+                counts[1] += span["is_bold"]
+                counts[2] += self.is_likely_heading(span["text"])
+            if not size_counts:
+                continue
+            
+            current = self.hierarchy_from_counts(size_counts)
+            unchanged = unchanged + 1 if current == hierarchy else 0
+            hierarchy = current
+            if hierarchy and unchanged >= self.stable_pages and pages_processed >= self.stable_min_pages:
+                stable_at = pages_processed
+                headings = [heading for heading in (self.classify_block(block, hierarchy, title_size)
+                                                    for block in text_blocks) if heading is not None]
+                text_blocks = []
+                logger.info(f"Hierarchy stable after {stable_at} pages; classifying the rest in one pass")
+        
+        if stable_at is None:
+            # Raises on a document without text, like establish_heading_hierarchy
+            hierarchy = self.hierarchy_from_counts(size_counts)
+            headings = [heading for heading in (self.classify_block(block, hierarchy, title_size)
+                                                for block in text_blocks) if heading is not None]
+        
+        return {"title": title, "hierarchy": hierarchy, "headings": self.unique_headings(headings),
+                "pages_processed": pages_processed, "page_count": len(doc), "stable_at": stable_at}
     
     def identify_title(self, analysis: Dict) -> Optional[str]:
         """Identify document title (usually largest font on first page)."""
@@ -93,27 +305,33 @@ class PDFOutlineExtractor:
         """Establish heading hierarchy based on font sizes and characteristics."""
         font_stats = analysis["font_stats"]
         
-        # Get font sizes sorted by frequency and size
-        size_frequency = {size: len(blocks) for size, blocks in font_stats.items()}
-        total_blocks = sum(size_frequency.values())
-        
-        # Analyze all font sizes
-        size_characteristics = {}
+        # Count spans, bold spans and heading-like spans per font size
+        size_counts = {}
         for size, blocks in font_stats.items():
             if len(blocks) > 0:
                 bold_count = sum(1 for block in blocks if block["is_bold"])
                 heading_like = sum(1 for block in blocks if self.is_likely_heading(block["text"]))
-                
-                frequency_ratio = len(blocks) / total_blocks
-                
-                size_characteristics[size] = {
-                    "total": len(blocks),
-                    "bold_ratio": bold_count / len(blocks),
-                    "heading_ratio": heading_like / len(blocks),
-                    "frequency_ratio": frequency_ratio,
-                    "all_bold": bold_count == len(blocks),
-                    "has_headings": heading_like > 0,
-                }
+                size_counts[size] = [len(blocks), bold_count, heading_like]
+        
+        return self.hierarchy_from_counts(size_counts)
+    
+    def hierarchy_from_counts(self, size_counts: Dict[float, List[int]]) -> Dict[str, float]:
+        """Heading hierarchy from per-size [spans, bold spans, heading-like spans] counts."""
+        total_blocks = sum(total for total, _, _ in size_counts.values())
+        
+        # Analyze all font sizes
+        size_characteristics = {}
+        for size, (total, bold_count, heading_like) in size_counts.items():
+            frequency_ratio = total / total_blocks
+            
+            size_characteristics[size] = {
+                "total": total,
+                "bold_ratio": bold_count / total,
+                "heading_ratio": heading_like / total,
+                "frequency_ratio": frequency_ratio,
+                "all_bold": bold_count == total,
+                "has_headings": heading_like > 0,
+            }
         
         # Find title size (largest font, usually not bold)
         title_size = max(size_characteristics.keys())
@@ -164,6 +382,12 @@ class PDFOutlineExtractor:
         
         return hierarchy
     
+    def heading_hierarchy(self, analysis: Dict) -> Dict[str, float]:
+        """establish_heading_hierarchy, served from a hierarchy template when templates are enabled."""
+        if self.hierarchy_templates is None:
+            return self.establish_heading_hierarchy(analysis)
+        return self.hierarchy_templates.hierarchy(analysis, self.establish_heading_hierarchy)
+    
     def is_likely_heading(self, text: str) -> bool:
         """Check if text is likely a heading based on content patterns."""
         text = text.strip()
@@ -211,48 +435,59 @@ class PDFOutlineExtractor:
             title_size = max(block["size"] for block in first_page_blocks)
         
         for block in text_blocks:
-            text = block["text"].strip()
-            size = block["size"]
-            
-            # Skip if it's likely the title (largest font on first page)
-            if title_size and abs(size - title_size) < 0.1 and block["page"] == 1:
-                continue
-            
-            # Check if this block matches any heading level
-            for level, level_size in hierarchy.items():
-                if abs(size - level_size) < 0.1:  # Allow small size variations
-                    # More specific checks for each level
-                    is_heading = False
-                    
-                    if level == "h1":
-                        # H1: Must be bold OR large font with heading pattern
-                        is_heading = (block["is_bold"] or size >= 16) and self.is_likely_heading(text)
-                    elif level == "h2":
-                        # H2: Should be bold and heading-like
-                        is_heading = block["is_bold"] and self.is_likely_heading(text)
-                    elif level == "h3":
-                        # H3: Should be bold and heading-like
-                        is_heading = block["is_bold"] and self.is_likely_heading(text)
+            heading = self.classify_block(block, hierarchy, title_size)
+            if heading is not None:
+                headings.append(heading)
+        
+        return self.unique_headings(headings)
+    
+    def classify_block(self, block: Dict, hierarchy: Dict[str, float], title_size: Optional[float]) -> Optional[Dict]:
+        """The heading a span makes under `hierarchy`, or None if it is not one."""
+        text = block["text"].strip()
+        size = block["size"]
+        
+        # Skip if it's likely the title (largest font on first page)
+        if title_size and abs(size - title_size) < 0.1 and block["page"] == 1:
+            return None
+        
+        # Check if this block matches any heading level
+        for level, level_size in hierarchy.items():
+            if abs(size - level_size) < 0.1:  # Allow small size variations
+                # More specific checks for each level
+                is_heading = False
+                
+                if level == "h1":
+                    # H1: Must be bold OR large font with heading pattern
+                    is_heading = (block["is_bold"] or size >= 16) and self.is_likely_heading(text)
+                elif level == "h2":
+                    # H2: Should be bold and heading-like
+                    is_heading = block["is_bold"] and self.is_likely_heading(text)
+                elif level == "h3":
+                    # H3: Should be bold and heading-like
+                    is_heading = block["is_bold"] and self.is_likely_heading(text)
+                
+                # Additional filters
+                if is_heading:
+                    # Skip table of contents entries and figure captions
+                    text_lower = text.lower()
+                    if any(skip in text_lower for skip in [
+                        "table of contents", "figure", "table 1:", "page ", 
+                        "see section", "refer to", "....................", "......."
+                    ]):
+                        continue
                     
-                    # Additional filters
-                    if is_heading:
-                        # Skip table of contents entries and figure captions
-                        text_lower = text.lower()
-                        if any(skip in text_lower for skip in [
-                            "table of contents", "figure", "table 1:", "page ", 
-                            "see section", "refer to", "....................", "......."
-                        ]):
-                            continue
-                        
-                        headings.append({
-                            "text": text,
-                            "level": level,
-                            "page": block["page"],
-                            "size": size,
-                            "is_bold": block["is_bold"]
-                        })
-                        break
+                    return {
+                        "text": text,
+                        "level": level,
+                        "page": block["page"],
+                        "size": size,
+                        "is_bold": block["is_bold"]
+                    }
         
+        return None
+    
+    def unique_headings(self, headings: List[Dict]) -> List[Dict]:
+        """Drop repeated (text, page) headings and order them by page."""
         # Remove duplicates and sort by page then by position
         seen = set()
         unique_headings = []
@@ -267,34 +502,80 @@ class PDFOutlineExtractor:
         
         return unique_headings
     
-    def process_pdf(self, pdf_path: Path) -> Dict:
-        """Process a single PDF file and extract outline."""
+    def process_pdf(self, pdf_path: Path, data: Optional[bytes] = None) -> Dict:
+        """Process a single PDF file and extract outline.
+        
+        `data`, when given, is the file's content already in memory and
+        pdf_path only names the document.
+        """
         logger.info(f"Processing: {pdf_path.name}")
+        doc = None
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        started = time.perf_counter()
+        
+        digest = None
         
         try:
-            doc = fitz.open(str(pdf_path))
-            
-            # Limit to max pages
-            if len(doc) > self.max_pages:
-                logger.warning(f"PDF has {len(doc)} pages, processing only first {self.max_pages}")
+            # Hashed once per document; the feature cache and the journal share the digest
+            if self.feature_cache is not None or self.journal_path:
+                from feature_cache import content_digest
+                digest = content_digest(pdf_path, data)
             
-            # Analyze font characteristics
-            analysis = self.analyze_font_characteristics(doc)
+            # Span features cached for this exact content skip opening the PDF altogether
+            analysis = None
+            previous = None
+            if self.feature_cache is not None:
+                previous = self.feature_cache.entry(self.input_key(pdf_path))
+                if previous is not None and previous.sha256 == digest:
+                    analysis = previous.analysis()
+                    logger.info(f"Loaded cached span features for {pdf_path.name}")
+            opened = time.perf_counter()
             
-            # Identify title
-            title = self.identify_title(analysis)
-            
-            # Establish heading hierarchy
-            hierarchy = self.establish_heading_hierarchy(analysis)
-            logger.info(f"Established hierarchy: {hierarchy}")
+            if analysis is None:
+                if data is not None:
+                    doc = fitz.open(stream=data, filetype="pdf")
+                else:
+                    doc = fitz.open(str(pdf_path))
+                opened = time.perf_counter()
+                
+                # Limit to max pages
+                if len(doc) > self.max_pages:
+                    logger.warning(f"PDF has {len(doc)} pages, processing only first {self.max_pages}")
+                
+                # Spans feed the cache, so with one the two-pass analysis is always used
+                if self.stable_hierarchy and self.feature_cache is None:
+                    analysis = self.analyze_with_stable_hierarchy(doc, deadline)
+                else:
+                    # Analyze font characteristics
+                    analysis = self.analyze_font_characteristics(doc, deadline, previous)
+                if analysis.get("pages_reused"):
+                    logger.info(f"Re-extracted {analysis['pages_processed'] - analysis['pages_reused']} changed "
+                                f"of {analysis['pages_processed']} pages of {pdf_path.name}")
+                
+                # Only complete analyses are cached; a budget-truncated one would stay partial forever
+                if self.feature_cache is not None and analysis["pages_processed"] == min(len(doc), self.max_pages):
+                    self.feature_cache.store(self.input_key(pdf_path), digest, analysis)
+            analyzed = time.perf_counter()
             
-            # Extract headings
-            headings = self.extract_headings(analysis, hierarchy)
+            if "headings" in analysis:
+                # Already classified while the pages were read
+                title, hierarchy, headings = analysis["title"], analysis["hierarchy"], analysis["headings"]
+                logger.info(f"Established hierarchy: {hierarchy}")
+            else:
+                # Identify title
+                title = self.identify_title(analysis)
+                
+                # Establish heading hierarchy
+                hierarchy = self.heading_hierarchy(analysis)
+                logger.info(f"Established hierarchy: {hierarchy}")
+                
+                # Extract headings
+                headings = self.extract_headings(analysis, hierarchy)
             
             # Structure output
             result = {
                 "document_title": title or "Untitled Document",
-                "total_pages": min(len(doc), self.max_pages),
+                "total_pages": min(analysis["page_count"], self.max_pages),
                 "outline": []
             }
             
@@ -306,57 +587,405 @@ class PDFOutlineExtractor:
                     "page": heading["page"]
                 })
             
-            doc.close()
+            # Best-effort outline when the time budget stopped analysis early
+            if analysis["pages_processed"] < result["total_pages"]:
+                result["partial"] = True
+                result["page_reached"] = analysis["pages_processed"]
+                logger.warning(f"Partial outline for {pdf_path.name}: stopped at page {analysis['pages_processed']}")
+            
+            if self.record_timings:
+                finished = time.perf_counter()
+                result["timings"] = {
+                    "open_s": opened - started,
+                    "analyze_s": analyzed - opened,
+                    "classify_s": finished - analyzed,
+                    "total_s": finished - started
+                }
+            if digest and self.journal_path:
+                result["sha256"] = digest
             
             logger.info(f"Extracted {len(result['outline'])} headings from {pdf_path.name}")
             return result
             
         except Exception as e:
             logger.error(f"Error processing {pdf_path.name}: {str(e)}")
-            return {
+            result = {
                 "document_title": f"Error processing {pdf_path.name}",
                 "total_pages": 0,
                 "outline": [],
                 "error": str(e)
             }
+            if self.record_timings:
+                result["timings"] = {"total_s": time.perf_counter() - started}
+            if digest and self.journal_path:
+                result["sha256"] = digest
+            return result
+        
+        finally:
+            # Close on every path so long-running workers don't accumulate MuPDF documents
+            if doc is not None:
+                doc.close()
+    
+    def iter_pdf_files(self) -> Iterator[Path]:
+        """Stream the input PDFs as they are discovered (see discovery.py)."""
+        from discovery import discover
+        return discover(self.input_dir, self.manifests, self.recursive)
+    
+    def find_pdf_files(self) -> List[Path]:
+        """List the PDF files in the input directory."""
+        return list(self.iter_pdf_files())
+    
+    def find_archives(self) -> List[Path]:
+        """List the .zip/.tar(.gz) archives in the input directory."""
+        from archive_input import is_archive
+        return sorted(path for path in self.input_dir.iterdir() if path.is_file() and is_archive(path))
+    
+    def input_key(self, pdf_path: Path) -> str:
+        """Stable identifier of an input: its path relative to the input directory."""
+        try:
+            return pdf_path.relative_to(self.input_dir).as_posix()
+        except ValueError:
+            return pdf_path.as_posix()
+    
+    def process_batch(self, pdf_files: Iterable[Path]) -> Iterator[Tuple[Path, Dict]]:
+        """Yield (pdf_path, result) pairs, in supervised worker processes when workers > 1 or isolated.
+        
+        Once stop_requested is set no new documents are started; documents
+        already in flight are finished and yielded.
+        """
+        single = isinstance(pdf_files, list) and len(pdf_files) <= 1
+        if not self.isolate and (self.workers <= 1 or single):
+            if self.read_ahead:
+                yield from self._process_with_read_ahead(pdf_files)
+                return
+            for pdf_path in pdf_files:
+                if self.stop_requested:
+                    break
+                yield pdf_path, self.process_pdf(pdf_path)
+            return
+        
+        yield from self._process_supervised(pdf_files)
+    
+    def _process_supervised(self, jobs: Iterable) -> Iterator[Tuple[Path, Dict]]:
+        """process_batch's worker-process path; jobs are paths or (path, bytes) pairs."""
+        # Imported lazily: in-process runs shouldn't pay for multiprocessing at startup
+        from worker_pool import SupervisedWorkerPool
+        
+        pool = SupervisedWorkerPool(
+            self,
+            workers=self.workers,
+            memory_limit_mb=self.worker_memory_mb,
+            max_docs_per_worker=self.recycle_after,
+            max_growth_mb=self.recycle_growth_mb,
+            document_timeout=self.document_timeout
+        )
+        yield from pool.imap_unordered(jobs, should_stop=lambda: self.stop_requested)
+        
+        self.failures.extend(pool.failures)
+        if pool.failures:
+            logger.warning(f"{len(pool.failures)} documents failed in worker processes")
+    
+    def process_archive(self, archive_path: Path, journal=None) -> int:
+        """Extract outlines for every PDF member of an archive, streaming members from memory.
+        
+        Outputs are named <archive name>/<member path>.json and go through
+        handle_result, so the sink and heading index see every member. With
+        workers > 1 or isolate, members are parsed in the supervised worker
+        pool like plain files, so a member that crashes or hangs MuPDF fails
+        alone. The journal records the archive as a whole once all its
+        members are saved.
+        """
+        from archive_input import iter_archive_pdfs, member_output_name
+        
+        logger.info(f"Processing archive: {archive_path.name}")
+        processed = 0
+        # An absolute member name would otherwise replace the archive path instead of extending it
+        members = ((archive_path / member_name.lstrip("/\\"), data)
+                   for member_name, data in iter_archive_pdfs(archive_path))
+        if self.isolate or self.workers > 1:
+            results = self._process_supervised(members)
+        else:
+            results = ((member_path, self.process_pdf(member_path, data)) for member_path, data in members
+                       if not self.stop_requested)
+        try:
+            for member_path, result in results:
+                member_name = member_path.relative_to(archive_path).as_posix()
+                self.handle_result(member_path, result, output_name=member_output_name(archive_path, member_name))
+                processed += 1
+        except Exception as e:
+            logger.error(f"Error reading archive {archive_path.name}: {str(e)}")
+            if journal:
+                from batch_journal import STATUS_FAILED
+                journal.record(self.input_key(archive_path), archive_path, STATUS_FAILED, error=str(e))
+            return processed
+        if self.stop_requested:
+            # Members left unread are picked up when the batch is resumed
+            return processed
+        
+        if journal:
+            from batch_journal import STATUS_DONE
+            journal.record(self.input_key(archive_path), archive_path, STATUS_DONE)
+        logger.info(f"Extracted {processed} documents from {archive_path.name}")
+        return processed
+    
+    def _process_with_read_ahead(self, pdf_files: Iterable[Path]) -> Iterator[Tuple[Path, Dict]]:
+        """Sequential processing while the next read_ahead files are loaded in the background."""
+        from prefetcher import ReadAheadPrefetcher
+        
+        prefetcher = ReadAheadPrefetcher(pdf_files, depth=self.read_ahead,
+                                         memory_limit_mb=self.read_ahead_mb, mode=self.read_ahead_mode)
+        for pdf_path, data in prefetcher:
+            if self.stop_requested:
+                break
+            yield pdf_path, self.process_pdf(pdf_path, data)
+        
+        self.prefetch_stats = dict(prefetcher.stats, hidden_io_s=prefetcher.hidden_io_s)
+        logger.info(prefetcher.summary())
+    
+    def flat_output_name(self, pdf_path: Path) -> str:
+        """Default output name: the input's path relative to the input directory, as .json.
+        
+        Mirroring subdirectories keeps a/x.pdf and b/x.pdf from both writing
+        x.json under --recursive; inputs outside the input directory (from a
+        manifest) are named <stem>.json.
+        """
+        try:
+            relative = pdf_path.relative_to(self.input_dir)
+        except ValueError:
+            return pdf_path.stem + ".json"
+        return PurePosixPath(relative.as_posix()).with_suffix(".json").as_posix()
+    
+    def save_result(self, pdf_path: Path, result: Dict, output_name: Optional[str] = None) -> Path:
+        """Atomically write the outline for pdf_path to the output directory.
+        
+        `output_name` overrides the default name (see flat_output_name) and may
+        contain subdirectories; the sharded layout replaces both with a hashed path.
+        Serialisation, compression and the atomic temp-and-rename are
+        handled by self.writer (see output_writer.py).
+        """
+        if self.output_index is not None:
+            from output_layout import sharded_output_name
+            output_name = sharded_output_name(self.input_key(pdf_path), pdf_path.stem)
+        output_name = output_name or self.flat_output_name(pdf_path)
+        if self.writer.compress:
+            output_name += ".gz"
+        output_path = self.output_dir / output_name
+        if "/" in output_name:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        output_path, written = self.writer.write(output_path, result)
+        if written and self.output_index is not None:
+            self.output_index.record(self.input_key(pdf_path), output_name)
+        return output_path
+    
+    def open_sinks(self):
+        """Open the SQLite sink, heading index and journal the options ask for; returns the journal."""
+        if self.sink == "sqlite":
+            from sqlite_sink import SQLiteSink
+            # The journal promises results are stored, so journaled runs commit every document
+            self.sqlite_sink = SQLiteSink(self.sqlite_path, batch_size=1 if self.journal_path else 500)
+        
+        if self.heading_index_path:
+            from heading_index import HeadingIndex
+            self.heading_index = HeadingIndex(self.heading_index_path, batch_size=1 if self.journal_path else 500)
+        
+        if self.journal_path:
+            from batch_journal import BatchJournal
+            return BatchJournal(self.journal_path, retry_failed=self.retry_failed, output_dir=self.output_dir)
+        return None
+    
+    def close_sinks(self, journal=None):
+        """Flush and close everything open_sinks opened, and the output index."""
+        if journal:
+            journal.close()
+        if self.output_index is not None:
+            self.output_index.close()
+        if self.sqlite_sink is not None:
+            self.sqlite_sink.close()
+            logger.info(f"Stored {self.sqlite_sink.documents} documents in {self.sqlite_path}")
+            self.sqlite_sink = None
+        if self.heading_index is not None:
+            self.heading_index.close()
+            self.heading_index = None
+    
+    def __getstate__(self):
+        # Worker processes receive a pickled extractor but only parse; the parent writes every
+        # result, so its open output index, SQLite sink and heading index stay behind
+        state = self.__dict__.copy()
+        state.update(output_index=None, sqlite_sink=None, heading_index=None)
+        return state
+    
+    def handle_result(self, pdf_path: Path, result: Dict, journal=None, output_name: Optional[str] = None,
+                      source_path: Optional[Path] = None, digest: Optional[str] = None):
+        """Save one finished document, index it and record it in the journal, if any.
+        
+        `source_path` is the file the result was extracted from when it is not
+        pdf_path itself (spool jobs are parsed under an owner-tagged name).
+        `digest` is its SHA-256 when process_pdf did not attach one.
+        """
+        # The content hash taken by process_pdf is only for the journal, never part of the outline
+        digest = result.pop("sha256", None) or digest
+        if self.sink != "sqlite":
+            # Timings are recorded for the SQLite sink and for de-duplication, never written to outlines
+            result.pop("timings", None)
+        try:
+            if self.sqlite_sink is not None:
+                self.sqlite_sink.add(self.input_key(pdf_path), result)
+                output_path = self.sqlite_path
+            else:
+                output_path = self.save_result(pdf_path, result, output_name)
+                logger.info(f"Saved outline to: {output_path}")
+            
+            if self.heading_index is not None:
+                self.heading_index.update(self.input_key(pdf_path), result)
+            
+            if journal:
+                from batch_journal import STATUS_DONE, STATUS_FAILED
+                status = STATUS_FAILED if "error" in result else STATUS_DONE
+                journal.record(self.input_key(pdf_path), source_path or pdf_path, status,
+                               output=output_path, error=result.get("error"), digest=digest)
+            
+        except Exception as e:
+            logger.error(f"Failed to process {pdf_path.name}: {str(e)}")
+    
+    def deliver_result(self, pdf_path: Path, result: Dict, journal=None):
+        """Handle a finished document, then every byte-identical copy of it in the batch."""
+        copies = self.duplicate_copies.pop(pdf_path, [])
+        timings = result.get("timings")
+        digest = result.get("sha256")
+        self.handle_result(pdf_path, result, journal)
+        for copy_path in copies:
+            logger.info(f"{copy_path.name} is identical to {pdf_path.name}; reusing its outline")
+            self.handle_result(copy_path, result, journal, digest=digest)
+        self.duplicates_skipped += len(copies)
+        if timings:
+            self.duplicate_time_saved += len(copies) * timings["total_s"]
+    
+    def _skip_journaled(self, pdf_files: Iterable[Path], journal) -> Iterator[Path]:
+        """Drop inputs the journal already has, unchanged, as finished."""
+        for pdf_path in pdf_files:
+            if journal.is_complete(self.input_key(pdf_path), pdf_path):
+                self.resumed += 1
+            else:
+                yield pdf_path
+    
+    def request_stop(self, signum=None, frame=None):
+        """Stop starting new documents; in-flight ones are drained and saved."""
+        if not self.stop_requested:
+            logger.warning("Stop requested: draining in-flight documents before exit")
+        self.stop_requested = True
     
     def run(self):
         """Main execution method."""
         logger.info("Starting PDF outline extraction...")
         
-        # Check if input directory exists
-        if not self.input_dir.exists():
+        # Check if input directory exists (manifests name their files directly)
+        if not self.manifests and not self.input_dir.exists():
             logger.error(f"Input directory {self.input_dir} does not exist")
             return
         
-        # Find all PDF files
-        pdf_files = list(self.input_dir.glob("*.pdf")) + list(self.input_dir.glob("*.PDF"))
+        # Without a global order or size balance to compute, files are processed as they are discovered
+        # De-duplication needs the whole batch to know which inputs are copies of one another
+        streaming = (self.schedule == "fifo" and (self.shard_count == 1 or self.shard_balance == "hash")
+                     and not self.dedup)
+        pdf_files = self.iter_pdf_files()
+        archives = self.find_archives() if self.archives and self.input_dir.exists() else []
         
-        if not pdf_files:
+        first = next(pdf_files, None)
+        if first is None and not archives:
             logger.warning("No PDF files found in input directory")
             return
+        pdf_files = itertools.chain([] if first is None else [first], pdf_files)
+        
+        if streaming:
+            logger.info("Processing PDF files as they are discovered")
+        else:
+            pdf_files = list(pdf_files)
+            logger.info(f"Found {len(pdf_files)} PDF files to process")
+        if archives:
+            logger.info(f"Found {len(archives)} archives to process")
+        
+        if self.shard_count > 1:
+            from sharding import iter_shard, select_shard
+            if streaming:
+                pdf_files = iter_shard(pdf_files, self.shard_index, self.shard_count, self.input_key)
+            else:
+                pdf_files = select_shard(pdf_files, self.shard_index, self.shard_count,
+                                         self.input_key, self.shard_balance)
+            archives = select_shard(archives, self.shard_index, self.shard_count,
+                                    self.input_key, self.shard_balance)
+            logger.info(f"Shard {self.shard_index + 1}/{self.shard_count} ({self.shard_balance})")
+        
+        journal = self.open_sinks()
+        self.resumed = 0
+        if journal:
+            pdf_files = self._skip_journaled(pdf_files, journal)
+            if not streaming:
+                pdf_files = list(pdf_files)
+            archives = [archive_path for archive_path in archives
+                        if not journal.is_complete(self.input_key(archive_path), archive_path)]
+        
+        self.duplicate_copies = {}
+        self.duplicates_skipped = 0
+        self.duplicate_time_saved = 0.0
+        if self.dedup:
+            from dedup import group_identical
+            pdf_files, self.duplicate_copies = group_identical(pdf_files)
+            copies = sum(len(paths) for paths in self.duplicate_copies.values())
+            if copies:
+                logger.info(f"{copies} inputs are byte-identical copies; processing {len(pdf_files)} unique documents")
+        
+        if self.schedule != "fifo":
+            from batch_scheduler import schedule as schedule_batch
+            pdf_files = schedule_batch(pdf_files, self.schedule, self.schedule_by, self.max_pages)
+            logger.info(f"Scheduled batch {self.schedule} by {self.schedule_by}")
+        
+        # Drain instead of dying on SIGTERM (signal handlers can only be set from the main thread)
+        self.stop_requested = False
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, self.request_stop)
         
-        logger.info(f"Found {len(pdf_files)} PDF files to process")
-        
-        # Process each PDF
-        for pdf_path in pdf_files:
-            try:
-                # Extract outline
-                result = self.process_pdf(pdf_path)
-                
-                # Save result
-                output_filename = pdf_path.stem + ".json"
-                output_path = self.output_dir / output_filename
-                
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
-                
-                logger.info(f"Saved outline to: {output_path}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process {pdf_path.name}: {str(e)}")
-        
-        logger.info("PDF outline extraction completed")
+        try:
+            if self.pipeline == "async":
+                import asyncio
+                from async_pipeline import run_pipeline
+                stats = asyncio.run(run_pipeline(
+                    self, pdf_files, lambda pdf_path, result: self.deliver_result(pdf_path, result, journal)))
+                logger.info(f"Async pipeline: {stats['documents']} documents in {stats['wall_s']:.2f}s "
+                            f"(read {stats['read_s']:.2f}s, parse {stats['parse_s']:.2f}s, "
+                            f"write {stats['write_s']:.2f}s)")
+            else:
+                # Process each PDF
+                for pdf_path, result in self.process_batch(pdf_files):
+                    self.deliver_result(pdf_path, result, journal)
+            
+            for archive_path in archives:
+                if self.stop_requested:
+                    break
+                self.process_archive(archive_path, journal)
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+            self.close_sinks(journal)
+        
+        logger.info(f"Outputs: {self.writer.written} written, {self.writer.unchanged} unchanged")
+        if self.hierarchy_templates is not None and self.hierarchy_templates.summary():
+            # Counts cover this process only; worker processes keep their own templates
+            logger.info(self.hierarchy_templates.summary())
+        if self.duplicates_skipped:
+            logger.info(f"De-duplication: {self.duplicates_skipped} duplicate inputs skipped, "
+                        f"~{self.duplicate_time_saved:.2f}s of processing saved")
+        if self.resumed:
+            logger.info(f"Resumed batch: {self.resumed} documents already in journal were skipped")
+        
+        for pdf_path, cause in self.failures:
+            logger.error(f"Worker failure: {pdf_path.name} ({cause})")
+        
+        if self.stop_requested:
+            logger.warning("PDF outline extraction stopped early; rerun to resume")
+        else:
+            logger.info("PDF outline extraction completed")
 
 def main():
     """Main entry point."""
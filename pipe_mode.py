@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Unix-pipe mode for PDF Outline Extractor
+Reads PDF paths (one per line) or length-prefixed PDF bytes from stdin and
+writes one compact JSON line per document to stdout as soon as it is done,
+in input or completion order. At most a fixed window of documents is in
+flight, so memory stays flat however long the stream is. Declared lengths
+are capped, so a corrupt prefix fails fast instead of allocating gigabytes.
+"""
+
+import itertools
+import logging
+import os
+import queue
+import struct
+import threading
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from output_writer import OutputWriter
+
+logger = logging.getLogger(__name__)
+
+PIPE_INPUT_FORMATS = ("paths", "bytes")
+PIPE_ORDERS = ("input", "completion")
+
+# Each document in "bytes" input is an unsigned 64-bit big-endian length followed by the PDF
+LENGTH_PREFIX = struct.Struct(">Q")
+
+# Default cap on a declared document length
+MAX_DOCUMENT_BYTES = 512 * 1024 * 1024
+
+# Longest a finished document can wait for stdin before it is written out
+POLL_SECONDS = 0.05
+
+_END = object()
+
+
+def read_paths(stream: BinaryIO) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """(path, None) for each non-empty line."""
+    for line in stream:
+        line = line.rstrip(b"\r\n")
+        if line:
+            yield os.fsdecode(line), None
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            raise EOFError("stdin ended inside a length-prefixed document")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_length_prefixed(stream: BinaryIO, max_bytes: int = MAX_DOCUMENT_BYTES) -> Iterator[Tuple[str, bytes]]:
+    """(stdin-<n>.pdf, bytes) for each length-prefixed document until EOF.
+
+    A length above max_bytes raises ValueError before anything is read: the
+    stream can't be resynchronised after a bad prefix, so it is not skipped.
+    """
+    for index in itertools.count():
+        header = stream.read(LENGTH_PREFIX.size)
+        if not header:
+            return
+        if len(header) < LENGTH_PREFIX.size:
+            raise EOFError("stdin ended inside a length prefix")
+        (length,) = LENGTH_PREFIX.unpack(header)
+        if length > max_bytes:
+            raise ValueError(f"document {index} declares {length} bytes, over the {max_bytes}-byte limit "
+                             f"(corrupt length prefix?)")
+        yield f"stdin-{index}.pdf", _read_exactly(stream, length)
+
+
+_LINE_WRITER = OutputWriter(compact=True)
+
+
+def encode_record(name: str, result: Dict) -> bytes:
+    """One compact NDJSON line: the outline plus the input it came from."""
+    return _LINE_WRITER.serialize({"input": name, **result}) + b"\n"
+
+
+def run_pipe(extractor, stdin: BinaryIO, stdout: BinaryIO, input_format: str = "paths",
+             order: str = "input", window: Optional[int] = None, max_document_bytes: int = MAX_DOCUMENT_BYTES) -> int:
+    """Stream documents from stdin to NDJSON on stdout; returns how many were written.
+
+    With extractor.workers > 1 documents are parsed in a process pool and at
+    most `window` (default 2 x workers) are in flight at once; a worker that
+    crashes fails only the document that killed it.
+    """
+    if input_format == "paths":
+        documents = read_paths(stdin)
+    else:
+        documents = read_length_prefixed(stdin, max_document_bytes)
+    written = 0
+
+    def emit(name: str, result: Dict):
+        nonlocal written
+        stdout.write(encode_record(name, result))
+        stdout.flush()
+        written += 1
+
+    if extractor.workers <= 1:
+        for name, data in documents:
+            if extractor.stop_requested:
+                break
+            emit(name, extractor.process_pdf(Path(name), data))
+        return written
+
+    _run_parallel(extractor, documents, emit, order, window or 2 * extractor.workers)
+    return written
+
+
+def _read_into(documents: Iterator[Tuple[str, Optional[bytes]]], inbox: queue.Queue,
+               wanted: threading.Semaphore):
+    """Reader thread: read one document per `wanted` permit, then _END (or the error that stopped reading)."""
+    try:
+        while True:
+            wanted.acquire()
+            document = next(documents, _END)
+            inbox.put(document)
+            if document is _END:
+                return
+    except Exception as e:
+        inbox.put(e)
+
+
+def _run_parallel(extractor, documents, emit, order: str, window: int):
+    """Parse in a process pool while a thread reads stdin, emitting each result once it can go out.
+
+    A slow producer never holds back finished documents: the loop wakes at
+    least every POLL_SECONDS to emit whatever is ready. A worker crash breaks
+    the pool; it is rebuilt and the documents it held are retried one by one.
+    """
+    # Process pools are only needed here; importing them up front slows every pipe start
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+    from worker_pool import process_in_pool_worker, process_isolated, process_pool
+
+    # stdin is only read when there is room for the document, so it never runs more than the window ahead
+    inbox, wanted = queue.Queue(), threading.Semaphore(0)
+    threading.Thread(target=_read_into, args=(documents, inbox, wanted), daemon=True).start()
+    executor = process_pool(extractor, extractor.workers)
+    in_flight = deque()  # (name, data, executor, future) in input order
+    requested = exhausted = False
+
+    def restart_pool(broken):
+        nonlocal executor
+        if broken is executor:
+            logger.warning("A pipe worker died; restarting the pool and retrying its documents one by one")
+            executor.shutdown(wait=False)
+            executor = process_pool(extractor, extractor.workers)
+
+    def submit(name, data):
+        try:
+            return executor, executor.submit(process_in_pool_worker, Path(name), data)
+        except BrokenProcessPool:
+            # The pool broke before its futures reported it; start afresh for this document
+            restart_pool(executor)
+            return executor, executor.submit(process_in_pool_worker, Path(name), data)
+
+    def result_of(name, data, submitted_to, future) -> Dict:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            restart_pool(submitted_to)
+            return process_isolated(extractor, Path(name), data)
+
+    def emit_ready():
+        while in_flight:
+            ready = [entry for entry in (in_flight if order == "completion" else [in_flight[0]])
+                     if entry[3].done()]
+            if not ready:
+                return
+            for entry in ready:
+                in_flight.remove(entry)
+                emit(entry[0], result_of(*entry))
+
+    try:
+        while not exhausted or in_flight:
+            exhausted = exhausted or extractor.stop_requested
+            if not exhausted and len(in_flight) < window:
+                if not requested:
+                    wanted.release()
+                    requested = True
+                try:
+                    item = inbox.get(timeout=POLL_SECONDS)
+                    requested = False
+                except queue.Empty:
+                    item = None
+                if item is _END:
+                    exhausted = True
+                elif isinstance(item, Exception):
+                    raise item
+                elif item is not None:
+                    name, data = item
+                    in_flight.append((name, data) + submit(name, data))
+            elif order == "input" and in_flight:
+                wait([in_flight[0][3]], timeout=POLL_SECONDS)
+            elif in_flight:
+                wait([entry[3] for entry in in_flight], timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+            emit_ready()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
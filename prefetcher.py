@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Read-ahead prefetcher for PDF Outline Extractor
+While one document is parsed, a background thread reads the next few files
+of the schedule into memory (or asks the kernel to via posix_fadvise), so
+cold reads from network storage overlap with CPU work instead of adding to it.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+READ_AHEAD_MODES = ("read", "fadvise")
+
+
+class ReadAheadPrefetcher:
+    """Iterate (pdf_path, data) pairs in order, with up to `depth` files read ahead.
+
+    At most memory_limit_mb of file data is buffered; a file larger than the
+    whole budget is not prefetched and comes back with data None. In
+    "fadvise" mode nothing is buffered: the kernel is told WILLNEED for the
+    next files and data is always None.
+    """
+
+    def __init__(self, pdf_files: Iterable[Path], depth: int = 4, memory_limit_mb: float = 256.0,
+                 mode: str = "read"):
+        if mode == "fadvise" and not hasattr(os, "posix_fadvise"):
+            logger.warning("posix_fadvise is unavailable on this platform; reading ahead into memory instead")
+            mode = "read"
+        # Consumed lazily by the background thread, so it may be a discovery stream
+        self.pdf_files = pdf_files
+        self.depth = max(1, depth)
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.mode = mode
+
+        self._ready: Dict[int, Tuple[Path, Optional[bytes]]] = {}
+        self._total: Optional[int] = None
+        self._buffered_bytes = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        # Background time spent reading vs. time the consumer still had to wait
+        self.stats = {"files": 0, "bytes": 0, "read_s": 0.0, "wait_s": 0.0, "oversize": 0, "peak_buffered_bytes": 0}
+
+    def _read(self, pdf_path: Path) -> Optional[bytes]:
+        if self.mode == "fadvise":
+            fd = os.open(pdf_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+            return None
+        return pdf_path.read_bytes()
+
+    def _size(self, pdf_path: Path) -> int:
+        if self.mode == "fadvise":
+            return 0
+        try:
+            return pdf_path.stat().st_size
+        except OSError:
+            return 0
+
+    def _run(self):
+        index = -1
+        try:
+            for index, pdf_path in enumerate(self.pdf_files):
+                if not self._prefetch(index, pdf_path):
+                    return
+        finally:
+            with self._condition:
+                self._total = index + 1
+                self._condition.notify_all()
+
+    def _prefetch(self, index: int, pdf_path: Path) -> bool:
+        size = self._size(pdf_path)
+        oversize = size > self.memory_limit
+        with self._condition:
+            # Room for one more file: fewer than `depth` buffered and within the memory budget
+            self._condition.wait_for(lambda: self._closed or (
+                len(self._ready) < self.depth and (oversize or self._buffered_bytes + size <= self.memory_limit)))
+            if self._closed:
+                return False
+
+        data = None
+        if oversize:
+            self.stats["oversize"] += 1
+        else:
+            start = time.perf_counter()
+            try:
+                data = self._read(pdf_path)
+            except OSError:
+                data = None  # the consumer opens the path itself and reports the error
+            self.stats["read_s"] += time.perf_counter() - start
+
+        with self._condition:
+            self._ready[index] = (pdf_path, data)
+            if data is not None:
+                self._buffered_bytes += len(data)
+                self.stats["bytes"] += len(data)
+                self.stats["peak_buffered_bytes"] = max(self.stats["peak_buffered_bytes"], self._buffered_bytes)
+            self._condition.notify_all()
+        return True
+
+    def __iter__(self) -> Iterator[Tuple[Path, Optional[bytes]]]:
+        thread = threading.Thread(target=self._run, name="pdf-read-ahead", daemon=True)
+        thread.start()
+        try:
+            for index in itertools.count():
+                start = time.perf_counter()
+                with self._condition:
+                    self._condition.wait_for(lambda: index in self._ready or self._total is not None)
+                    if index not in self._ready:
+                        break
+                    pdf_path, data = self._ready.pop(index)
+                    if data is not None:
+                        self._buffered_bytes -= len(data)
+                    self._condition.notify_all()
+                self.stats["wait_s"] += time.perf_counter() - start
+                self.stats["files"] += 1
+                yield pdf_path, data
+        finally:
+            with self._condition:
+                self._closed = True
+                self._ready.clear()
+                self._condition.notify_all()
+            thread.join()
+
+    @property
+    def hidden_io_s(self) -> float:
+        """Read time that overlapped with parsing rather than stalling it."""
+        return max(0.0, self.stats["read_s"] - self.stats["wait_s"])
+
+    def summary(self) -> str:
+        if self.mode == "fadvise":
+            return f"Read-ahead advised the kernel about {self.stats['files']} files"
+        return (f"Read-ahead: {self.stats['files']} files, {self.stats['bytes'] / 1e6:.1f} MB read, "
+                f"{self.hidden_io_s:.2f}s of {self.stats['read_s']:.2f}s I/O hidden behind parsing "
+                f"(peak buffer {self.stats['peak_buffered_bytes'] / 1e6:.1f} MB)")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Throughput scaling benchmark for PDF Outline Extractor
+Runs the batch path across worker counts and corpus sizes and records
+docs/sec, pages/sec, parallel efficiency and peak aggregate RSS.
+"""
+
+import argparse
+import csv
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmark_support import RSSSampler, generate_corpus
+from pdf_outline_extractor import PDFOutlineExtractor
+
+DEFAULT_CORPUS_SIZES = [10, 100, 1000, 10000]
+CSV_FIELDS = [
+    "corpus_docs", "workers", "seconds", "docs_per_sec",
+    "pages_per_sec", "parallel_efficiency", "peak_rss_mb",
+]
+
+
+def default_worker_counts(max_workers: int = None) -> List[int]:
+    """1, 2, 4 ... up to max_workers (always including max_workers itself)."""
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def run_batch(pdf_files: List[Path], workers: int, output_dir: Path) -> Dict:
+    """Time one pass of the batch path over pdf_files."""
+    extractor = PDFOutlineExtractor(input_dir=pdf_files[0].parent, output_dir=output_dir, workers=workers)
+    total_pages = 0
+
+    with RSSSampler() as sampler:
+        start_time = time.perf_counter()
+        for pdf_path, result in extractor.process_batch(pdf_files):
+            extractor.save_result(pdf_path, result)
+            total_pages += result.get("total_pages", 0)
+        elapsed = time.perf_counter() - start_time
+
+    return {
+        "corpus_docs": len(pdf_files),
+        "workers": workers,
+        "seconds": elapsed,
+        "docs_per_sec": len(pdf_files) / elapsed if elapsed > 0 else 0.0,
+        "pages_per_sec": total_pages / elapsed if elapsed > 0 else 0.0,
+        "peak_rss_mb": sampler.peak_rss / 1024 / 1024,
+    }
+
+
+def run_scaling_benchmark(corpus_dir: Path, corpus_sizes: List[int], worker_counts: List[int]) -> List[Dict]:
+    """Run every (corpus size, worker count) combination and return one row per run."""
+    corpus = generate_corpus(corpus_dir, max(corpus_sizes))
+    rows = []
+
+    for size in corpus_sizes:
+        baseline = None
+        for workers in worker_counts:
+            with tempfile.TemporaryDirectory() as output_dir:
+                row = run_batch(corpus[:size], workers, Path(output_dir))
+
+            if baseline is None:
+                baseline = row["docs_per_sec"] / row["workers"]
+            row["parallel_efficiency"] = (
+                row["docs_per_sec"] / (workers * baseline) if baseline else 0.0
+            )
+            rows.append(row)
+            print(f"  📄 {size:>6} docs | 👷 {workers:>3} workers | "
+                  f"{row['docs_per_sec']:8.1f} docs/s | {row['pages_per_sec']:9.1f} pages/s | "
+                  f"eff {row['parallel_efficiency']:5.2f} | {row['peak_rss_mb']:7.1f}MB")
+
+    return rows
+
+
+def print_table(rows: List[Dict]):
+    """Print the results as a fixed-width table."""
+    header = (f"{'docs':>7} {'workers':>8} {'seconds':>9} {'docs/s':>9} "
+              f"{'pages/s':>10} {'efficiency':>11} {'peak RSS MB':>12}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['corpus_docs']:>7} {row['workers']:>8} {row['seconds']:>9.2f} "
+              f"{row['docs_per_sec']:>9.1f} {row['pages_per_sec']:>10.1f} "
+              f"{row['parallel_efficiency']:>11.2f} {row['peak_rss_mb']:>12.1f}")
+
+
+def write_csv(rows: List[Dict], csv_path: Path):
+    """Write the results as CSV for node sizing."""
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: (round(row[field], 4) if isinstance(row[field], float) else row[field])
+                             for field in CSV_FIELDS})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput scaling benchmark")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Directory to generate the synthetic corpus in (default: a temporary directory)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_CORPUS_SIZES,
+                        help="Corpus sizes to benchmark")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest worker count (counts double from 1 up to this)")
+    parser.add_argument("--csv", type=Path, default=Path("benchmark_output/scaling.csv"),
+                        help="Where to write the CSV results")
+    args = parser.parse_args()
+
+    # Per-document INFO logging would dominate the timings
+    logging.getLogger("pdf_outline_extractor").setLevel(logging.WARNING)
+
+    print("=== SCALING BENCHMARK ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir = args.corpus_dir or Path(work_dir)
+        rows = run_scaling_benchmark(corpus_dir, sorted(args.sizes), default_worker_counts(args.max_workers))
+
+    print()
+    print_table(rows)
+    write_csv(rows, args.csv)
+    print(f"\n📊 CSV written to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
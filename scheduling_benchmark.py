@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Scheduling-policy benchmark for PDF Outline Extractor
+Runs a skewed batch (many short documents, a few long ones discovered last)
+under each scheduling policy and reports makespan and latency percentiles.
+"""
+
+import argparse
+import csv
+import logging
+import math
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from batch_scheduler import SCHEDULING_POLICIES, schedule
+from benchmark_support import create_synthetic_pdf, generate_corpus
+from pdf_outline_extractor import PDFOutlineExtractor
+
+CSV_FIELDS = ["policy", "measure", "workers", "documents", "makespan_s", "mean_s", "p50_s", "p95_s", "p99_s"]
+
+
+def build_skewed_corpus(directory: Path, small_docs: int = 60, large_docs: int = 3, large_pages: int = 50) -> List[Path]:
+    """Short documents plus a few long ones whose names sort last, as glob would return them."""
+    pdf_files = generate_corpus(directory / "small", small_docs, min_pages=1, max_pages=3)
+    for index in range(large_docs):
+        pdf_files.append(create_synthetic_pdf(directory / f"zz_manual_{index}.pdf", pages=large_pages,
+                                              seed=1000 + index))
+    return pdf_files
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def run_policy(pdf_files: List[Path], policy: str, measure: str, workers: int, output_dir: Path) -> Dict:
+    """Run the batch once under `policy`; latency is completion time since the batch started."""
+    extractor = PDFOutlineExtractor(input_dir=pdf_files[0].parent, output_dir=output_dir, workers=workers)
+    latencies = []
+
+    start_time = time.perf_counter()
+    ordered = schedule(pdf_files, policy, measure, extractor.max_pages)
+    for pdf_path, result in extractor.process_batch(ordered):
+        extractor.save_result(pdf_path, result)
+        latencies.append(time.perf_counter() - start_time)
+
+    return {
+        "policy": policy,
+        "measure": measure,
+        "workers": workers,
+        "documents": len(latencies),
+        "makespan_s": max(latencies),
+        "mean_s": statistics.mean(latencies),
+        "p50_s": percentile(latencies, 0.50),
+        "p95_s": percentile(latencies, 0.95),
+        "p99_s": percentile(latencies, 0.99),
+    }
+
+
+def run_scheduling_benchmark(pdf_files: List[Path], workers: int, measures: List[str]) -> List[Dict]:
+    """One row per (policy, cost measure); FIFO ignores the measure and runs once."""
+    rows = []
+    for policy in SCHEDULING_POLICIES:
+        for measure in (["size"] if policy == "fifo" else measures):
+            with tempfile.TemporaryDirectory() as output_dir:
+                row = run_policy(pdf_files, policy, measure, workers, Path(output_dir))
+            rows.append(row)
+            print(f"  {policy:<15} {measure:<6} makespan {row['makespan_s']:7.2f}s  mean {row['mean_s']:7.2f}s  "
+                  f"p95 {row['p95_s']:7.2f}s  p99 {row['p99_s']:7.2f}s")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduling-policy benchmark")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Directory to generate the skewed corpus in (default: a temporary directory)")
+    parser.add_argument("--small-docs", type=int, default=60, help="Number of short documents")
+    parser.add_argument("--large-docs", type=int, default=3, help="Number of long documents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--measures", nargs="+", choices=["size", "pages"], default=["size", "pages"],
+                        help="Cost estimates to compare for the size-aware policies")
+    parser.add_argument("--csv", type=Path, default=Path("benchmark_output/scheduling.csv"),
+                        help="Where to write the CSV results")
+    args = parser.parse_args()
+
+    logging.getLogger("pdf_outline_extractor").setLevel(logging.WARNING)
+
+    print("=== SCHEDULING BENCHMARK ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_files = build_skewed_corpus(args.corpus_dir or Path(work_dir), args.small_docs, args.large_docs)
+        print(f"📄 {len(pdf_files)} documents, {args.workers} workers\n")
+        rows = run_scheduling_benchmark(pdf_files, args.workers, args.measures)
+
+    args.csv.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\n📊 CSV written to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
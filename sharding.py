@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Deterministic sharding of a batch across containers
+Every container lists the same shared input directory and independently
+computes the same assignment, so N containers split the work without any
+coordinator service.
+"""
+
+import hashlib
+import heapq
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List
+
+SHARD_BALANCE_MODES = ("hash", "bytes")
+
+
+def stable_hash(key: str) -> int:
+    """Process- and platform-independent 64-bit hash (unlike the salted built-in hash())."""
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+def shard_for_key(key: str, shard_count: int) -> int:
+    """Shard of `key` by hashing alone: stable even when other files come and go."""
+    return stable_hash(key) % shard_count
+
+
+def iter_shard(pdf_files: Iterable[Path], shard_index: int, shard_count: int,
+               key_func: Callable[[Path], str]) -> Iterator[Path]:
+    """Streaming form of the "hash" balance: needs no full listing up front."""
+    for pdf_path in pdf_files:
+        if shard_for_key(key_func(pdf_path), shard_count) == shard_index:
+            yield pdf_path
+
+
+def assign_shards(sizes: Dict[str, int], shard_count: int) -> Dict[str, int]:
+    """Byte-balanced assignment: largest files first, each to the currently lightest shard.
+
+    The order is fully determined by (size, stable hash of the key), so every
+    container that sees the same listing computes the same assignment. A
+    different listing can move any file to another shard, so the listing
+    must be frozen for the whole run, resumes included.
+    """
+    loads = [(0, shard) for shard in range(shard_count)]
+    heapq.heapify(loads)
+    assignment = {}
+    for key in sorted(sizes, key=lambda key: (-sizes[key], stable_hash(key), key)):
+        load, shard = heapq.heappop(loads)
+        assignment[key] = shard
+        heapq.heappush(loads, (load + sizes[key], shard))
+    return assignment
+
+
+def select_shard(pdf_files: List[Path], shard_index: int, shard_count: int,
+                 key_func: Callable[[Path], str], balance: str = "hash") -> List[Path]:
+    """The subset of pdf_files that belongs to shard `shard_index` of `shard_count`."""
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+    if balance not in SHARD_BALANCE_MODES:
+        raise ValueError(f"Unknown shard balance '{balance}' (choose from {', '.join(SHARD_BALANCE_MODES)})")
+    if shard_count == 1:
+        return list(pdf_files)
+
+    keys = {pdf_path: key_func(pdf_path) for pdf_path in pdf_files}
+    if balance == "hash":
+        return [pdf_path for pdf_path in pdf_files if shard_for_key(keys[pdf_path], shard_count) == shard_index]
+
+    sizes = {}
+    for pdf_path, key in keys.items():
+        try:
+            sizes[key] = pdf_path.stat().st_size
+        except OSError:
+            sizes[key] = 0
+    assignment = assign_shards(sizes, shard_count)
+    return [pdf_path for pdf_path in pdf_files if assignment[keys[pdf_path]] == shard_index]
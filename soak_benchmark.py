@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Long-run soak benchmark for PDF Outline Extractor
+Feeds thousands of generated and malformed PDFs through one extractor
+instance, sampling RSS and the MuPDF store size, and fails when memory
+keeps growing faster than the allowed slope.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import fitz  # PyMuPDF
+import psutil
+
+from benchmark_support import create_malformed_pdfs, generate_corpus, mupdf_store_size
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+def growth_slope(samples: List[Tuple[int, int]]) -> float:
+    """Least-squares slope of bytes against documents processed (bytes per document)."""
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+    if var_x == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x
+
+
+def run_soak(work_dir: Path, documents: int = 10000, sample_every: int = 100,
+             warmup_fraction: float = 0.1, max_slope_kb: float = 256.0) -> Dict:
+    """Run the soak and return samples, slopes and a pass/fail verdict.
+
+    max_slope_kb is the tolerated growth in KB per 1,000 documents, measured
+    after the warm-up fraction of the run has been discarded.
+    """
+    work_dir = Path(work_dir)
+    pool = generate_corpus(work_dir / "valid", 50) + create_malformed_pdfs(work_dir / "malformed")
+
+    extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output")
+    process = psutil.Process(os.getpid())
+
+    rss_samples = []
+    store_samples = []
+    errors = 0
+    start_time = time.perf_counter()
+
+    for processed, pdf_path in enumerate(itertools.islice(itertools.cycle(pool), documents), start=1):
+        result = extractor.process_pdf(pdf_path)
+        if "error" in result:
+            errors += 1
+        if processed % sample_every == 0 or processed == documents:
+            rss_samples.append((processed, process.memory_info().rss))
+            store_size = mupdf_store_size()
+            if store_size is not None:
+                store_samples.append((processed, store_size))
+
+    elapsed = time.perf_counter() - start_time
+    warmup = int(len(rss_samples) * warmup_fraction)
+    rss_slope = growth_slope(rss_samples[warmup:]) * 1000 / 1024
+    store_slope = growth_slope(store_samples[warmup:]) * 1000 / 1024 if store_samples else None
+
+    return {
+        "documents": documents,
+        "errors": errors,
+        "seconds": elapsed,
+        "docs_per_sec": documents / elapsed if elapsed > 0 else 0.0,
+        "rss_start_mb": rss_samples[0][1] / 1024 / 1024,
+        "rss_end_mb": rss_samples[-1][1] / 1024 / 1024,
+        "rss_slope_kb_per_1k_docs": rss_slope,
+        "store_slope_kb_per_1k_docs": store_slope,
+        "max_slope_kb_per_1k_docs": max_slope_kb,
+        "passed": rss_slope <= max_slope_kb and (store_slope is None or store_slope <= max_slope_kb),
+        "rss_samples": rss_samples,
+        "store_samples": store_samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-growth soak benchmark")
+    parser.add_argument("--documents", type=int, default=10000, help="Documents to feed through one extractor")
+    parser.add_argument("--sample-every", type=int, default=100, help="Sample memory every N documents")
+    parser.add_argument("--max-slope-kb", type=float, default=256.0,
+                        help="Tolerated growth in KB per 1,000 documents")
+    parser.add_argument("--report", type=Path, default=Path("benchmark_output/soak.json"),
+                        help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    # Malformed inputs log an error each; keep the soak output readable
+    logging.getLogger("pdf_outline_extractor").setLevel(logging.CRITICAL)
+    fitz.TOOLS.mupdf_display_errors(False)
+
+    print("=== SOAK BENCHMARK ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = run_soak(Path(work_dir), args.documents, args.sample_every, max_slope_kb=args.max_slope_kb)
+
+    print(f"Documents: {report['documents']} ({report['errors']} returned errors)")
+    print(f"Throughput: {report['docs_per_sec']:.1f} docs/second")
+    print(f"RSS: {report['rss_start_mb']:.1f}MB -> {report['rss_end_mb']:.1f}MB")
+    print(f"RSS slope: {report['rss_slope_kb_per_1k_docs']:.1f}KB per 1k docs")
+    if report["store_slope_kb_per_1k_docs"] is None:
+        print("MuPDF store slope: not exposed by this PyMuPDF build")
+    else:
+        print(f"MuPDF store slope: {report['store_slope_kb_per_1k_docs']:.1f}KB per 1k docs")
+
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if report["passed"]:
+        print(f"\n✅ No memory growth beyond {args.max_slope_kb:.0f}KB per 1k docs")
+    else:
+        print(f"\n❌ Memory grows beyond {args.max_slope_kb:.0f}KB per 1k docs")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Competing-consumer spool directory queue for PDF Outline Extractor
+Several extractor processes, on one or many hosts, pull PDFs from a shared
+maildir-style spool (tmp/ -> new/ -> processing/ -> done/ or failed/).
+Claims are atomic renames, so no message broker is needed; a job whose
+lease expires (its consumer died) is moved back to new/ for someone else.
+The number of leases a job has had travels in its file name, and a job
+whose consumers keep dying is moved to failed/ after max_leases of them.
+"""
+
+import logging
+import os
+import re
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIRS = ("tmp", "new", "processing", "done", "failed")
+OWNER_SEPARATOR = "~"
+# A job returned to new/ after an expired lease is renamed lease<N>~<name>
+_RETRIED = re.compile(r"^lease(\d+)~(.+)$")
+
+
+def default_consumer_id() -> str:
+    """host.pid, unique across the hosts sharing a spool."""
+    return f"{socket.gethostname()}.{os.getpid()}".replace(OWNER_SEPARATOR, "-")
+
+
+class SpoolJob:
+    """A claimed PDF: `name` is the original file name, `path` where it sits in processing/.
+
+    `leases` counts the times the job has been claimed, this claim included.
+    """
+
+    def __init__(self, name: str, path: Path, leases: int = 1):
+        self.name = name
+        self.path = path
+        self.leases = leases
+
+
+def _split_processing_name(entry_name: str) -> Optional[Tuple[str, int, str]]:
+    """(owner, leases, name) of a processing/ entry, or None if it is not one."""
+    owner, separator, rest = entry_name.partition(OWNER_SEPARATOR)
+    if not separator:
+        return None
+    leases, separator, name = rest.partition(OWNER_SEPARATOR)
+    if not separator or not leases.isdigit():
+        return owner, 1, rest
+    return owner, int(leases), name
+
+
+class SpoolQueue:
+    """Shared spool directory used as a work queue."""
+
+    def __init__(self, root: Path, lease_seconds: float = 300.0, consumer_id: Optional[str] = None,
+                 max_leases: int = 3):
+        self.root = Path(root)
+        self.lease_seconds = lease_seconds
+        self.max_leases = max_leases
+        self.consumer_id = consumer_id or default_consumer_id()
+        for name in SPOOL_DIRS:
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+
+    def dir(self, name: str) -> Path:
+        return self.root / name
+
+    def enqueue(self, pdf_path: Path) -> Path:
+        """Copy a PDF into the spool; it only appears in new/ once fully written."""
+        pdf_path = Path(pdf_path)
+        temp_path = self.dir("tmp") / f"{pdf_path.name}.{self.consumer_id}"
+        shutil.copyfile(pdf_path, temp_path)
+        target = self.dir("new") / pdf_path.name
+        os.replace(temp_path, target)
+        return target
+
+    def claim(self) -> Optional[SpoolJob]:
+        """Atomically take one job from new/, or None when it is empty."""
+        with os.scandir(self.dir("new")) as entries:
+            for entry in entries:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                retried = _RETRIED.match(entry.name)
+                leases, name = (int(retried.group(1)) + 1, retried.group(2)) if retried else (1, entry.name)
+                claimed = self.dir("processing") / OWNER_SEPARATOR.join((self.consumer_id, str(leases), name))
+                try:
+                    # Start the lease before the rename: a claimed job never carries a stale mtime
+                    os.utime(entry.path)
+                    os.rename(entry.path, claimed)
+                except FileNotFoundError:
+                    continue  # another consumer won the race
+                return SpoolJob(name, claimed, leases)
+        return None
+
+    def renew(self, job: SpoolJob) -> bool:
+        """Extend the lease on a job; False once it has been reclaimed by someone else."""
+        try:
+            os.utime(job.path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def finish(self, job: SpoolJob, failed: bool = False) -> bool:
+        """Move a job to done/ or failed/; False when the lease was lost in the meantime."""
+        target = self.dir("failed" if failed else "done") / job.name
+        try:
+            os.replace(job.path, target)
+            return True
+        except FileNotFoundError:
+            logger.warning(f"Lease on {job.name} expired before it finished; another consumer owns it now")
+            return False
+
+    def reclaim_expired(self) -> int:
+        """Return jobs whose lease has expired to new/; returns how many were moved.
+
+        A job that has already used max_leases leases most likely kills the
+        consumers that take it, so it goes to failed/ instead.
+        """
+        reclaimed = 0
+        cutoff = time.time() - self.lease_seconds
+        with os.scandir(self.dir("processing")) as entries:
+            for entry in entries:
+                parsed = _split_processing_name(entry.name)
+                if parsed is None:
+                    continue
+                owner, leases, name = parsed
+                exhausted = leases >= self.max_leases
+                target = self.dir("failed") / name if exhausted else self.dir("new") / f"lease{leases}~{name}"
+                try:
+                    if entry.stat().st_mtime >= cutoff:
+                        continue
+                    os.rename(entry.path, target)
+                except FileNotFoundError:
+                    continue  # finished, renewed away or reclaimed concurrently
+                if exhausted:
+                    logger.error(f"Gave up on {name}: {leases} leases expired without a result")
+                else:
+                    logger.warning(f"Reclaimed {name} from {owner} after lease expiry ({leases} of {self.max_leases})")
+                    reclaimed += 1
+        return reclaimed
+
+
+class _LeaseKeeper:
+    """Renews a job's lease in the background while it is being processed."""
+
+    def __init__(self, queue: SpoolQueue, job: SpoolJob):
+        self.queue = queue
+        self.job = job
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        interval = max(self.queue.lease_seconds / 3, 0.1)
+        while not self._stop.wait(interval):
+            if not self.queue.renew(self.job):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def consume(extractor, queue: SpoolQueue, poll_interval: float = 1.0, exit_when_empty: bool = False,
+            reclaim_interval: Optional[float] = None) -> int:
+    """Process spool jobs with `extractor` until stopped; returns how many this consumer finished.
+
+    Results go through extractor.handle_result under the job's original file
+    name, so the sink, heading index, output layout and journal options apply
+    as in a batch run; a job the journal already has as finished is not parsed
+    again.
+    Expired leases are reclaimed every `reclaim_interval` seconds (default
+    half the lease) even while new/ never runs dry, and whenever it is empty.
+    SIGTERM (via extractor.request_stop) lets the current job finish first.
+    """
+    import signal
+
+    extractor.stop_requested = False
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGTERM, extractor.request_stop)
+
+    reclaim_interval = queue.lease_seconds / 2 if reclaim_interval is None else reclaim_interval
+    next_reclaim = time.monotonic()
+    finished = 0
+    journal = extractor.open_sinks()
+    try:
+        while not extractor.stop_requested:
+            if time.monotonic() >= next_reclaim:
+                queue.reclaim_expired()
+                next_reclaim = time.monotonic() + reclaim_interval
+            job = queue.claim()
+            if job is None:
+                if queue.reclaim_expired():
+                    continue
+                if exit_when_empty:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            # Key and name results after the original file, not the owner-tagged processing/ entry
+            pdf_path = job.path.with_name(job.name)
+            key = extractor.input_key(pdf_path)
+            if journal and journal.is_complete(key, job.path):
+                logger.info(f"{job.name} is already in the journal; not processing it again")
+                failed = journal.entries[key]["status"] == "failed"
+            else:
+                with _LeaseKeeper(queue, job):
+                    result = extractor.process_pdf(job.path)
+                extractor.handle_result(pdf_path, result, journal, source_path=job.path)
+                failed = "error" in result
+            if queue.finish(job, failed=failed):
+                finished += 1
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+        extractor.close_sinks(journal)
+
+    logger.info(f"Spool consumer {queue.consumer_id} finished {finished} documents")
+    return finished
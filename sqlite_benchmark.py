@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+SQLite sink ingestion benchmark for PDF Outline Extractor
+Streams synthetic outlines into the SQLite sink and compares insert
+throughput at the start and at the end of the run; a database whose
+per-document cost grows with its size fails the check.
+"""
+
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from sqlite_sink import SQLiteSink
+
+CSV_FIELDS = ["documents_stored", "docs_per_sec"]
+
+
+def synthetic_result(index: int, headings: int = 12) -> Dict:
+    return {
+        "document_title": f"Synthetic Document {index}",
+        "total_pages": 10,
+        "outline": [{"text": f"{n}. Section Heading {index}-{n}", "level": ("h1", "h2", "h3")[n % 3], "page": 1 + n % 10}
+                    for n in range(headings)],
+        "timings": {"open_s": 0.001, "analyze_s": 0.02, "classify_s": 0.003, "total_s": 0.024},
+    }
+
+
+def run_sqlite_benchmark(db_path: Path, documents: int = 100000, segments: int = 10,
+                         batch_size: int = 500) -> List[Dict]:
+    """Insert `documents` results; one throughput row per segment of the run."""
+    sink = SQLiteSink(db_path, batch_size=batch_size)
+    per_segment = max(1, documents // segments)
+    rows = []
+    try:
+        for segment in range(segments):
+            start = time.perf_counter()
+            for index in range(segment * per_segment, (segment + 1) * per_segment):
+                sink.add(f"corpus/doc_{index:07d}.pdf", synthetic_result(index))
+            sink.flush()
+            elapsed = time.perf_counter() - start
+            rows.append({"documents_stored": (segment + 1) * per_segment, "docs_per_sec": per_segment / elapsed})
+            print(f"  {rows[-1]['documents_stored']:>9} docs  {rows[-1]['docs_per_sec']:>9.0f} docs/s")
+    finally:
+        sink.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite sink ingestion benchmark")
+    parser.add_argument("--documents", type=int, default=100000, help="Documents to ingest")
+    parser.add_argument("--segments", type=int, default=10, help="Throughput samples across the run")
+    parser.add_argument("--max-slowdown", type=float, default=1.5,
+                        help="Fail when the first segment is this many times faster than the last")
+    parser.add_argument("--csv", type=Path, default=Path("benchmark_output/sqlite_ingest.csv"),
+                        help="Where to write the CSV results")
+    args = parser.parse_args()
+
+    print("=== SQLITE SINK BENCHMARK ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        rows = run_sqlite_benchmark(Path(work_dir) / "outlines.sqlite", args.documents, args.segments)
+
+    args.csv.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\n📊 CSV written to: {args.csv}")
+
+    slowdown = rows[0]["docs_per_sec"] / rows[-1]["docs_per_sec"]
+    if slowdown > args.max_slowdown:
+        print(f"❌ Ingestion slowed down {slowdown:.2f}x as the database grew (limit {args.max_slowdown}x)")
+        sys.exit(1)
+    print(f"✅ Ingestion rate held steady ({slowdown:.2f}x first/last segment)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+SQLite result sink for PDF Outline Extractor
+Stores every document and its headings in one WAL-mode database for
+corpus-scale queries. Results are buffered and written in batched
+transactions; every lookup a write needs goes through an index, so the
+cost per document stays flat as the database grows.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    input TEXT NOT NULL UNIQUE,
+    title TEXT,
+    total_pages INTEGER,
+    partial INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    open_s REAL,
+    analyze_s REAL,
+    classify_s REAL,
+    total_s REAL,
+    processed_at REAL
+);
+CREATE TABLE IF NOT EXISTS headings (
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    position INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS headings_document_page ON headings(document_id, page);
+CREATE INDEX IF NOT EXISTS headings_page ON headings(page);
+"""
+
+
+class SQLiteSink:
+    """Buffered writer of results into an SQLite database."""
+
+    def __init__(self, path: Path, batch_size: int = 500):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.documents = 0
+        self._pending: List[Tuple[str, Dict]] = []
+        # Shared by the async pipeline's writer threads
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: commits survive process crashes; only an OS crash can lose the last batches
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Keep the hot index pages cached (64 MB) so inserts don't go back to disk as tables grow
+            self._conn.execute("PRAGMA cache_size=-65536")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def add(self, input_key: str, result: Dict):
+        """Queue one result; a full batch is committed in a single transaction."""
+        with self._lock:
+            self._pending.append((input_key, result))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            for input_key, result in self._pending:
+                self._store(conn, input_key, result)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.documents += len(self._pending)
+        self._pending = []
+
+    def _store(self, conn: sqlite3.Connection, input_key: str, result: Dict):
+        # A re-processed document replaces its previous rows
+        row = conn.execute("SELECT id FROM documents WHERE input = ?", (input_key,)).fetchone()
+        if row is not None:
+            conn.execute("DELETE FROM headings WHERE document_id = ?", row)
+            conn.execute("DELETE FROM documents WHERE id = ?", row)
+
+        timings = result.get("timings", {})
+        cursor = conn.execute(
+            "INSERT INTO documents (input, title, total_pages, partial, error, open_s, analyze_s, classify_s, "
+            "total_s, processed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (input_key, result.get("document_title"), result.get("total_pages"), int(bool(result.get("partial"))),
+             result.get("error"), timings.get("open_s"), timings.get("analyze_s"), timings.get("classify_s"),
+             timings.get("total_s"), time.time()))
+        conn.executemany(
+            "INSERT INTO headings (document_id, position, level, page, text) VALUES (?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, position, heading["level"], heading["page"], heading["text"])
+             for position, heading in enumerate(result.get("outline", []))])
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
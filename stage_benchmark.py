@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Per-stage microbenchmarks for PDF Outline Extractor
+Times the pure-Python heuristics (identify_title, establish_heading_hierarchy,
+is_likely_heading, extract_headings) on a saved span dump, so their cost can
+be tracked separately from MuPDF parsing.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import fitz  # PyMuPDF
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+DEFAULT_SPAN_COUNTS = [1_000, 10_000, 100_000, 1_000_000]
+STAGES = ["identify_title", "establish_heading_hierarchy", "is_likely_heading", "extract_headings"]
+
+
+def dump_spans(pdf_path: Path, dump_path: Path, extractor: PDFOutlineExtractor = None) -> int:
+    """Save the spans collected by analyze_font_characteristics as JSON; return the span count."""
+    extractor = extractor or PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=dump_path.parent)
+    doc = fitz.open(str(pdf_path))
+    try:
+        analysis = extractor.analyze_font_characteristics(doc)
+    finally:
+        doc.close()
+
+    dump_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(dump_path, 'w', encoding='utf-8') as f:
+        json.dump({"source": pdf_path.name, "text_blocks": analysis["text_blocks"]}, f, ensure_ascii=False)
+    return len(analysis["text_blocks"])
+
+
+def build_analysis(text_blocks: List[Dict]) -> Dict:
+    """Rebuild the analysis dict (font_stats + text_blocks) the heuristics expect."""
+    font_stats = defaultdict(list)
+    for block in text_blocks:
+        font_stats[block["size"]].append(block)
+    return {"font_stats": font_stats, "text_blocks": text_blocks}
+
+
+def load_spans(dump_path: Path, span_count: int = None) -> Dict:
+    """Load a span dump, tiling it across further pages until it holds span_count spans."""
+    with open(dump_path, encoding='utf-8') as f:
+        source_blocks = json.load(f)["text_blocks"]
+
+    if not source_blocks:
+        raise ValueError(f"Span dump {dump_path} contains no spans")
+    if span_count is None:
+        return build_analysis(source_blocks)
+
+    pages_per_copy = max(block["page"] for block in source_blocks)
+    text_blocks = []
+    copy_index = 0
+    while len(text_blocks) < span_count:
+        page_offset = copy_index * pages_per_copy
+        for block in source_blocks:
+            if len(text_blocks) == span_count:
+                break
+            tiled = dict(block)
+            tiled["page"] = block["page"] + page_offset
+            text_blocks.append(tiled)
+        copy_index += 1
+
+    return build_analysis(text_blocks)
+
+
+def time_stage(func: Callable[[], object], repeats: int) -> float:
+    """Best-of-repeats wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def run_stage_benchmark(dump_path: Path, span_counts: List[int], repeats: int = 3) -> List[Dict]:
+    """Time each heuristic stage in isolation at each span count."""
+    extractor = PDFOutlineExtractor(input_dir=dump_path.parent, output_dir=dump_path.parent)
+    rows = []
+
+    for span_count in span_counts:
+        analysis = load_spans(dump_path, span_count)
+        hierarchy = extractor.establish_heading_hierarchy(analysis)
+        texts = [block["text"] for block in analysis["text_blocks"]]
+        stage_repeats = repeats if span_count < 1_000_000 else 1
+
+        stages = {
+            "identify_title": lambda: extractor.identify_title(analysis),
+            "establish_heading_hierarchy": lambda: extractor.establish_heading_hierarchy(analysis),
+            "is_likely_heading": lambda: [extractor.is_likely_heading(text) for text in texts],
+            "extract_headings": lambda: extractor.extract_headings(analysis, hierarchy),
+        }
+
+        for stage in STAGES:
+            seconds = time_stage(stages[stage], stage_repeats)
+            rows.append({
+                "stage": stage,
+                "spans": span_count,
+                "seconds": seconds,
+                "us_per_span": seconds / span_count * 1e6,
+            })
+            print(f"  {stage:<28} {span_count:>9} spans  {seconds:9.4f}s  {seconds / span_count * 1e6:7.2f}us/span")
+
+        del analysis, texts
+
+    return rows
+
+
+def write_csv(rows: List[Dict], csv_path: Path):
+    """Write the per-stage timings as CSV."""
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["stage", "spans", "seconds", "us_per_span"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage heuristic microbenchmarks")
+    parser.add_argument("--dump", type=Path, help="Existing span dump (JSON) to benchmark")
+    parser.add_argument("--from-pdf", type=Path, help="Create the span dump from this PDF first")
+    parser.add_argument("--spans", type=int, nargs="+", default=DEFAULT_SPAN_COUNTS, help="Span counts to time")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats per stage (best is reported)")
+    parser.add_argument("--csv", type=Path, default=Path("benchmark_output/stages.csv"),
+                        help="Where to write the CSV results")
+    args = parser.parse_args()
+
+    logging.getLogger("pdf_outline_extractor").setLevel(logging.WARNING)
+
+    print("=== STAGE MICROBENCHMARKS ===\n")
+    with tempfile.TemporaryDirectory() as work_dir:
+        dump_path = args.dump
+        if dump_path is None or args.from_pdf:
+            pdf_path = args.from_pdf or create_synthetic_pdf(Path(work_dir) / "stages.pdf", pages=10)
+            dump_path = dump_path or Path(work_dir) / "spans.json"
+            span_total = dump_spans(pdf_path, dump_path)
+            print(f"📄 Dumped {span_total} spans from {pdf_path.name}\n")
+
+        rows = run_stage_benchmark(dump_path, sorted(args.spans), args.repeats)
+
+    write_csv(rows, args.csv)
+    print(f"\n📊 CSV written to: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
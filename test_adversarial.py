@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Complexity guardrails for PDF Outline Extractor
+Runs the adversarial corpus with upper bounds on time and memory per page,
+and checks that no heuristic stage grows super-linearly in spans or in
+distinct font sizes.
+"""
+
+import gc
+import logging
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from adversarial_corpus import ADVERSARIAL_CASES, tiny_spans_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from stage_benchmark import build_analysis, time_stage
+
+# Upper bounds per processed page (generous enough for slow CI machines)
+MAX_SECONDS_PER_PAGE = 5.0
+MAX_PYTHON_MB_PER_PAGE = 150.0
+
+# Quadrupling the input of a linear stage should cost ~4x; quadratic would be ~16x
+SCALE_FACTOR = 4
+MAX_GROWTH_RATIO = SCALE_FACTOR * 2
+
+# Each timing sample loops a stage until it lasts this long, so fast stages are measured, not timer noise
+MIN_SAMPLE_SECONDS = 0.05
+
+logging.getLogger("pdf_outline_extractor").setLevel(logging.CRITICAL)
+
+
+def make_blocks(span_count: int, distinct_sizes: int, pages: int = 20):
+    """Synthetic spans cycling through `distinct_sizes` font sizes and heavily duplicated strings."""
+    blocks = []
+    for index in range(span_count):
+        size = 8.0 + (index % distinct_sizes) * 0.1
+        bold = index % 5 == 0
+        blocks.append({
+            "text": f"{index % 9 + 1}. Repeated Heading Text" if bold else "Body text that repeats often.",
+            "page": index * pages // span_count + 1,
+            "size": size,
+            "flags": 16 if bold else 0,
+            "font": "Helvetica-Bold" if bold else "Helvetica",
+            "bbox": (50.0, float(index % 700), 300.0, float(index % 700) + size),
+            "is_bold": bold,
+            "is_italic": False,
+        })
+    return blocks
+
+
+def time_per_call(func, repeats: int = 5) -> float:
+    """Best-of-repeats seconds per call, each sample running func enough times to last MIN_SAMPLE_SECONDS."""
+    calls = 1
+    while True:
+        elapsed = time_stage(lambda: [func() for _ in range(calls)], 1)
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            break
+        calls *= 2 if elapsed * 4 >= MIN_SAMPLE_SECONDS else 4
+    return time_stage(lambda: [func() for _ in range(calls)], repeats) / calls
+
+
+def stage_timings(extractor: PDFOutlineExtractor, analysis, repeats: int = 5):
+    """Best-of-repeats seconds per call of each heuristic stage on one analysis, with GC paused."""
+    hierarchy = extractor.establish_heading_hierarchy(analysis)
+    texts = [block["text"] for block in analysis["text_blocks"]]
+    gc.disable()
+    try:
+        return {
+            "identify_title": time_per_call(lambda: extractor.identify_title(analysis), repeats),
+            "establish_heading_hierarchy": time_per_call(lambda: extractor.establish_heading_hierarchy(analysis), repeats),
+            "is_likely_heading": time_per_call(lambda: [extractor.is_likely_heading(text) for text in texts], repeats),
+            "extract_headings": time_per_call(lambda: extractor.extract_headings(analysis, hierarchy), repeats),
+        }
+    finally:
+        gc.enable()
+
+
+def assert_linear(small, large, what):
+    for stage, small_seconds in small.items():
+        ratio = large[stage] / small_seconds
+        print(f"  {stage:<28} x{ratio:5.2f} when {what} grows x{SCALE_FACTOR}")
+        assert ratio < MAX_GROWTH_RATIO, f"{stage} is super-linear in {what} (x{ratio:.1f})"
+
+
+def test_adversarial_corpus_bounds():
+    """Every adversarial document stays under the per-page time and memory bounds."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output")
+
+        for name, build in ADVERSARIAL_CASES.items():
+            pdf_path = build(work_dir / f"{name}.pdf")
+
+            start_time = time.perf_counter()
+            result = extractor.process_pdf(pdf_path)
+            elapsed = time.perf_counter() - start_time
+
+            # Separate pass: tracemalloc slows allocation-heavy code several-fold
+            tracemalloc.start()
+            extractor.process_pdf(pdf_path)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+
+            pages = max(result["total_pages"], 1)
+            print(f"{name}: {elapsed / pages:.2f}s/page, {peak_mb / pages:.1f}MB/page")
+            assert "error" not in result, f"{name}: {result.get('error')}"
+            assert elapsed / pages < MAX_SECONDS_PER_PAGE, f"{name} took {elapsed / pages:.1f}s per page"
+            assert peak_mb / pages < MAX_PYTHON_MB_PER_PAGE, f"{name} allocated {peak_mb / pages:.0f}MB per page"
+
+
+def test_end_to_end_linear_in_spans():
+    """Parsing plus heuristics scales linearly with spans per page."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output")
+        small = tiny_spans_pdf(work_dir / "small.pdf", spans_per_page=4_000)
+        large = tiny_spans_pdf(work_dir / "large.pdf", spans_per_page=4_000 * SCALE_FACTOR)
+
+        small_seconds = time_per_call(lambda: extractor.process_pdf(small), 3)
+        large_seconds = time_per_call(lambda: extractor.process_pdf(large), 3)
+
+    assert_linear({"process_pdf": small_seconds}, {"process_pdf": large_seconds}, "spans")
+
+
+def test_stages_linear_in_spans():
+    """No heuristic stage is super-linear in the number of spans."""
+    extractor = PDFOutlineExtractor(input_dir=".", output_dir=tempfile.gettempdir())
+    small = stage_timings(extractor, build_analysis(make_blocks(10_000, 50)))
+    large = stage_timings(extractor, build_analysis(make_blocks(10_000 * SCALE_FACTOR, 50)))
+    assert_linear(small, large, "spans")
+
+
+def test_stages_linear_in_distinct_sizes():
+    """No heuristic stage is super-linear in the number of distinct font sizes."""
+    extractor = PDFOutlineExtractor(input_dir=".", output_dir=tempfile.gettempdir())
+    small = stage_timings(extractor, build_analysis(make_blocks(20_000, 100)))
+    large = stage_timings(extractor, build_analysis(make_blocks(20_000, 100 * SCALE_FACTOR)))
+    assert_linear(small, large, "distinct sizes")
+
+
+if __name__ == "__main__":
+    test_adversarial_corpus_bounds()
+    test_end_to_end_linear_in_spans()
+    test_stages_linear_in_spans()
+    test_stages_linear_in_distinct_sizes()
+    print("Adversarial guardrails passed")
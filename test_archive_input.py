@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for processing PDFs straight out of archives
+"""
+
+import faulthandler
+import json
+import os
+import signal
+import sqlite3
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+from archive_input import iter_archive_pdfs, member_output_name
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+class CrashingExtractor(PDFOutlineExtractor):
+    """Segfaults on members named crash*.pdf, like MuPDF does on some broken inputs."""
+
+    def process_pdf(self, pdf_path, data=None):
+        if pdf_path.name.startswith("crash"):
+            faulthandler.disable()  # keep pytest's fault handler from dumping the child's stack
+            os.kill(os.getpid(), signal.SIGSEGV)
+        return super().process_pdf(pdf_path, data)
+
+
+def make_pdfs(directory: Path):
+    return [create_synthetic_pdf(directory / f"doc{index}.pdf", pages=2, seed=index) for index in range(2)]
+
+
+def test_member_output_names_stay_inside_output_dir():
+    assert member_output_name(Path("bundle.zip"), "docs/a.pdf") == "bundle.zip/docs/a.json"
+    assert member_output_name(Path("bundle.tar.gz"), "/abs/../b.PDF") == "bundle.tar.gz/b.json"
+    assert member_output_name(Path("bundle.tgz"), "../../escape.pdf") == "bundle.tgz/escape.json"
+
+
+def test_zip_and_tar_members_are_processed_without_extraction():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        input_dir.mkdir()
+        pdf_files = make_pdfs(work_dir / "sources")
+
+        with zipfile.ZipFile(input_dir / "bundle.zip", "w") as archive:
+            archive.write(pdf_files[0], "reports/doc0.pdf")
+            archive.write(pdf_files[1], "doc1.pdf")
+            archive.writestr("notes.txt", "not a pdf")
+        with tarfile.open(input_dir / "more.tar.gz", "w:gz") as archive:
+            archive.add(pdf_files[0], "nested/deeper/doc0.pdf")
+        # Same stem and member name as the zip: must not overwrite its output
+        with tarfile.open(input_dir / "bundle.tar.gz", "w:gz") as archive:
+            archive.add(pdf_files[1], "doc1.pdf")
+        assert [name for name, _ in iter_archive_pdfs(input_dir / "bundle.zip")] == ["reports/doc0.pdf", "doc1.pdf"]
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, archives=True).run()
+
+        outputs = sorted(path.relative_to(output_dir).as_posix() for path in output_dir.rglob("*.json"))
+        assert outputs == ["bundle.tar.gz/doc1.json", "bundle.zip/doc1.json", "bundle.zip/reports/doc0.json",
+                           "more.tar.gz/nested/deeper/doc0.json"]
+        direct = PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "direct").process_pdf(pdf_files[0])
+        assert json.loads((output_dir / "bundle.zip/reports/doc0.json").read_text()) == direct
+        assert not list(input_dir.rglob("*.pdf"))
+
+
+def test_corrupt_archive_does_not_stop_the_batch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        make_pdfs(input_dir)
+        (input_dir / "broken.zip").write_bytes(b"PK\x03\x04 truncated")
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, archives=True).run()
+        assert sorted(path.name for path in output_dir.glob("*.json")) == ["doc0.json", "doc1.json"]
+
+
+def test_archive_members_reach_the_sqlite_sink():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        input_dir.mkdir()
+        pdf_files = make_pdfs(work_dir / "sources")
+        with zipfile.ZipFile(input_dir / "bundle.zip", "w") as archive:
+            archive.write(pdf_files[0], "reports/doc0.pdf")
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, archives=True, sink="sqlite").run()
+        assert not list(output_dir.rglob("*.json"))
+        db = sqlite3.connect(output_dir / "outlines.sqlite")
+        assert [row[0] for row in db.execute("SELECT input FROM documents")] == ["bundle.zip/reports/doc0.pdf"]
+        db.close()
+
+
+def test_crashing_member_fails_alone_in_isolated_workers():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        input_dir.mkdir()
+        pdf_files = make_pdfs(work_dir / "sources")
+        with zipfile.ZipFile(input_dir / "bundle.zip", "w") as archive:
+            archive.write(pdf_files[0], "doc0.pdf")
+            archive.write(pdf_files[1], "crash.pdf")
+            archive.write(pdf_files[1], "doc1.pdf")
+
+        extractor = CrashingExtractor(input_dir=input_dir, output_dir=output_dir, archives=True, isolate=True)
+        extractor.run()
+
+        outputs = {path.name: json.loads(path.read_text()) for path in (output_dir / "bundle.zip").glob("*.json")}
+        assert sorted(outputs) == ["crash.json", "doc0.json", "doc1.json"]
+        assert "SIGSEGV" in outputs["crash.json"]["error"]
+        assert "error" not in outputs["doc0.json"] and "error" not in outputs["doc1.json"]
+        assert [pdf_path.name for pdf_path, _ in extractor.failures] == ["crash.pdf"]
+
+
+if __name__ == "__main__":
+    test_member_output_names_stay_inside_output_dir()
+    test_zip_and_tar_members_are_processed_without_extraction()
+    test_corrupt_archive_does_not_stop_the_batch()
+    test_archive_members_reach_the_sqlite_sink()
+    test_crashing_member_fails_alone_in_isolated_workers()
+    print("Archive input tests passed")
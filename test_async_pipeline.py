@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio batch pipeline
+"""
+
+import asyncio
+import faulthandler
+import json
+import os
+import signal
+import tempfile
+import threading
+from pathlib import Path
+
+from async_pipeline import extract, run_pipeline
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+class CrashingExtractor(PDFOutlineExtractor):
+    """Segfaults on files named crash*.pdf, like MuPDF does on some broken inputs."""
+
+    def process_pdf(self, pdf_path, data=None):
+        if pdf_path.name.startswith("crash"):
+            faulthandler.disable()  # keep pytest's fault handler from dumping the child's stack
+            os.kill(os.getpid(), signal.SIGSEGV)
+        return super().process_pdf(pdf_path, data)
+
+
+def test_extract_accepts_path_or_bytes():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = create_synthetic_pdf(Path(work_dir) / "doc.pdf", pages=3)
+        from_path = asyncio.run(extract(pdf_path))
+        from_bytes = asyncio.run(extract(pdf_path.read_bytes(), name="doc.pdf"))
+        assert from_path == from_bytes
+        assert from_path["total_pages"] == 3 and from_path["outline"]
+
+        broken = asyncio.run(extract(b"not a pdf"))
+        assert "error" in broken
+
+
+def test_async_run_matches_batch_run():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir = work_dir / "input"
+        for index in range(6):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=1 + index % 3, seed=index)
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "batch").run()
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "async", pipeline="async", queue_depth=2).run()
+
+        for batch_output in (work_dir / "batch").glob("*.json"):
+            async_output = work_dir / "async" / batch_output.name
+            assert json.loads(async_output.read_text()) == json.loads(batch_output.read_text())
+        assert len(list((work_dir / "async").glob("*.json"))) == 6
+
+
+def test_pipeline_stops_reading_after_stop_request():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = [create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1, seed=index) for index in range(12)]
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output")
+        written = []
+
+        def on_result(pdf_path, result):
+            written.append(pdf_path)
+            extractor.request_stop()
+
+        stats = asyncio.run(run_pipeline(extractor, pdf_files, on_result, queue_depth=1))
+        assert stats["documents"] == len(written) < len(pdf_files)
+
+
+def test_discovery_runs_off_the_event_loop():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = [create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1, seed=index) for index in range(3)]
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output")
+        listing_threads = set()
+
+        def slow_listing():
+            for pdf_path in pdf_files:
+                listing_threads.add(threading.current_thread())
+                yield pdf_path
+
+        stats = asyncio.run(run_pipeline(extractor, slow_listing()))
+        assert stats["documents"] == 3
+        assert threading.main_thread() not in listing_threads
+
+
+def test_worker_crash_fails_only_its_document():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        for index in range(4):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=1, seed=index)
+        (input_dir / "doc1.pdf").rename(input_dir / "crash.pdf")
+
+        extractor = CrashingExtractor(input_dir=input_dir, output_dir=output_dir, pipeline="async", workers=2)
+        extractor.run()
+
+        outputs = {path.name: json.loads(path.read_text()) for path in output_dir.glob("*.json")}
+        assert sorted(outputs) == ["crash.json", "doc0.json", "doc2.json", "doc3.json"]
+        assert "error" in outputs["crash.json"]
+        assert all("error" not in outputs[name] for name in ("doc0.json", "doc2.json", "doc3.json"))
+        assert [pdf_path.name for pdf_path, _ in extractor.failures] == ["crash.pdf"]
+
+
+if __name__ == "__main__":
+    test_extract_accepts_path_or_bytes()
+    test_async_run_matches_batch_run()
+    test_pipeline_stops_reading_after_stop_request()
+    test_discovery_runs_off_the_event_loop()
+    test_worker_crash_fails_only_its_document()
+    print("Async pipeline tests passed")
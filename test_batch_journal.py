@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the crash-safe batch journal
+Covers resume after an interrupted run, content-hash invalidation,
+truncated journal lines, atomic output writes and SIGTERM draining.
+"""
+
+import json
+import os
+import signal
+import tempfile
+from pathlib import Path
+
+import batch_journal
+from batch_journal import BatchJournal, STATUS_DONE, file_digest
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+class CountingExtractor(PDFOutlineExtractor):
+    """Records which documents were actually parsed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.processed = []
+
+    def process_pdf(self, pdf_path):
+        self.processed.append(pdf_path.name)
+        return super().process_pdf(pdf_path)
+
+
+class SigtermExtractor(CountingExtractor):
+    """Sends itself SIGTERM while processing the second document."""
+
+    def process_pdf(self, pdf_path):
+        if len(self.processed) == 1:
+            os.kill(os.getpid(), signal.SIGTERM)
+        return super().process_pdf(pdf_path)
+
+
+def make_inputs(input_dir: Path, count: int):
+    return [create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=1, seed=index) for index in range(count)]
+
+
+def test_restart_resumes_from_journal():
+    """A second run with the same journal only processes new or changed documents."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir, journal = work_dir / "input", work_dir / "output", work_dir / "journal.jsonl"
+        make_inputs(input_dir, 3)
+
+        first = CountingExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal)
+        first.run()
+        assert sorted(first.processed) == ["doc0.pdf", "doc1.pdf", "doc2.pdf"]
+
+        create_synthetic_pdf(input_dir / "doc3.pdf", pages=1, seed=3)
+        create_synthetic_pdf(input_dir / "doc1.pdf", pages=2, seed=99)  # content changed
+
+        second = CountingExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal)
+        second.run()
+        assert sorted(second.processed) == ["doc1.pdf", "doc3.pdf"]
+
+        entries = [json.loads(line) for line in journal.read_text().splitlines()]
+        assert len(entries) == 5
+        assert entries[-1]["sha256"] == file_digest(input_dir / entries[-1]["input"])
+        assert not list(output_dir.glob(".*.tmp"))
+
+
+def test_truncated_journal_line_is_ignored():
+    """A record cut short by a crash is skipped and later appends start on a new line."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = create_synthetic_pdf(work_dir / "doc.pdf", pages=1)
+        journal_path = work_dir / "journal.jsonl"
+
+        with BatchJournal(journal_path) as journal:
+            journal.record("doc.pdf", pdf_path, STATUS_DONE, output="doc.json")
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"input": "other.pdf", "sta')
+
+        with BatchJournal(journal_path) as journal:
+            assert journal.is_complete("doc.pdf", pdf_path)
+            assert "other.pdf" not in journal.entries
+            journal.record("again.pdf", pdf_path, STATUS_DONE)
+
+        assert json.loads(journal_path.read_text().splitlines()[-1])["input"] == "again.pdf"
+
+
+def test_sigterm_drains_and_resumes():
+    """SIGTERM finishes the in-flight document, stops the batch, and a rerun picks up the rest."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir, journal = work_dir / "input", work_dir / "output", work_dir / "journal.jsonl"
+        make_inputs(input_dir, 4)
+
+        interrupted = SigtermExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal)
+        interrupted.run()
+        assert interrupted.stop_requested
+        assert len(interrupted.processed) == 2
+        assert len(journal.read_text().splitlines()) == 2
+        assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+        resumed = CountingExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal)
+        resumed.run()
+        assert sorted(interrupted.processed + resumed.processed) == [f"doc{index}.pdf" for index in range(4)]
+        assert len(list(output_dir.glob("*.json"))) == 4
+
+
+def test_each_input_is_hashed_once_and_deleted_outputs_are_redone():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir, journal = work_dir / "input", work_dir / "output", work_dir / "journal.jsonl"
+        make_inputs(input_dir, 3)
+
+        hashed = []
+        original_digest = batch_journal.file_digest
+        batch_journal.file_digest = lambda path: hashed.append(path.name) or original_digest(path)
+        try:
+            # The feature cache needs the digest too; it is taken once and shared
+            CountingExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal,
+                              feature_cache=work_dir / "features").run()
+        finally:
+            batch_journal.file_digest = original_digest
+        assert sorted(hashed) == ["doc0.pdf", "doc1.pdf", "doc2.pdf"]
+        assert json.loads(journal.read_text().splitlines()[0])["output"].endswith(".json")
+
+        # The journal alone is not proof of a result: a deleted output is produced again
+        (output_dir / "doc1.json").unlink()
+        rerun = CountingExtractor(input_dir=input_dir, output_dir=output_dir, journal=journal)
+        rerun.run()
+        assert rerun.processed == ["doc1.pdf"]
+        assert (output_dir / "doc1.json").exists()
+
+
+if __name__ == "__main__":
+    test_restart_resumes_from_journal()
+    test_truncated_journal_line_is_ignored()
+    test_sigterm_drains_and_resumes()
+    test_each_input_is_hashed_once_and_deleted_outputs_are_redone()
+    print("Batch journal tests passed")
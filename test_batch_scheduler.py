@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for batch scheduling policies
+"""
+
+import tempfile
+from pathlib import Path
+
+from batch_scheduler import TYPICAL_BYTES_PER_PAGE, estimate_cost, schedule
+from benchmark_support import create_synthetic_pdf
+from scheduling_benchmark import percentile
+
+
+def test_policies_order_by_cost():
+    """largest-first and shortest-first order by cost; FIFO keeps discovery order."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        medium = create_synthetic_pdf(work_dir / "medium.pdf", pages=5)
+        small = create_synthetic_pdf(work_dir / "small.pdf", pages=1)
+        large = create_synthetic_pdf(work_dir / "large.pdf", pages=20)
+        pdf_files = [medium, small, large]
+
+        for measure in ("size", "pages"):
+            assert schedule(pdf_files, "fifo", measure) == pdf_files
+            assert schedule(pdf_files, "largest-first", measure) == [large, medium, small]
+            assert schedule(pdf_files, "shortest-first", measure) == [small, medium, large]
+
+
+def test_page_cost_capped_at_max_pages():
+    """Pages beyond max_pages are never analyzed, so they add no cost."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = create_synthetic_pdf(Path(work_dir) / "long.pdf", pages=12)
+        assert estimate_cost(pdf_path, "pages") == 12
+        assert estimate_cost(pdf_path, "pages", max_pages=10) == 10
+
+
+def test_unreadable_file_gets_a_page_estimate():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = Path(work_dir) / "broken.pdf"
+        pdf_path.write_bytes(b"not a pdf at all")
+        assert estimate_cost(pdf_path, "pages") == 1
+
+        # Estimated from size, in pages, and capped like a probed count
+        pdf_path.write_bytes(b"x" * (TYPICAL_BYTES_PER_PAGE * 80))
+        assert estimate_cost(pdf_path, "pages") == 80
+        assert estimate_cost(pdf_path, "pages", max_pages=50) == 50
+
+
+def test_benchmark_percentile_is_nearest_rank():
+    values = list(range(1, 11))
+    # fraction * n odd or even integer: exactly that rank, never the next one up
+    assert percentile(values, 0.5) == 5
+    assert percentile(values, 0.3) == 3
+    assert percentile(values, 0.95) == 10
+    assert percentile([4, 1, 3, 2], 0.5) == 2
+    assert percentile([7], 0.99) == 7
+
+
+if __name__ == "__main__":
+    test_policies_order_by_cost()
+    test_page_cost_capped_at_max_pages()
+    test_unreadable_file_gets_a_page_estimate()
+    test_benchmark_percentile_is_nearest_rank()
+    print("Scheduler tests passed")
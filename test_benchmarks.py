@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the benchmark helpers
+Tiny runs of the corpus generator, the scaling benchmark and the stage
+microbenchmarks, so the scripts keep working as the extractor changes.
+"""
+
+import csv
+import logging
+import tempfile
+from pathlib import Path
+
+import fitz
+
+from benchmark_support import create_synthetic_pdf, generate_corpus
+from scaling_benchmark import run_scaling_benchmark, write_csv
+from stage_benchmark import STAGES, dump_spans, load_spans, run_stage_benchmark
+
+logging.getLogger("pdf_outline_extractor").setLevel(logging.WARNING)
+
+
+def page_counts(pdf_files):
+    counts = []
+    for pdf_path in pdf_files:
+        with fitz.open(str(pdf_path)) as doc:
+            counts.append(len(doc))
+    return counts
+
+
+def test_corpus_is_seeded_and_independent_of_earlier_runs():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        reference = generate_corpus(work_dir / "reference", 6, min_pages=1, max_pages=8)
+
+        # A stale file from an earlier, different run is replaced, not reused
+        stale = create_synthetic_pdf(work_dir / "rerun" / "doc_00000.pdf", pages=30, seed=99)
+        rerun = generate_corpus(work_dir / "rerun", 4, min_pages=1, max_pages=8)
+        assert rerun[0] == stale
+        assert page_counts(rerun) == page_counts(reference)[:4]
+        assert page_counts(generate_corpus(work_dir / "other", 6, min_pages=1, max_pages=8, seed=1)) != \
+            page_counts(reference)
+
+
+def test_scaling_benchmark_smoke():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        rows = run_scaling_benchmark(work_dir / "corpus", corpus_sizes=[3], worker_counts=[1])
+        assert len(rows) == 1
+        assert rows[0]["corpus_docs"] == 3 and rows[0]["docs_per_sec"] > 0
+        assert rows[0]["parallel_efficiency"] == 1.0
+
+        write_csv(rows, work_dir / "scaling.csv")
+        with open(work_dir / "scaling.csv", newline='', encoding='utf-8') as f:
+            assert [row["workers"] for row in csv.DictReader(f)] == ["1"]
+
+
+def test_stage_benchmark_smoke():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = create_synthetic_pdf(work_dir / "stages.pdf", pages=2)
+        dump_path = work_dir / "spans.json"
+        span_total = dump_spans(pdf_path, dump_path)
+        assert span_total > 0
+
+        # Tiling past the dump continues the page numbering
+        analysis = load_spans(dump_path, span_total * 2 + 1)
+        assert len(analysis["text_blocks"]) == span_total * 2 + 1
+        assert analysis["text_blocks"][-1]["page"] == 5
+        assert sum(len(blocks) for blocks in analysis["font_stats"].values()) == span_total * 2 + 1
+
+        rows = run_stage_benchmark(dump_path, [span_total], repeats=1)
+        assert [row["stage"] for row in rows] == STAGES
+        assert all(row["spans"] == span_total and row["seconds"] >= 0 for row in rows)
+
+
+if __name__ == "__main__":
+    test_corpus_is_seeded_and_independent_of_earlier_runs()
+    test_scaling_benchmark_smoke()
+    test_stage_benchmark_smoke()
+    print("Benchmark helper tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for de-duplication of byte-identical inputs
+"""
+
+import json
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from dedup import group_identical
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+class CountingExtractor(PDFOutlineExtractor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parsed = []
+
+    def process_pdf(self, pdf_path, data=None):
+        self.parsed.append(pdf_path.name)
+        return super().process_pdf(pdf_path, data)
+
+
+def test_group_identical_hashes_only_same_size_files():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        files = {"a": b"same bytes", "b": b"other byte", "c": b"same bytes", "d": b"short", "e": b"same bytes"}
+        for name, content in files.items():
+            (work_dir / name).write_bytes(content)
+        paths = [work_dir / name for name in files]
+
+        unique, copies = group_identical(paths)
+        assert [path.name for path in unique] == ["a", "b", "d"]
+        assert {path.name: [copy.name for copy in dups] for path, dups in copies.items()} == {"a": ["c", "e"]}
+
+
+def test_batch_parses_each_document_once_and_fans_out():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        create_synthetic_pdf(input_dir / "original.pdf", pages=3, seed=1)
+        create_synthetic_pdf(input_dir / "different.pdf", pages=3, seed=2)
+        shutil.copy(input_dir / "original.pdf", input_dir / "copy_one.pdf")
+        shutil.copy(input_dir / "original.pdf", input_dir / "copy_two.pdf")
+
+        extractor = CountingExtractor(input_dir=input_dir, output_dir=output_dir, dedup=True,
+                                      journal=work_dir / "journal.jsonl")
+        extractor.run()
+        # One of the three copies (the first discovered) and the distinct document
+        assert len(extractor.parsed) == 2 and "different.pdf" in extractor.parsed
+        assert extractor.duplicates_skipped == 2
+        assert extractor.duplicate_time_saved > 0
+
+        outputs = {path.name: json.loads(path.read_text()) for path in output_dir.glob("*.json")}
+        assert sorted(outputs) == ["copy_one.json", "copy_two.json", "different.json", "original.json"]
+        assert outputs["original.json"] == outputs["copy_one.json"] == outputs["copy_two.json"]
+        assert "timings" not in outputs["original.json"]
+        assert outputs["different.json"] != outputs["original.json"]
+
+        journaled = [json.loads(line)["input"] for line in (work_dir / "journal.jsonl").read_text().splitlines()]
+        assert sorted(journaled) == ["copy_one.pdf", "copy_two.pdf", "different.pdf", "original.pdf"]
+
+
+def test_sqlite_sink_gets_a_row_per_copy():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir = work_dir / "input"
+        create_synthetic_pdf(input_dir / "a.pdf", pages=2, seed=4)
+        shutil.copy(input_dir / "a.pdf", input_dir / "b.pdf")
+
+        extractor = CountingExtractor(input_dir=input_dir, output_dir=work_dir / "output", dedup=True,
+                                      sink="sqlite", workers=2)
+        extractor.run()
+        assert extractor.duplicates_skipped == 1
+
+        import sqlite3
+        db = sqlite3.connect(work_dir / "output" / "outlines.sqlite")
+        rows = db.execute("SELECT input, title, total_s FROM documents ORDER BY input").fetchall()
+        db.close()
+        assert [row[0] for row in rows] == ["a.pdf", "b.pdf"]
+        assert rows[0][1] == rows[1][1] and rows[0][2] is not None
+
+
+def test_no_output_path_writes_timings():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        create_synthetic_pdf(input_dir / "x.pdf", pages=2, seed=3)
+        with zipfile.ZipFile(input_dir / "bundle.zip", "w") as archive:
+            archive.write(input_dir / "x.pdf", "x.pdf")
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, dedup=True, archives=True).run()
+        outputs = list(output_dir.rglob("*.json"))
+        assert len(outputs) == 2
+        assert all("timings" not in json.loads(path.read_text()) for path in outputs)
+
+
+if __name__ == "__main__":
+    test_group_identical_hashes_only_same_size_files()
+    test_batch_parses_each_document_once_and_fans_out()
+    test_sqlite_sink_gets_a_row_per_copy()
+    test_no_output_path_writes_timings()
+    print("De-duplication tests passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming input discovery
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from discovery import discover, iter_manifest, iter_pdf_files
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+def make_tree(root: Path):
+    create_synthetic_pdf(root / "a.pdf", pages=1, seed=1)
+    create_synthetic_pdf(root / "B.PDF", pages=1, seed=2)
+    create_synthetic_pdf(root / "sub" / "c.Pdf", pages=1, seed=3)
+    (root / "notes.txt").write_text("not a pdf")
+    (root / ".hidden.pdf").write_bytes(b"%PDF-")
+    os.link(root / "a.pdf", root / "sub" / "hardlink.pdf")
+    os.symlink(root / "B.PDF", root / "symlink.pdf")
+
+
+def test_scan_matches_suffix_case_insensitively_and_deduplicates():
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        make_tree(root)
+        top_level = sorted(path.name for path in iter_pdf_files(root))
+        assert len(top_level) == 2 and "a.pdf" in top_level
+        assert ("B.PDF" in top_level) != ("symlink.pdf" in top_level)
+
+        everything = list(iter_pdf_files(root, recursive=True))
+        assert len(everything) == 3
+        assert "c.Pdf" in [path.name for path in everything]
+
+
+def test_manifest_lines_and_json_records():
+    with tempfile.TemporaryDirectory() as root:
+        root = Path(root)
+        make_tree(root)
+        manifest = root / "inputs.ndjson"
+        manifest.write_text("\n".join([
+            "# nightly batch",
+            "a.pdf",
+            json.dumps({"path": str(root / "sub" / "c.Pdf")}),
+            "",
+            "sub/hardlink.pdf",
+            "missing.pdf",
+        ]) + "\n")
+        assert [path.name for path in iter_manifest(manifest)] == ["a.pdf", "c.Pdf"]
+        assert [path.name for path in discover(root / "ignored", [manifest])] == ["a.pdf", "c.Pdf"]
+
+
+def test_processing_starts_before_discovery_finishes():
+    """The batch pulls inputs lazily, in process and in worker processes."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = [create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1, seed=index) for index in range(4)]
+
+        for workers in (1, 2):
+            discovered = []
+
+            def stream():
+                for pdf_path in pdf_files:
+                    discovered.append(pdf_path)
+                    yield pdf_path
+
+            extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "output", workers=workers)
+            batch = extractor.process_batch(stream())
+            next(batch)
+            assert len(discovered) < len(pdf_files)
+            assert len(list(batch)) == len(pdf_files) - 1
+
+
+def test_run_with_recursion_and_manifest():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        make_tree(work_dir / "input")
+        # Same file name in two directories: each keeps its own output, mirrored by relative path
+        create_synthetic_pdf(work_dir / "input" / "other" / "c.pdf", pages=1, seed=4)
+        PDFOutlineExtractor(input_dir=work_dir / "input", output_dir=work_dir / "recursive", recursive=True).run()
+        outputs = sorted(path.relative_to(work_dir / "recursive").as_posix()
+                         for path in (work_dir / "recursive").rglob("*.json"))
+        assert len(outputs) == 4 and "other/c.json" in outputs and "sub/c.json" in outputs
+
+        manifest = work_dir / "manifest.txt"
+        manifest.write_text("input/sub/c.Pdf\n")
+        PDFOutlineExtractor(input_dir=work_dir / "absent", output_dir=work_dir / "manifest", manifests=[manifest]).run()
+        assert [path.name for path in (work_dir / "manifest").glob("*.json")] == ["c.json"]
+
+
+if __name__ == "__main__":
+    test_scan_matches_suffix_case_insensitively_and_deduplicates()
+    test_manifest_lines_and_json_records()
+    test_processing_starts_before_discovery_finishes()
+    test_run_with_recursion_and_manifest()
+    print("Discovery tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the span feature cache
+"""
+
+import tempfile
+from pathlib import Path
+
+import fitz
+import numpy as np
+
+import pdf_outline_extractor
+from benchmark_support import create_synthetic_pdf, edit_pdf_page
+from feature_cache import FeatureCache, _map_npz, content_digest
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+class NoParsing:
+    """Stands in for fitz.open while a run must be served from the cache."""
+
+    def __enter__(self):
+        self.original = pdf_outline_extractor.fitz.open
+        pdf_outline_extractor.fitz.open = self.refuse
+        return self
+
+    def __exit__(self, *exc):
+        pdf_outline_extractor.fitz.open = self.original
+
+    @staticmethod
+    def refuse(*args, **kwargs):
+        raise AssertionError("PDF opened although its features are cached")
+
+
+def test_cached_features_reproduce_the_outline_without_parsing():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = work_dir / "input" / "report.pdf"
+        create_synthetic_pdf(pdf_path, pages=6, seed=3)
+
+        plain = PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=work_dir / "plain")
+        extractor = PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=work_dir / "cached",
+                                        feature_cache=work_dir / "features")
+        expected = plain.process_pdf(pdf_path)
+        assert extractor.process_pdf(pdf_path) == expected
+        assert len(list((work_dir / "features").glob("*.npz"))) == 1
+
+        # Heuristics run on the cached spans, identical to the parsed ones
+        with NoParsing():
+            assert extractor.process_pdf(pdf_path) == expected
+            assert extractor.process_pdf(pdf_path, pdf_path.read_bytes()) == expected
+
+
+def test_entries_are_invalidated_by_content_and_profile():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = work_dir / "input" / "manual.pdf"
+        create_synthetic_pdf(pdf_path, pages=2, seed=1)
+        extractor = PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=work_dir / "out",
+                                        feature_cache=work_dir / "features")
+        extractor.process_pdf(pdf_path)
+
+        create_synthetic_pdf(pdf_path, pages=5, seed=1)
+        assert extractor.feature_cache.load("manual.pdf", content_digest(pdf_path)) is None
+        assert extractor.process_pdf(pdf_path)["total_pages"] == 5
+        analysis = extractor.feature_cache.load("manual.pdf", content_digest(pdf_path))
+        assert analysis is not None and analysis["pages_processed"] == 5
+
+        other_profile = FeatureCache(work_dir / "features", max_pages=3)
+        assert other_profile.load("manual.pdf", content_digest(pdf_path)) is None
+
+
+def count_parsed_pages(extractor: PDFOutlineExtractor) -> list:
+    parsed = []
+    extract_page_spans = extractor.extract_page_spans
+
+    def counted(page, page_num):
+        parsed.append(page_num + 1)
+        return extract_page_spans(page, page_num)
+
+    extractor.extract_page_spans = counted
+    return parsed
+
+
+def test_revised_documents_only_reparse_changed_pages():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = work_dir / "input" / "contract.pdf"
+        create_synthetic_pdf(pdf_path, pages=8, seed=5)
+        extractor = PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=work_dir / "out",
+                                        feature_cache=work_dir / "features")
+        parsed = count_parsed_pages(extractor)
+        extractor.process_pdf(pdf_path)
+        assert parsed == list(range(1, 9))
+
+        def reprocess():
+            parsed.clear()
+            result = extractor.process_pdf(pdf_path)
+            plain = PDFOutlineExtractor(input_dir=pdf_path.parent, output_dir=work_dir / "plain")
+            assert result == plain.process_pdf(pdf_path)
+            return result
+
+        edit_pdf_page(pdf_path, 4, "5.9 Termination Clause")
+        result = reprocess()
+        assert parsed == [5]
+        assert {"text": "5.9 Termination Clause", "level": "h2", "page": 5} in result["outline"]
+
+        # Pages moved by an insertion are recognised and renumbered, not parsed again
+        doc = fitz.open(str(pdf_path))
+        page = doc.new_page(pno=2)
+        page.insert_text((50, 60), "2.5 Inserted Annex Heading", fontsize=14, fontname="hebo")
+        doc.save(str(work_dir / "revised.pdf"))
+        doc.close()
+        (work_dir / "revised.pdf").replace(pdf_path)
+        result = reprocess()
+        assert parsed == [3]
+        assert {"text": "8. Chapter Heading 8", "level": "h1", "page": 9} in result["outline"]
+
+
+def test_entries_are_memory_mapped_and_corruption_is_a_miss():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        cache = FeatureCache(work_dir, max_pages=50)
+        blocks = [{"text": "Résumé des travaux", "page": 1, "size": 14.5, "flags": 16, "font": "Helvetica-Bold",
+                   "bbox": (72.0, 90.25, 300.0, 105.0)},
+                  {"text": "Body text here", "page": 2, "size": 10.0, "flags": 0, "font": "Helvetica",
+                   "bbox": (72.0, 120.0, 500.0, 132.0)}]
+        cache.store("a.pdf", "digest", {"text_blocks": blocks, "pages_processed": 2, "page_count": 2,
+                                        "page_fingerprints": ["first", "second"]})
+
+        arrays = _map_npz(cache.entry_path("a.pdf"))
+        assert isinstance(arrays["text"], np.memmap) and isinstance(arrays["bbox"], np.memmap)
+        analysis = cache.load("a.pdf", "digest")
+        assert [block["text"] for block in analysis["text_blocks"]] == ["Résumé des travaux", "Body text here"]
+        assert analysis["text_blocks"][0]["bbox"] == (72.0, 90.25, 300.0, 105.0)
+        assert analysis["text_blocks"][0]["is_bold"] and not analysis["text_blocks"][1]["is_bold"]
+        assert sorted(analysis["font_stats"]) == [10.0, 14.5]
+
+        cache.entry_path("a.pdf").write_bytes(b"not a zip file")
+        assert cache.load("a.pdf", "digest") is None
+
+
+if __name__ == "__main__":
+    test_cached_features_reproduce_the_outline_without_parsing()
+    test_entries_are_invalidated_by_content_and_profile()
+    test_revised_documents_only_reparse_changed_pages()
+    test_entries_are_memory_mapped_and_corruption_is_a_miss()
+    print("Feature cache tests passed")
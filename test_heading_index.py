@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the full-text heading index
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from heading_index import INDEX_NAME, HeadingIndex
+from pdf_outline_extractor import PDFOutlineExtractor
+from sqlite_benchmark import synthetic_result
+
+
+def fts_rows(index_path: Path):
+    db = sqlite3.connect(index_path)
+    try:
+        return dict(db.execute("SELECT rowid, text FROM heading_fts").fetchall())
+    finally:
+        db.close()
+
+
+def test_batch_builds_and_incrementally_updates_the_index():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        for index in range(3):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=2, seed=index)
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, heading_index=True,
+                            journal=work_dir / "journal.jsonl").run()
+        index = HeadingIndex(output_dir / INDEX_NAME)
+        titles = index.search("Synthetic Benchmark Document", limit=10)
+        assert sorted(match["input"] for match in titles) == ["doc0.pdf", "doc1.pdf", "doc2.pdf"]
+        assert all(match["level"] == "Title" for match in titles)
+        chapters = index.search("chapter heading 2")
+        assert chapters and all(match["page"] == 2 and match["level"] == "h1" for match in chapters)
+        index.close()
+
+        # Re-processing one document only touches that document's entries
+        before = fts_rows(output_dir / INDEX_NAME)
+        create_synthetic_pdf(input_dir / "doc1.pdf", pages=4, seed=1)
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, heading_index=True,
+                            journal=work_dir / "journal.jsonl").run()
+        after = fts_rows(output_dir / INDEX_NAME)
+        changed = {rowid for rowid in set(before) | set(after) if before.get(rowid) != after.get(rowid)}
+        assert changed
+        assert len({rowid >> 16 for rowid in changed}) == 1
+
+        index = HeadingIndex(output_dir / INDEX_NAME)
+        assert {match["page"] for match in index.search("chapter heading 4")} == {4}
+        index.close()
+
+
+def test_queries_are_literal_unless_raw():
+    with tempfile.TemporaryDirectory() as work_dir:
+        index = HeadingIndex(Path(work_dir) / INDEX_NAME)
+        index.update("a.pdf", {"document_title": "Annual Report", "total_pages": 3,
+                               "outline": [{"text": "Risk Assessment (draft)", "level": "h2", "page": 3}]})
+        assert [match["page"] for match in index.search("assessment) risk \"")] == [3]
+        assert index.search("assess*") == []
+        assert [match["text"] for match in index.search("assess*", raw=True)] == ["Risk Assessment (draft)"]
+        index.update("a.pdf", {"document_title": "x", "total_pages": 0, "outline": [], "error": "broken"})
+        assert index.search("risk") == []
+        index.close()
+
+
+def test_search_stays_fast_on_a_large_index():
+    with tempfile.TemporaryDirectory() as work_dir:
+        index = HeadingIndex(Path(work_dir) / INDEX_NAME)
+        for number in range(5000):
+            index.update(f"corpus/doc_{number:05d}.pdf", synthetic_result(number))
+        index.flush()
+
+        start = time.perf_counter()
+        matches = index.search("Section Heading 4321-7")
+        elapsed = time.perf_counter() - start
+        index.close()
+        assert matches[0]["input"] == "corpus/doc_04321.pdf"
+        assert elapsed < 0.1
+
+
+if __name__ == "__main__":
+    test_batch_builds_and_incrementally_updates_the_index()
+    test_queries_are_literal_unless_raw()
+    test_search_stays_fast_on_a_large_index()
+    print("Heading index tests passed")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for hierarchy template reuse
+"""
+
+import json
+import pickle
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from hierarchy_templates import HierarchyTemplateCache, font_signature
+from pdf_outline_extractor import PDFOutlineExtractor
+import worker_pool
+
+
+class CountingExtractor(PDFOutlineExtractor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.full_passes = 0
+
+    def establish_heading_hierarchy(self, analysis):
+        self.full_passes += 1
+        return super().establish_heading_hierarchy(analysis)
+
+
+def test_documents_from_one_generator_share_a_template():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_paths = [create_synthetic_pdf(work_dir / f"doc{seed}.pdf", pages=4, seed=seed) for seed in range(6)]
+        plain = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "plain")
+        extractor = CountingExtractor(input_dir=work_dir, output_dir=work_dir / "templated",
+                                      hierarchy_templates=True)
+
+        for pdf_path in pdf_paths:
+            assert extractor.process_pdf(pdf_path) == plain.process_pdf(pdf_path)
+        templates = extractor.hierarchy_templates
+        assert extractor.full_passes == 1
+        assert (templates.hits, templates.misses, len(templates.templates)) == (5, 1, 1)
+
+
+def test_reused_templates_are_verified_and_replaced_on_divergence():
+    blocks = [{"text": "A Title For Tests", "page": 1, "size": 20.0, "flags": 0, "font": "Helvetica"},
+              {"text": "1. Introduction", "page": 1, "size": 14.0, "flags": 16, "font": "Helvetica-Bold"},
+              {"text": "Body text line", "page": 1, "size": 10.0, "flags": 0, "font": "Helvetica"}]
+    font_stats = {}
+    for block in blocks:
+        font_stats.setdefault(block["size"], []).append(block)
+    analysis = {"text_blocks": blocks, "font_stats": font_stats}
+    full_passes = []
+
+    def establish(analysis):
+        full_passes.append(1)
+        return {"h1": 14.0}
+
+    cache = HierarchyTemplateCache(verify_every=3)
+    signature = font_signature(blocks)
+    assert cache.hierarchy(analysis, establish) == {"h1": 14.0}
+
+    # A template that no longer matches the full statistics is caught on its verification hit
+    cache.templates[signature]["hierarchy"] = {"h1": 10.0}
+    results = [cache.hierarchy(analysis, establish) for _ in range(3)]
+    assert results == [{"h1": 10.0}, {"h1": 10.0}, {"h1": 14.0}]
+    assert cache.invalidated == 1 and cache.templates[signature]["hierarchy"] == {"h1": 14.0}
+    # The verification run is counted on its own, not as a template miss
+    assert (cache.hits, cache.verified, cache.misses) == (2, 1, 1)
+
+    # Cheap checks: a mapped size missing from the document forces the full pass
+    cache.templates[signature]["hierarchy"] = {"h1": 16.0}
+    assert cache.hierarchy(analysis, establish) == {"h1": 14.0}
+    assert len(full_passes) == 3 and cache.invalidated == 2
+    assert (cache.verified, cache.misses) == (1, 2)
+
+
+def test_signature_only_covers_the_first_pages():
+    first = [{"page": 1, "font": "F", "size": 12.0, "flags": 0}]
+    assert font_signature(first + [{"page": 4, "font": "G", "size": 9.0, "flags": 0}], pages=3) == font_signature(first)
+    assert font_signature(first + [{"page": 2, "font": "G", "size": 9.0, "flags": 0}]) != font_signature(first)
+
+
+def test_async_process_pool_keeps_templates_in_each_worker():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir = work_dir / "input"
+        for seed in range(4):
+            create_synthetic_pdf(input_dir / f"doc{seed}.pdf", pages=3, seed=seed)
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "plain").run()
+        templated = PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "templated", pipeline="async",
+                                        workers=2, hierarchy_templates=True)
+        templated.run()
+        for plain_output in (work_dir / "plain").glob("*.json"):
+            templated_output = work_dir / "templated" / plain_output.name
+            assert json.loads(templated_output.read_text()) == json.loads(plain_output.read_text())
+
+        # A worker is given the extractor once, so its templates carry over between documents
+        worker_pool.init_pool_worker(pickle.loads(pickle.dumps(templated)))
+        for pdf_path in sorted(input_dir.glob("*.pdf")):
+            worker_pool.process_in_pool_worker(pdf_path, None)
+        templates = worker_pool._pool_extractor.hierarchy_templates
+        assert (templates.hits, templates.misses) == (3, 1)
+
+
+if __name__ == "__main__":
+    test_documents_from_one_generator_share_a_template()
+    test_reused_templates_are_verified_and_replaced_on_divergence()
+    test_signature_only_covers_the_first_pages()
+    test_async_process_pool_keeps_templates_in_each_worker()
+    print("Hierarchy template tests passed")
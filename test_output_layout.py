@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the hash-sharded output layout
+"""
+
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from output_layout import INDEX_NAME, load_index, sharded_output_name
+from output_writer import read_output
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+def test_names_are_stable_and_distinct_per_relative_path():
+    first = sharded_output_name("2024/report.pdf", "report")
+    assert first == sharded_output_name("2024/report.pdf", "report")
+    assert first != sharded_output_name("2025/report.pdf", "report")
+    shard_a, shard_b, name = first.split("/")
+    assert len(shard_a) == len(shard_b) == 2 and name.startswith("report.") and name.endswith(".json")
+
+
+def test_same_stem_in_different_folders_does_not_collide():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        create_synthetic_pdf(input_dir / "2024" / "report.pdf", pages=1, seed=1)
+        create_synthetic_pdf(input_dir / "2025" / "report.pdf", pages=2, seed=2)
+
+        extractor = PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir,
+                                        recursive=True, output_layout="sharded")
+        extractor.run()
+
+        index = load_index(output_dir / INDEX_NAME)
+        assert sorted(index) == ["2024/report.pdf", "2025/report.pdf"]
+        assert read_output(output_dir / index["2024/report.pdf"])["total_pages"] == 1
+        assert read_output(output_dir / index["2025/report.pdf"])["total_pages"] == 2
+        assert not list(output_dir.glob("*.json"))
+
+        # A rerun with unchanged outlines neither rewrites files nor grows the index
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir,
+                            recursive=True, output_layout="sharded").run()
+        assert len((output_dir / INDEX_NAME).read_text().splitlines()) == 2
+
+
+if __name__ == "__main__":
+    test_names_are_stable_and_distinct_per_relative_path()
+    test_same_stem_in_different_folders_does_not_collide()
+    print("Output layout tests passed")
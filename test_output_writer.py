@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the output writer layer
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from output_writer import OutputWriter, read_output
+from pdf_outline_extractor import PDFOutlineExtractor
+
+RESULT = {"document_title": "Überblick", "total_pages": 2,
+          "outline": [{"text": "1. Introduction", "level": "H1", "page": 1}]}
+
+
+def test_backends_and_formats_round_trip():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        for backend in ("auto", "json"):
+            for compact in (False, True):
+                writer = OutputWriter(compact=compact, backend=backend)
+                output_path, written = writer.write(work_dir / f"{backend}-{compact}.json", RESULT)
+                assert written and read_output(output_path) == RESULT
+                assert (b"\n" not in output_path.read_bytes()) == compact
+                assert "Überblick" in output_path.read_text(encoding="utf-8")
+
+        # Pretty output keeps the historical json.dump(indent=2) layout whichever encoder is used
+        assert (work_dir / "auto-False.json").read_bytes() == (work_dir / "json-False.json").read_bytes()
+
+        writer = OutputWriter(compress=True)
+        output_path, _ = writer.write(work_dir / "doc.json.gz", RESULT)
+        assert output_path.read_bytes()[:2] == b"\x1f\x8b"
+        assert read_output(output_path) == RESULT
+
+
+def test_unchanged_content_is_not_rewritten():
+    with tempfile.TemporaryDirectory() as work_dir:
+        output_path = Path(work_dir) / "doc.json.gz"
+        writer = OutputWriter(compress=True)
+        writer.write(output_path, RESULT)
+        os.utime(output_path, (1, 1))
+
+        _, written = writer.write(output_path, dict(RESULT))
+        assert not written and output_path.stat().st_mtime == 1
+        _, written = writer.write(output_path, dict(RESULT, total_pages=3))
+        assert written and output_path.stat().st_mtime != 1
+        assert (writer.written, writer.unchanged) == (2, 1)
+        assert [path.name for path in Path(work_dir).iterdir()] == ["doc.json.gz"]
+
+
+def test_extractor_uses_the_writer():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        create_synthetic_pdf(work_dir / "input" / "doc.pdf", pages=2)
+
+        extractor = PDFOutlineExtractor(input_dir=work_dir / "input", output_dir=work_dir / "output",
+                                        compact_json=True, compress_output=True)
+        extractor.run()
+        extractor.run()
+        assert (extractor.writer.written, extractor.writer.unchanged) == (1, 1)
+        outline = read_output(work_dir / "output" / "doc.json.gz")
+        assert outline == json.loads(json.dumps(extractor.process_pdf(work_dir / "input" / "doc.pdf")))
+
+
+if __name__ == "__main__":
+    test_backends_and_formats_round_trip()
+    test_unchanged_content_is_not_rewritten()
+    test_extractor_uses_the_writer()
+    print("Output writer tests passed")
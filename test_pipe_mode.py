@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the Unix-pipe NDJSON mode
+"""
+
+import faulthandler
+import io
+import json
+import os
+import queue
+import signal
+import tempfile
+import threading
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from pipe_mode import LENGTH_PREFIX, read_length_prefixed, run_pipe
+
+
+class CountingStdin:
+    """stdin stand-in that records how many lines have been read."""
+
+    def __init__(self, data: bytes):
+        self.lines = data.splitlines(keepends=True)
+        self.lines_read = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.lines_read += 1
+            yield line
+
+
+class RecordingStdout(io.BytesIO):
+    """stdout stand-in that notes how far stdin had been read at each result."""
+
+    def __init__(self, stdin: CountingStdin):
+        super().__init__()
+        self.stdin = stdin
+        self.read_at_write = []
+
+    def write(self, data):
+        self.read_at_write.append(self.stdin.lines_read)
+        return super().write(data)
+
+
+class OpenStdin:
+    """stdin stand-in whose producer stays connected until close().
+
+    An os.pipe would not do: forked pool workers inherit its write end, so
+    closing it in the test would never deliver EOF.
+    """
+
+    def __init__(self):
+        self.lines = queue.Queue()
+
+    def write_line(self, line: bytes):
+        self.lines.put(line + b"\n")
+
+    def close(self):
+        self.lines.put(None)
+
+    def __iter__(self):
+        return iter(self.lines.get, None)
+
+
+class NotifyingStdout(io.BytesIO):
+    """stdout stand-in that signals every record written."""
+
+    def __init__(self):
+        super().__init__()
+        self.record_written = threading.Event()
+
+    def write(self, data):
+        written = super().write(data)
+        self.record_written.set()
+        return written
+
+
+class CrashingExtractor(PDFOutlineExtractor):
+    """Segfaults on files named crash*.pdf, like MuPDF does on some broken inputs."""
+
+    def process_pdf(self, pdf_path, data=None):
+        if pdf_path.name.startswith("crash"):
+            faulthandler.disable()  # keep pytest's fault handler from dumping the child's stack
+            os.kill(os.getpid(), signal.SIGSEGV)
+        return super().process_pdf(pdf_path, data)
+
+
+def make_pdfs(directory: Path, count: int):
+    return [create_synthetic_pdf(directory / f"doc{index}.pdf", pages=1 + index % 3, seed=index) for index in range(count)]
+
+
+def test_paths_in_input_order_as_compact_lines():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_pdfs(work_dir, 3)
+        stdin = io.BytesIO(b"".join(str(pdf_path).encode() + b"\n" for pdf_path in pdf_files) + b"\n")
+        stdout = io.BytesIO()
+
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir)
+        assert run_pipe(extractor, stdin, stdout) == 3
+
+        lines = stdout.getvalue().decode().splitlines()
+        assert [json.loads(line)["input"] for line in lines] == [str(pdf_path) for pdf_path in pdf_files]
+        assert all(": " not in line and ", " not in line[:40] for line in lines)
+        assert not list(work_dir.glob("*.json"))
+
+
+def test_length_prefixed_bytes():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_files = make_pdfs(Path(work_dir), 2)
+        payload = b"".join(LENGTH_PREFIX.pack(len(data)) + data for data in
+                           [pdf_path.read_bytes() for pdf_path in pdf_files] + [b"garbage"])
+        stdout = io.BytesIO()
+
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir)
+        run_pipe(extractor, io.BytesIO(payload), stdout, input_format="bytes")
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [record["input"] for record in records] == ["stdin-0.pdf", "stdin-1.pdf", "stdin-2.pdf"]
+        assert records[0]["outline"] == extractor.process_pdf(pdf_files[0])["outline"]
+        assert "error" in records[2]
+
+
+def test_oversized_length_prefix_fails_before_reading():
+    stream = io.BytesIO(LENGTH_PREFIX.pack(1 << 40) + b"%PDF-")
+    documents = read_length_prefixed(stream, max_bytes=1024)
+    try:
+        next(documents)
+    except ValueError as e:
+        assert "1099511627776 bytes" in str(e)
+    else:
+        raise AssertionError("a 1 TiB length prefix was accepted")
+    assert stream.tell() == LENGTH_PREFIX.size
+
+
+def test_parallel_orders_and_bounded_window():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_pdfs(work_dir, 8)
+        paths = b"".join(str(pdf_path).encode() + b"\n" for pdf_path in pdf_files)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir, workers=2)
+
+        stdout = io.BytesIO()
+        run_pipe(extractor, io.BytesIO(paths), stdout, order="input", window=3)
+        assert [json.loads(line)["input"] for line in stdout.getvalue().splitlines()] == [str(p) for p in pdf_files]
+
+        stdin = CountingStdin(paths)
+        stdout = RecordingStdout(stdin)
+        run_pipe(extractor, stdin, stdout, order="completion", window=3)
+        assert sorted(json.loads(line)["input"] for line in stdout.getvalue().splitlines()) == sorted(map(str, pdf_files))
+        # Results flow out while stdin is still being read, never more than the window ahead
+        assert stdout.read_at_write[0] <= 3
+        assert all(read - written <= 3 for written, read in enumerate(stdout.read_at_write))
+
+
+def test_results_are_written_while_stdin_stays_open():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = make_pdfs(work_dir, 1)[0]
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir, workers=2)
+
+        for order in ("input", "completion"):
+            stdin, stdout = OpenStdin(), NotifyingStdout()
+            runner = threading.Thread(target=run_pipe, args=(extractor, stdin, stdout), kwargs={"order": order})
+            runner.start()
+            stdin.write_line(str(pdf_path).encode())
+            # The producer is still connected: the record must not wait for EOF
+            assert stdout.record_written.wait(60), f"{order} order held a finished result until EOF"
+            stdin.close()
+            runner.join(60)
+            assert not runner.is_alive()
+            assert json.loads(stdout.getvalue())["input"] == str(pdf_path)
+
+
+def test_worker_crash_fails_only_its_document():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_pdfs(work_dir, 4)
+        crash = pdf_files[1].rename(work_dir / "crash.pdf")
+        names = [pdf_files[0], crash, *pdf_files[2:]]
+        stdin = io.BytesIO(b"".join(str(pdf_path).encode() + b"\n" for pdf_path in names))
+        stdout = io.BytesIO()
+
+        extractor = CrashingExtractor(input_dir=work_dir, output_dir=work_dir, workers=2)
+        assert run_pipe(extractor, stdin, stdout) == 4
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [record["input"] for record in records] == [str(pdf_path) for pdf_path in names]
+        assert [bool(record.get("error")) for record in records] == [False, True, False, False]
+
+
+if __name__ == "__main__":
+    test_paths_in_input_order_as_compact_lines()
+    test_length_prefixed_bytes()
+    test_oversized_length_prefix_fails_before_reading()
+    test_parallel_orders_and_bounded_window()
+    test_results_are_written_while_stdin_stays_open()
+    test_worker_crash_fails_only_its_document()
+    print("Pipe mode tests passed")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the read-ahead prefetcher
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from prefetcher import ReadAheadPrefetcher
+
+
+class SlowStoragePrefetcher(ReadAheadPrefetcher):
+    """Simulates a cold network read of 20 ms per file."""
+
+    def _read(self, pdf_path):
+        time.sleep(0.02)
+        return super()._read(pdf_path)
+
+
+def test_yields_every_file_in_order_with_its_bytes():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_files = [create_synthetic_pdf(Path(work_dir) / f"doc{index}.pdf", pages=1, seed=index) for index in range(6)]
+        pairs = list(ReadAheadPrefetcher(pdf_files, depth=2))
+        assert [pdf_path for pdf_path, _ in pairs] == pdf_files
+        assert all(data == pdf_path.read_bytes() for pdf_path, data in pairs)
+
+
+def test_memory_cap_is_respected():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_files = [create_synthetic_pdf(Path(work_dir) / f"doc{index}.pdf", pages=3, seed=index) for index in range(6)]
+        largest = max(pdf_path.stat().st_size for pdf_path in pdf_files)
+        prefetcher = ReadAheadPrefetcher(pdf_files, depth=6, memory_limit_mb=2 * largest / (1024 * 1024))
+        for _ in prefetcher:
+            time.sleep(0.01)
+        assert prefetcher.stats["peak_buffered_bytes"] <= 2 * largest
+
+        tiny = ReadAheadPrefetcher(pdf_files, memory_limit_mb=1 / (1024 * 1024))
+        assert all(data is None for _, data in tiny)
+        assert tiny.stats["oversize"] == len(pdf_files)
+
+
+def test_read_time_is_hidden_behind_parsing():
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_files = [create_synthetic_pdf(Path(work_dir) / f"doc{index}.pdf", pages=1, seed=index) for index in range(8)]
+        prefetcher = SlowStoragePrefetcher(pdf_files, depth=2)
+        for _ in prefetcher:
+            time.sleep(0.04)  # parsing is slower than reading
+        # Only the first read can't overlap with anything
+        assert prefetcher.stats["read_s"] >= 8 * 0.02
+        assert prefetcher.stats["wait_s"] < 4 * 0.02
+        assert prefetcher.hidden_io_s > 4 * 0.02
+
+
+def test_batch_with_read_ahead_matches_plain_batch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir = work_dir / "input"
+        for index in range(4):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=2, seed=index)
+
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / "plain").run()
+        for mode in ("read", "fadvise"):
+            extractor = PDFOutlineExtractor(input_dir=input_dir, output_dir=work_dir / mode,
+                                            read_ahead=2, read_ahead_mode=mode)
+            extractor.run()
+            assert extractor.prefetch_stats["files"] == 4
+            for plain_output in (work_dir / "plain").glob("*.json"):
+                assert (work_dir / mode / plain_output.name).read_text() == plain_output.read_text()
+
+
+if __name__ == "__main__":
+    test_yields_every_file_in_order_with_its_bytes()
+    test_memory_cap_is_respected()
+    test_read_time_is_hidden_behind_parsing()
+    test_batch_with_read_ahead_matches_plain_batch()
+    print("Prefetcher tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for deterministic batch sharding
+"""
+
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from sharding import assign_shards, select_shard, shard_for_key, stable_hash
+
+
+def test_every_file_lands_in_exactly_one_shard():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = [create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1 + index % 4, seed=index)
+                     for index in range(12)]
+        key = lambda pdf_path: pdf_path.name
+
+        for balance in ("bytes", "hash"):
+            shards = [select_shard(pdf_files, index, 3, key, balance) for index in range(3)]
+            assert sorted(path for shard in shards for path in shard) == sorted(pdf_files)
+            # Independent "containers" seeing the listing in another order agree
+            assert select_shard(list(reversed(pdf_files)), 1, 3, key, balance) == list(reversed(shards[1]))
+
+
+def test_byte_balance_is_close_to_even():
+    sizes = {f"doc{index}.pdf": 1000 + (index * 7919) % 50000 for index in range(200)}
+    assignment = assign_shards(sizes, 4)
+    loads = [sum(size for key, size in sizes.items() if assignment[key] == shard) for shard in range(4)]
+    assert max(loads) - min(loads) <= max(sizes.values())
+
+
+def test_hash_assignment_is_stable():
+    """Pure hashing keeps a file's shard when other files are added and across runs."""
+    assert stable_hash("a/b.pdf") == stable_hash("a/b.pdf")
+    before = {f"doc{index}.pdf": shard_for_key(f"doc{index}.pdf", 5) for index in range(50)}
+    after = {f"doc{index}.pdf": shard_for_key(f"doc{index}.pdf", 5) for index in range(100)}
+    assert all(after[key] == shard for key, shard in before.items())
+
+
+def test_sharded_runs_cover_the_batch():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        for index in range(6):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=1, seed=index)
+
+        for shard_index in range(2):
+            PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir,
+                                shard_index=shard_index, shard_count=2).run()
+        assert len(list(output_dir.glob("*.json"))) == 6
+
+        try:
+            select_shard([], 2, 2, str)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("out-of-range shard index accepted")
+
+
+if __name__ == "__main__":
+    test_every_file_lands_in_exactly_one_shard()
+    test_byte_balance_is_close_to_even()
+    test_hash_assignment_is_stable()
+    test_sharded_runs_cover_the_batch()
+    print("Sharding tests passed")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Leak-related tests for PDF Outline Extractor
+Checks that documents are closed on the error path and that a short
+soak over malformed inputs stays healthy.
+"""
+
+import tempfile
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pdf_outline_extractor
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from soak_benchmark import growth_slope, run_soak
+
+
+def test_document_closed_on_error():
+    """A failure after fitz.open must still close the document."""
+    opened = []
+    real_open = fitz.open
+
+    def recording_open(*args, **kwargs):
+        doc = real_open(*args, **kwargs)
+        opened.append(doc)
+        return doc
+
+    def failing_analysis(doc, deadline=None, previous=None):
+        raise RuntimeError("simulated analysis failure")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = create_synthetic_pdf(Path(work_dir) / "sample.pdf", pages=2)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir)
+        extractor.analyze_font_characteristics = failing_analysis
+
+        pdf_outline_extractor.fitz.open = recording_open
+        try:
+            result = extractor.process_pdf(pdf_path)
+        finally:
+            pdf_outline_extractor.fitz.open = real_open
+
+    assert result["error"] == "simulated analysis failure"
+    assert len(opened) == 1
+    assert opened[0].is_closed
+
+
+def test_growth_slope():
+    """The slope helper reports bytes per document."""
+    assert growth_slope([(0, 100), (10, 200), (20, 300)]) == 10.0
+    assert growth_slope([(0, 100)]) == 0.0
+
+
+def test_short_soak():
+    """A short soak over generated and malformed PDFs completes and reports samples."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        report = run_soak(Path(work_dir), documents=120, sample_every=20, max_slope_kb=1e9)
+
+    print(f"Soak: {report['docs_per_sec']:.1f} docs/s, {report['errors']} errors")
+    assert report["passed"]
+    assert report["errors"] > 0
+    assert len(report["rss_samples"]) == 6
+
+
+if __name__ == "__main__":
+    test_document_closed_on_error()
+    test_growth_slope()
+    test_short_soak()
+    print("Soak tests passed")
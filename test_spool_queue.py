@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the competing-consumer spool queue
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from batch_journal import BatchJournal
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from spool_queue import SpoolQueue, consume
+
+
+def test_each_job_is_claimed_once():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        first = SpoolQueue(work_dir / "spool", consumer_id="host-a.1")
+        second = SpoolQueue(work_dir / "spool", consumer_id="host-b.2")
+        for index in range(4):
+            first.enqueue(create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1, seed=index))
+
+        claimed = []
+        while True:
+            job = (first if len(claimed) % 2 else second).claim() or first.claim()
+            if job is None:
+                break
+            claimed.append(job.name)
+        assert sorted(claimed) == [f"doc{index}.pdf" for index in range(4)]
+        assert not list(first.dir("tmp").iterdir())
+
+
+def test_expired_lease_is_reclaimed():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        dead = SpoolQueue(work_dir / "spool", lease_seconds=60, consumer_id="dead.1")
+        alive = SpoolQueue(work_dir / "spool", lease_seconds=60, consumer_id="alive.2")
+        dead.enqueue(create_synthetic_pdf(work_dir / "doc.pdf", pages=1))
+
+        job = dead.claim()
+        assert alive.claim() is None
+        assert alive.reclaim_expired() == 0
+
+        stale = time.time() - 120
+        os.utime(job.path, (stale, stale))
+        assert alive.reclaim_expired() == 1
+        taken = alive.claim()
+        assert taken.name == "doc.pdf"
+        assert alive.finish(taken)
+        # The original owner finds out it lost the lease instead of clobbering the result
+        assert not dead.finish(job)
+        assert (alive.dir("done") / "doc.pdf").exists()
+
+
+def test_consume_writes_outputs_and_sorts_failures():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        queue = SpoolQueue(work_dir / "spool")
+        queue.enqueue(create_synthetic_pdf(work_dir / "good.pdf", pages=2))
+        broken = work_dir / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        queue.enqueue(broken)
+
+        extractor = PDFOutlineExtractor(input_dir=queue.dir("processing"), output_dir=work_dir / "output")
+        assert consume(extractor, queue, exit_when_empty=True) == 2
+
+        assert sorted(path.name for path in (work_dir / "output").glob("*.json")) == ["broken.json", "good.json"]
+        assert [path.name for path in queue.dir("done").iterdir()] == ["good.pdf"]
+        assert [path.name for path in queue.dir("failed").iterdir()] == ["broken.pdf"]
+        assert not list(queue.dir("processing").iterdir())
+
+
+class RecordingQueue(SpoolQueue):
+    """Notes how many jobs were waiting in new/ whenever expired leases were reclaimed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiting_at_reclaim = []
+
+    def reclaim_expired(self) -> int:
+        waiting = len(list(self.dir("new").iterdir()))
+        reclaimed = super().reclaim_expired()
+        if reclaimed:
+            self.waiting_at_reclaim.append(waiting)
+        return reclaimed
+
+
+def test_orphaned_jobs_are_reclaimed_while_new_jobs_keep_arriving():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        dead = SpoolQueue(work_dir / "spool", lease_seconds=60, consumer_id="dead.1")
+        dead.enqueue(create_synthetic_pdf(work_dir / "orphan.pdf", pages=1))
+        orphan = dead.claim()
+        stale = time.time() - 120
+        os.utime(orphan.path, (stale, stale))
+
+        queue = RecordingQueue(work_dir / "spool", lease_seconds=60)
+        for index in range(4):
+            queue.enqueue(create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=1, seed=index))
+        extractor = PDFOutlineExtractor(input_dir=queue.dir("processing"), output_dir=work_dir / "output")
+        assert consume(extractor, queue, exit_when_empty=True) == 5
+        # Reclaimed on the timer, not only once new/ ran dry
+        assert queue.waiting_at_reclaim and queue.waiting_at_reclaim[0] == 4
+        assert (queue.dir("done") / "orphan.pdf").exists()
+
+
+def test_job_that_keeps_killing_consumers_is_failed():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        queue = SpoolQueue(work_dir / "spool", lease_seconds=60, max_leases=3)
+        queue.enqueue(create_synthetic_pdf(work_dir / "poison.pdf", pages=1))
+
+        stale = time.time() - 120
+        for lease in range(1, 4):
+            job = queue.claim()
+            assert job.name == "poison.pdf" and job.leases == lease
+            os.utime(job.path, (stale, stale))  # the consumer died mid-document
+            assert queue.reclaim_expired() == (1 if lease < 3 else 0)
+        assert queue.claim() is None
+        assert [path.name for path in queue.dir("failed").iterdir()] == ["poison.pdf"]
+        assert not list(queue.dir("processing").iterdir())
+
+
+def test_consume_honours_sink_and_journal_options():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        queue = SpoolQueue(work_dir / "spool")
+        for index in range(2):
+            queue.enqueue(create_synthetic_pdf(work_dir / f"doc{index}.pdf", pages=2, seed=index))
+
+        def consumer():
+            return PDFOutlineExtractor(input_dir=queue.dir("processing"), output_dir=work_dir / "output",
+                                       sink="sqlite", journal=work_dir / "journal.jsonl")
+        assert consume(consumer(), queue, exit_when_empty=True) == 2
+        assert not list((work_dir / "output").glob("*.json"))
+        db = sqlite3.connect(work_dir / "output" / "outlines.sqlite")
+        assert sorted(row[0] for row in db.execute("SELECT input FROM documents")) == ["doc0.pdf", "doc1.pdf"]
+        db.close()
+        with BatchJournal(work_dir / "journal.jsonl") as journal:
+            assert sorted(journal.entries) == ["doc0.pdf", "doc1.pdf"]
+            assert all(entry["sha256"] for entry in journal.entries.values())
+
+        # A job re-submitted with unchanged content is finished from the journal, not parsed again
+        queue.enqueue(work_dir / "doc0.pdf")
+        extractor = consumer()
+        extractor.process_pdf = None
+        assert consume(extractor, queue, exit_when_empty=True) == 1
+
+
+if __name__ == "__main__":
+    test_each_job_is_claimed_once()
+    test_expired_lease_is_reclaimed()
+    test_consume_writes_outputs_and_sorts_failures()
+    test_orphaned_jobs_are_reclaimed_while_new_jobs_keep_arriving()
+    test_job_that_keeps_killing_consumers_is_failed()
+    test_consume_honours_sink_and_journal_options()
+    print("Spool queue tests passed")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite result sink
+"""
+
+import pickle
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from sqlite_benchmark import run_sqlite_benchmark
+
+
+def test_batch_into_sqlite():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        input_dir, output_dir = work_dir / "input", work_dir / "output"
+        for index in range(3):
+            create_synthetic_pdf(input_dir / f"doc{index}.pdf", pages=2, seed=index)
+        (input_dir / "broken.pdf").write_bytes(b"not a pdf")
+
+        extractor = PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, sink="sqlite")
+        extractor.run()
+        expected = extractor.process_pdf(input_dir / "doc1.pdf")
+        PDFOutlineExtractor(input_dir=input_dir, output_dir=output_dir, sink="sqlite").run()
+
+        assert not list(output_dir.glob("*.json"))
+        db = sqlite3.connect(output_dir / "outlines.sqlite")
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # Re-processing replaced rows instead of duplicating them
+        assert db.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 4
+        assert db.execute("SELECT error FROM documents WHERE input = 'broken.pdf'").fetchone()[0]
+
+        title, total_s = db.execute("SELECT title, total_s FROM documents WHERE input = 'doc1.pdf'").fetchone()
+        assert title == expected["document_title"] and total_s > 0
+        headings = db.execute("SELECT text, level, page FROM headings JOIN documents ON documents.id = document_id "
+                              "WHERE input = 'doc1.pdf' ORDER BY position").fetchall()
+        assert headings == [(h["text"], h["level"], h["page"]) for h in expected["outline"]]
+
+        plan = " ".join(row[-1] for row in db.execute(
+            "EXPLAIN QUERY PLAN SELECT text FROM headings WHERE document_id = 1 AND page = 2"))
+        assert "headings_document_page" in plan
+        db.close()
+
+
+def test_ingest_rate_does_not_degrade():
+    with tempfile.TemporaryDirectory() as work_dir:
+        rows = run_sqlite_benchmark(Path(work_dir) / "outlines.sqlite", documents=6000, segments=3, batch_size=200)
+        assert rows[-1]["docs_per_sec"] > rows[0]["docs_per_sec"] / 3
+
+
+def test_open_sinks_stay_behind_when_the_extractor_is_pickled():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir, sink="sqlite",
+                                        heading_index=True, output_layout="sharded")
+        extractor.open_sinks()
+        try:
+            worker_copy = pickle.loads(pickle.dumps(extractor))
+            assert (worker_copy.sqlite_sink, worker_copy.heading_index, worker_copy.output_index) == (None, None, None)
+            assert worker_copy.sink == "sqlite" and extractor.sqlite_sink is not None
+        finally:
+            extractor.close_sinks()
+
+
+if __name__ == "__main__":
+    test_batch_into_sqlite()
+    test_ingest_rate_does_not_degrade()
+    test_open_sinks_stay_behind_when_the_extractor_is_pickled()
+    print("SQLite sink tests passed")
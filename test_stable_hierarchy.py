@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the early-stabilising hierarchy mode
+"""
+
+import tempfile
+from pathlib import Path
+
+import fitz
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+def extractor(work_dir: Path, max_pages: int, **options) -> PDFOutlineExtractor:
+    instance = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir / "out", **options)
+    instance.max_pages = max_pages
+    return instance
+
+
+def analyze(instance: PDFOutlineExtractor, pdf_path: Path):
+    doc = fitz.open(str(pdf_path))
+    try:
+        return instance.analyze_with_stable_hierarchy(doc)
+    finally:
+        doc.close()
+
+
+def test_stable_hierarchy_matches_the_two_pass_outline():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = create_synthetic_pdf(work_dir / "long.pdf", pages=60, seed=2)
+        streaming = extractor(work_dir, 60, stable_hierarchy=True)
+
+        assert streaming.process_pdf(pdf_path) == extractor(work_dir, 60).process_pdf(pdf_path)
+        analysis = analyze(streaming, pdf_path)
+        assert analysis["stable_at"] == 20
+        assert analysis["pages_processed"] == 60
+        assert analysis["headings"][-1]["page"] == 60
+
+
+def test_later_pages_are_classified_without_retaining_spans():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = create_synthetic_pdf(work_dir / "long.pdf", pages=40, seed=4)
+        streaming = extractor(work_dir, 40, stable_hierarchy=True, stable_pages=5, stable_min_pages=10)
+        retained = []
+        classify_block = streaming.classify_block
+
+        def recording(block, hierarchy, title_size):
+            retained.append(block["page"])
+            return classify_block(block, hierarchy, title_size)
+
+        streaming.classify_block = recording
+        assert analyze(streaming, pdf_path)["stable_at"] == 10
+        # Spans of the stable prefix are classified together, later pages one at a time in page order
+        assert retained == sorted(retained) and set(retained) == set(range(1, 41))
+
+
+def test_short_documents_never_stabilise_and_fall_back_to_full_statistics():
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_path = create_synthetic_pdf(work_dir / "short.pdf", pages=8, seed=1)
+        streaming = extractor(work_dir, 50, stable_hierarchy=True)
+        analysis = analyze(streaming, pdf_path)
+        assert analysis["stable_at"] is None
+        assert streaming.process_pdf(pdf_path) == extractor(work_dir, 50).process_pdf(pdf_path)
+
+        blank = work_dir / "blank.pdf"
+        doc = fitz.open()
+        doc.new_page()
+        doc.save(str(blank))
+        doc.close()
+        assert "error" in streaming.process_pdf(blank)
+
+
+if __name__ == "__main__":
+    test_stable_hierarchy_matches_the_two_pass_outline()
+    test_later_pages_are_classified_without_retaining_spans()
+    test_short_documents_never_stabilise_and_fall_back_to_full_statistics()
+    print("Stable hierarchy tests passed")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-document time budget
+An exhausted budget must yield a best-effort partial outline instead of
+stalling the batch.
+"""
+
+import tempfile
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+
+
+def test_no_budget_processes_every_page():
+    """Without a budget the outline covers every page and is not marked partial."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = create_synthetic_pdf(Path(work_dir) / "full.pdf", pages=4)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir)
+        result = extractor.process_pdf(pdf_path)
+
+    assert "partial" not in result
+    assert result["total_pages"] == 4
+    assert {heading["page"] for heading in result["outline"]} == {1, 2, 3, 4}
+
+
+def test_exhausted_budget_returns_partial_outline():
+    """An already-expired budget still analyzes the first page and marks the result partial."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        pdf_path = create_synthetic_pdf(Path(work_dir) / "slow.pdf", pages=4)
+        extractor = PDFOutlineExtractor(input_dir=work_dir, output_dir=work_dir, time_budget=1e-9)
+        result = extractor.process_pdf(pdf_path)
+
+    assert result["partial"] is True
+    assert result["page_reached"] == 1
+    assert result["total_pages"] == 4
+    assert result["document_title"] == "Synthetic Benchmark Document 0"
+    assert result["outline"]
+    assert all(heading["page"] == 1 for heading in result["outline"])
+
+
+if __name__ == "__main__":
+    test_no_budget_processes_every_page()
+    test_exhausted_budget_returns_partial_outline()
+    print("Time budget tests passed")
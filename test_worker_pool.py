@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the supervised worker pool
+Native crashes, hangs, memory limits and recycling must only affect the
+document being processed, never the rest of the batch.
+"""
+
+import faulthandler
+import os
+import signal
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_support import create_synthetic_pdf
+from pdf_outline_extractor import PDFOutlineExtractor
+from worker_pool import SupervisedWorkerPool, crash_cause, resource
+
+
+class CrashingExtractor(PDFOutlineExtractor):
+    """Segfaults on files named crash*.pdf, like MuPDF does on some broken inputs."""
+
+    def process_pdf(self, pdf_path):
+        if pdf_path.name.startswith("crash"):
+            faulthandler.disable()  # keep pytest's fault handler from dumping the child's stack
+            os.kill(os.getpid(), signal.SIGSEGV)
+        result = super().process_pdf(pdf_path)
+        result["worker_pid"] = os.getpid()
+        return result
+
+
+class HungryExtractor(PDFOutlineExtractor):
+    """Allocates far beyond the worker's address-space limit on files named hungry*.pdf."""
+
+    def analyze_font_characteristics(self, doc, deadline=None, previous=None):
+        if doc.name.endswith("hungry.pdf"):
+            bytearray(4 * 1024 ** 3)
+        return super().analyze_font_characteristics(doc, deadline, previous)
+
+
+class HangingExtractor(PDFOutlineExtractor):
+    """Never returns on files named hang*.pdf, like a MuPDF call stuck in a loop."""
+
+    def process_pdf(self, pdf_path):
+        if pdf_path.name.startswith("hang"):
+            while True:
+                time.sleep(60)
+        return super().process_pdf(pdf_path)
+
+
+def make_batch(work_dir: Path, names):
+    return [create_synthetic_pdf(work_dir / name, pages=1, seed=index) for index, name in enumerate(names)]
+
+
+def test_crash_is_isolated():
+    """A worker segfault fails only its own document and the batch continues."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_batch(work_dir, ["a.pdf", "crash.pdf", "b.pdf", "c.pdf"])
+        extractor = CrashingExtractor(input_dir=work_dir, output_dir=work_dir, workers=2)
+
+        results = dict(extractor.process_batch(pdf_files))
+
+    assert set(results) == set(pdf_files)
+    assert results[work_dir / "crash.pdf"]["error"] == "worker crashed with SIGSEGV"
+    assert all("error" not in results[work_dir / name] for name in ["a.pdf", "b.pdf", "c.pdf"])
+    assert extractor.failures == [(work_dir / "crash.pdf", "worker crashed with SIGSEGV")]
+
+
+def test_workers_recycled_after_n_documents():
+    """recycle_after replaces each worker after that many documents."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_batch(work_dir, [f"doc{index}.pdf" for index in range(6)])
+        extractor = CrashingExtractor(input_dir=work_dir, output_dir=work_dir, recycle_after=2)
+        pool = SupervisedWorkerPool(extractor, workers=1, max_docs_per_worker=2)
+
+        results = list(pool.imap_unordered(pdf_files))
+
+    pids = {result["worker_pid"] for _, result in results}
+    assert len(results) == 6
+    assert len(pids) == 3
+    assert pool.restarts == 3
+    assert os.getpid() not in pids
+
+
+def test_memory_limit_fails_only_the_hungry_document():
+    """An allocation beyond the address-space limit is reported for that document only."""
+    if resource is None:
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_batch(work_dir, ["ok.pdf", "hungry.pdf", "fine.pdf"])
+        # Leave headroom above the interpreter's current address space
+        with open("/proc/self/statm") as f:
+            vsz_mb = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE") // 1024 // 1024
+        extractor = HungryExtractor(input_dir=work_dir, output_dir=work_dir,
+                                    worker_memory_mb=vsz_mb + 512)
+
+        results = dict(extractor.process_batch(pdf_files))
+
+    assert "error" in results[work_dir / "hungry.pdf"]
+    assert "error" not in results[work_dir / "ok.pdf"]
+    assert "error" not in results[work_dir / "fine.pdf"]
+
+
+def test_hung_worker_is_killed_after_the_document_timeout():
+    """A document that never finishes is failed after document_timeout and the batch continues."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        pdf_files = make_batch(work_dir, ["a.pdf", "hang.pdf", "b.pdf", "c.pdf"])
+        extractor = HangingExtractor(input_dir=work_dir, output_dir=work_dir, workers=2, document_timeout=1.0)
+
+        started = time.monotonic()
+        results = dict(extractor.process_batch(pdf_files))
+        elapsed = time.monotonic() - started
+
+    assert set(results) == set(pdf_files)
+    assert "1s per-document limit" in results[work_dir / "hang.pdf"]["error"]
+    assert all("error" not in results[work_dir / name] for name in ["a.pdf", "b.pdf", "c.pdf"])
+    assert elapsed < 30
+
+
+def test_crash_cause():
+    assert crash_cause(-signal.SIGKILL) == "worker crashed with SIGKILL"
+    assert crash_cause(3) == "worker exited unexpectedly with status 3"
+
+
+if __name__ == "__main__":
+    test_crash_is_isolated()
+    test_workers_recycled_after_n_documents()
+    test_memory_limit_fails_only_the_hungry_document()
+    test_hung_worker_is_killed_after_the_document_timeout()
+    test_crash_cause()
+    print("Worker pool tests passed")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Supervised worker processes for PDF Outline Extractor
+Runs process_pdf in child processes with an optional address-space limit,
+recycles workers after N documents or M MB of memory growth, and records a
+document whose worker crashed (e.g. a MuPDF segfault) or overran the
+per-document wall-clock limit (e.g. hung inside MuPDF) as failed while the
+rest of the batch keeps going.
+
+Callers that work with futures (pipe mode, the async pipeline) use a
+plain process pool instead; process_pool and process_isolated give them
+the same guarantee that a native crash fails only the document that
+caused it.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, workers still isolate crashes
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 when unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _worker_main(conn, extractor, memory_limit_mb: Optional[int], max_docs: Optional[int],
+                 max_growth_mb: Optional[float]):
+    """Worker loop: receive (index, path, data), send back (index, result, recycle)."""
+    # Let the supervisor handle Ctrl+C and SIGTERM (it drains, then stops the workers)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    if memory_limit_mb and resource is not None:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    baseline_mb = _peak_rss_mb()
+    handled = 0
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+
+        index, pdf_path, data = task
+        # data carries documents that only exist in memory, such as archive members
+        result = extractor.process_pdf(pdf_path) if data is None else extractor.process_pdf(pdf_path, data)
+        handled += 1
+
+        growth_mb = _peak_rss_mb() - baseline_mb
+        recycle = bool((max_docs and handled >= max_docs) or (max_growth_mb and growth_mb >= max_growth_mb))
+        conn.send((index, result, recycle))
+        if recycle:
+            break
+
+    conn.close()
+
+
+def crash_cause(exitcode: Optional[int]) -> str:
+    """Human-readable reason for a worker that died without replying."""
+    if exitcode is not None and exitcode < 0:
+        try:
+            return f"worker crashed with {signal.Signals(-exitcode).name}"
+        except ValueError:
+            return f"worker killed by signal {-exitcode}"
+    return f"worker exited unexpectedly with status {exitcode}"
+
+
+def failure_result(pdf_path: Path, cause: str) -> Dict:
+    """The outline written for a document that could not be processed."""
+    return {
+        "document_title": f"Error processing {pdf_path.name}",
+        "total_pages": 0,
+        "outline": [],
+        "error": cause
+    }
+
+
+# The extractor of a process-pool worker, installed once when the process starts
+_pool_extractor = None
+
+
+def init_pool_worker(extractor):
+    global _pool_extractor
+    _pool_extractor = extractor
+
+
+def process_in_pool_worker(pdf_path: Path, data: Optional[bytes] = None) -> Dict:
+    # State the extractor builds up (such as hierarchy templates) persists across this worker's documents
+    return _pool_extractor.process_pdf(pdf_path, data)
+
+
+def process_pool(extractor, workers: int):
+    """A ProcessPoolExecutor whose workers receive the extractor once, not with every document.
+
+    Submit process_in_pool_worker to it.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(workers, initializer=init_pool_worker, initargs=(extractor,))
+
+
+def process_isolated(extractor, pdf_path: Path, data: Optional[bytes] = None) -> Dict:
+    """Process one document alone in a fresh worker process.
+
+    Used for the documents in flight when a pool worker died: the pool can't
+    tell which of them killed it, so each is retried on its own and only the
+    one that crashes again is recorded as failed (in extractor.failures too).
+    """
+    from concurrent.futures.process import BrokenProcessPool
+    with process_pool(extractor, 1) as solo:
+        try:
+            return solo.submit(process_in_pool_worker, pdf_path, data).result()
+        except BrokenProcessPool:
+            cause = "worker process terminated abruptly"
+            logger.error(f"Failed to process {pdf_path.name}: {cause}")
+            extractor.failures.append((pdf_path, cause))
+            return failure_result(pdf_path, cause)
+
+
+class _Worker:
+    """One supervised child process and the task it currently holds."""
+
+    def __init__(self, context, extractor, memory_limit_mb, max_docs, max_growth_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, extractor, memory_limit_mb, max_docs, max_growth_mb),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[Tuple[int, Path, Optional[bytes]]] = None
+        self.assigned_at = 0.0
+
+    def assign(self, index: int, job):
+        pdf_path, data = job if isinstance(job, tuple) else (job, None)
+        self.task = (index, pdf_path, data)
+        self.assigned_at = time.monotonic()
+        self.conn.send(self.task)
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the worker to exit, killing it if it doesn't."""
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SupervisedWorkerPool:
+    """Run an extractor's process_pdf in crash-isolated, recyclable worker processes."""
+
+    def __init__(self, extractor, workers: int = 1, memory_limit_mb: Optional[int] = None,
+                 max_docs_per_worker: Optional[int] = None, max_growth_mb: Optional[float] = None,
+                 document_timeout: Optional[float] = None, context=None):
+        self.extractor = extractor
+        self.workers = max(1, int(workers))
+        self.memory_limit_mb = memory_limit_mb
+        self.max_docs_per_worker = max_docs_per_worker
+        self.max_growth_mb = max_growth_mb
+        # Wall-clock seconds a worker may spend on one document before it is killed (None = unlimited)
+        self.document_timeout = document_timeout
+        self.context = context or multiprocessing.get_context()
+        self.failures: List[Tuple[Path, str]] = []
+        self.restarts = 0
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self.context, self.extractor, self.memory_limit_mb,
+                       self.max_docs_per_worker, self.max_growth_mb)
+
+    def _failure_result(self, pdf_path: Path, cause: str) -> Dict:
+        logger.error(f"Failed to process {pdf_path.name}: {cause}")
+        self.failures.append((pdf_path, cause))
+        return failure_result(pdf_path, cause)
+
+    def _wait_timeout(self, busy: List[_Worker]) -> Optional[float]:
+        """Seconds until the earliest in-flight document overruns its limit."""
+        if not self.document_timeout:
+            return None
+        earliest = min(worker.assigned_at for worker in busy) + self.document_timeout
+        return max(0.0, earliest - time.monotonic())
+
+    def imap_unordered(self, pdf_files: Iterable,
+                       should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[Path, Dict]]:
+        """Yield (pdf_path, result) pairs in completion order.
+
+        Items are paths, or (path, bytes) pairs for documents held in memory.
+        Once should_stop() returns True no further documents are dispatched;
+        documents already in flight are still collected.
+        """
+        # Consumed lazily so dispatch starts while the input is still being discovered
+        pending = enumerate(pdf_files)
+        stopped = False
+        workers = []
+
+        try:
+            for task in itertools.islice(pending, self.workers):
+                worker = self._spawn()
+                workers.append(worker)
+                worker.assign(*task)
+
+            while any(worker.task for worker in workers):
+                busy = [worker for worker in workers if worker.task]
+                wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy],
+                     timeout=self._wait_timeout(busy))
+
+                for slot, worker in enumerate(workers):
+                    if worker.task is None:
+                        continue
+
+                    index, pdf_path, _ = worker.task
+                    replace = False
+                    if worker.conn.poll():
+                        try:
+                            _, result, replace = worker.conn.recv()
+                        except (EOFError, OSError):
+                            worker.process.join()
+                            result, replace = self._failure_result(pdf_path, crash_cause(worker.process.exitcode)), True
+                    elif not worker.process.is_alive():
+                        worker.process.join()
+                        result, replace = self._failure_result(pdf_path, crash_cause(worker.process.exitcode)), True
+                    elif (self.document_timeout
+                          and time.monotonic() - worker.assigned_at >= self.document_timeout):
+                        # A hung native call never returns to Python; only killing the process ends it
+                        worker.process.kill()
+                        worker.process.join()
+                        cause = f"worker killed after exceeding the {self.document_timeout:g}s per-document limit"
+                        result, replace = self._failure_result(pdf_path, cause), True
+                    else:
+                        continue
+
+                    worker.task = None
+                    if should_stop and should_stop():
+                        stopped = True
+                    task = None if stopped else next(pending, None)
+                    if replace:
+                        self.restarts += 1
+                        worker.stop()
+                        if task is not None:
+                            worker = workers[slot] = self._spawn()
+
+                    if task is not None:
+                        worker.assign(*task)
+
+                    yield pdf_path, result
+
+        finally:
+            for worker in workers:
+                worker.stop()